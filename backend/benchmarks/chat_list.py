@@ -0,0 +1,156 @@
+"""
+Compare listing chats from full rows with the column-projected listings.
+
+    cd backend && python -m benchmarks.chat_list --chats 5000 --messages 20
+
+Every run uses a throwaway SQLite database in a temporary directory, the
+DATABASE_URL and DATA_DIR of the environment are ignored. "full rows" is how
+the listings used to work: load every `Chat`, validate it as a `ChatModel`
+(parsing the whole `chat` JSON) and reduce it to a `ChatTitleIdResponse`.
+Peak memory is measured with tracemalloc.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+DATA_DIR = tempfile.mkdtemp(prefix="open-webui-benchmark-")
+os.environ["DATA_DIR"] = DATA_DIR
+os.environ["DATABASE_URL"] = f"sqlite:///{DATA_DIR}/webui.db"
+
+from open_webui.internal.db import engine, get_db  # noqa: E402
+from open_webui.models.chats import (  # noqa: E402
+    Chat,
+    ChatModel,
+    ChatTitleIdResponse,
+    Chats,
+)
+
+USER_ID = "benchmark"
+
+
+def create_chats(count, messages, message_size):
+    Chat.__table__.drop(engine, checkfirst=True)
+    Chat.__table__.create(engine)
+
+    now = int(time.time())
+    rows = []
+    for idx in range(count):
+        chat_messages = [
+            {
+                "id": str(uuid.uuid4()),
+                "role": "user" if message_idx % 2 == 0 else "assistant",
+                "content": "lorem ipsum " * (message_size // 12),
+                "timestamp": now,
+            }
+            for message_idx in range(messages)
+        ]
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": USER_ID,
+                "title": f"Chat {idx}",
+                "chat": {
+                    "title": f"Chat {idx}",
+                    "messages": chat_messages,
+                    "history": {
+                        "messages": {
+                            message["id"]: message for message in chat_messages
+                        }
+                    },
+                },
+                "created_at": now - idx,
+                "updated_at": now - idx,
+                "pinned": idx % 50 == 0,
+                "archived": idx % 10 == 0,
+                "meta": {},
+            }
+        )
+
+    with get_db() as db:
+        db.execute(Chat.__table__.insert(), rows)
+        db.commit()
+
+    return sum(len(json.dumps(row["chat"])) for row in rows)
+
+
+def full_rows(archived, limit):
+    # The listings before column projection
+    with get_db() as db:
+        query = (
+            db.query(Chat)
+            .filter_by(user_id=USER_ID, archived=archived)
+            .order_by(Chat.updated_at.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+        return [
+            ChatTitleIdResponse(**ChatModel.model_validate(chat).model_dump())
+            for chat in query.all()
+        ]
+
+
+def projected(archived, limit):
+    if archived:
+        chats, _ = Chats.get_archived_chat_list_by_user_id(USER_ID, limit=limit)
+        return chats
+    return Chats.get_chat_list_by_user_id(USER_ID, limit=limit)
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chats", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--message-size", type=int, default=500)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[60, 0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+def run(args):
+    size = create_chats(args.chats, args.messages, args.message_size)
+    print(
+        f"{args.chats} chats, {args.messages} messages each, "
+        f"{size / 1024 / 1024:.0f} MiB of chat JSON"
+    )
+    print(
+        f"{'listing':>9} {'limit':>6} {'method':>10} {'median ms':>10} {'peak MiB':>9}"
+    )
+
+    for archived in (False, True):
+        for limit in args.page_sizes:
+            for name, fn in (("full rows", full_rows), ("projected", projected)):
+                elapsed, peak = measure(lambda: fn(archived, limit), args.repeat)
+                print(
+                    f"{'archived' if archived else 'chats':>9} {limit or 'all':>6} "
+                    f"{name:>10} {elapsed:>10.1f} {peak:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Compare the previous and the vectorized ColBERT late-interaction scoring on CPU.
+
+    cd backend && python -m benchmarks.colbert_maxsim --candidates 100 500 1000
+
+By default synthetic token embeddings are used, so only torch is required.
+Pass --model jinaai/jina-colbert-v2 (requires colbert-ai and the model) to
+also time end-to-end `predict` calls, including document encoding and the
+token embedding cache on repeated queries.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import torch
+
+from open_webui.retrieval.models.colbert import maxsim, packed_maxsim
+
+
+def legacy_scores(query_embeddings, document_embeddings):
+    # Scoring as done before: padded documents without a token mask
+    computed_scores = torch.matmul(
+        document_embeddings, query_embeddings.permute(0, 2, 1)
+    )
+    maximum_scores = torch.max(computed_scores, dim=1).values
+    return torch.softmax(maximum_scores.sum(dim=1), dim=0)
+
+
+def per_document_scores(query_embedding, documents):
+    # Reference implementation, one document at a time
+    return torch.softmax(
+        torch.stack(
+            [(query_embedding @ doc.T).max(dim=1).values.sum() for doc in documents]
+        ),
+        dim=0,
+    )
+
+
+def pad_embeddings(documents):
+    lengths = torch.tensor([doc.size(0) for doc in documents])
+    padded = torch.nn.utils.rnn.pad_sequence(documents, batch_first=True)
+    mask = torch.arange(padded.size(1)).unsqueeze(0) < lengths.unsqueeze(1)
+    return padded, mask
+
+
+def packed_scores(query_embedding, documents):
+    lengths = torch.tensor([doc.size(0) for doc in documents])
+    return torch.softmax(
+        packed_maxsim(query_embedding, torch.cat(documents), lengths), dim=0
+    )
+
+
+def timeit(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def synthetic_documents(count, dim, min_tokens, max_tokens):
+    documents = []
+    for _ in range(count):
+        doc = torch.randn(random.randint(min_tokens, max_tokens), dim)
+        documents.append(torch.nn.functional.normalize(doc, dim=1))
+    return documents
+
+
+def run_synthetic(args):
+    query = torch.nn.functional.normalize(
+        torch.randn(1, args.query_tokens, args.dim), dim=2
+    )
+
+    print(
+        f"{'candidates':>10} {'per-doc ms':>11} {'legacy ms':>10} "
+        f"{'masked ms':>10} {'packed ms':>10} {'max diff':>9}"
+    )
+    for candidates in args.candidates:
+        documents = synthetic_documents(
+            candidates, args.dim, args.min_tokens, args.max_tokens
+        )
+        # Zero-padded batch, as docFromText(keep_dims=True) used to return
+        padded, mask = pad_embeddings(documents)
+
+        per_doc_ms = timeit(
+            lambda: per_document_scores(query[0], documents), args.repeat
+        )
+        legacy_ms = timeit(lambda: legacy_scores(query, padded), args.repeat)
+        masked_ms = timeit(
+            lambda: torch.softmax(maxsim(query, padded, mask), dim=0), args.repeat
+        )
+        packed_ms = timeit(lambda: packed_scores(query[0], documents), args.repeat)
+
+        expected = per_document_scores(query[0], documents)
+        diff = max(
+            (expected - packed_scores(query[0], documents)).abs().max().item(),
+            (expected - torch.softmax(maxsim(query, padded, mask), dim=0))
+            .abs()
+            .max()
+            .item(),
+        )
+
+        print(
+            f"{candidates:>10} {per_doc_ms:>11.2f} {legacy_ms:>10.2f} "
+            f"{masked_ms:>10.2f} {packed_ms:>10.2f} {diff:>9.1e}"
+        )
+
+
+def run_model(args):
+    from open_webui.retrieval.models.colbert import ColBERT
+
+    model = ColBERT(args.model, cache_size=max(args.candidates))
+    words = "retrieval augmented generation late interaction token embedding".split()
+
+    print(f"{'candidates':>10} {'legacy ms':>12} {'cold ms':>12} {'warm cache ms':>14}")
+    for candidates in args.candidates:
+        docs = [
+            " ".join(random.choices(words, k=random.randint(20, 120)))
+            for _ in range(candidates)
+        ]
+        sentences = [("what is late interaction?", doc) for doc in docs]
+
+        def legacy():
+            embedded_docs = model.ckpt.docFromText(docs, bsize=32)[0]
+            embedded_query = model.ckpt.queryFromText([sentences[0][0]], bsize=32)[0]
+            legacy_scores(embedded_query.unsqueeze(0), embedded_docs)
+
+        legacy_ms = timeit(legacy, 1)
+        model.cache.clear()
+        cold_ms = timeit(lambda: model.predict(sentences), 1)
+        warm_ms = timeit(lambda: model.predict(sentences), args.repeat)
+
+        print(f"{candidates:>10} {legacy_ms:>12.2f} {cold_ms:>12.2f} {warm_ms:>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--query-tokens", type=int, default=32)
+    parser.add_argument("--min-tokens", type=int, default=32)
+    parser.add_argument("--max-tokens", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    torch.manual_seed(args.seed)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.model:
+        run_model(args)
+    else:
+        run_synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
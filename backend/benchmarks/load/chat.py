@@ -0,0 +1,378 @@
+"""
+Load test streamed chats end to end, through /api/chat/completions and
+socket.io, against stand-in OpenAI or Ollama upstreams.
+
+    cd backend && python -m benchmarks.load.chat --backend openai \\
+        --concurrency 1 10 50 --chats 5 --tokens 200 --tokens-per-second 50
+
+Starts `benchmarks.load.upstream` and `benchmarks.load.server` as
+subprocesses, in a temporary DATA_DIR with a SQLite database unless
+`--database-url` points to a Postgres database (use an empty one, it is
+migrated on start). No GPU or model download is needed, embeddings come from
+the stand-in upstream as well. Title, tags and follow up generation are
+disabled so every chat is a single upstream completion.
+
+Every virtual user signs up, connects a socket.io session like the browser
+does and sends `--chats` chats one after another, at `--concurrency` users
+at once. Reported per concurrency level:
+
+- TTFT: from sending the completion request to the first content event on
+  the socket, p50 and p99 over all chats
+- gap: time between content events, p50 and p99 over all events
+- jitter: standard deviation of the gaps of a chat, p50 and p99 over chats
+- CPU: CPU time of the Open WebUI process over the wall time of the level,
+  100% is one core
+- writes/s and commits/s: database write statements and commits per second
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import aiohttp
+import socketio
+
+from benchmarks.load.upstream import OLLAMA_MODEL, OPENAI_MODEL
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def get_server_env(args, data_dir, upstream_url):
+    openai = args.backend == "openai"
+    return {
+        **os.environ,
+        "DATA_DIR": data_dir,
+        "DATABASE_URL": args.database_url or f"sqlite:///{data_dir}/webui.db",
+        "WEBUI_SECRET_KEY": "load-test",
+        "OFFLINE_MODE": "true",
+        "ENABLE_VERSION_UPDATE_CHECK": "false",
+        "GLOBAL_LOG_LEVEL": "WARNING",
+        "ENABLE_OPENAI_API": str(openai),
+        "OPENAI_API_BASE_URLS": f"{upstream_url}/v1",
+        "OPENAI_API_KEYS": "load-test",
+        "ENABLE_OLLAMA_API": str(not openai),
+        "OLLAMA_BASE_URLS": upstream_url,
+        "RAG_EMBEDDING_ENGINE": "openai",
+        "RAG_EMBEDDING_MODEL": OPENAI_MODEL,
+        "RAG_OPENAI_API_BASE_URL": f"{upstream_url}/v1",
+        "RAG_OPENAI_API_KEY": "load-test",
+        "ENABLE_TITLE_GENERATION": "false",
+        "ENABLE_TAGS_GENERATION": "false",
+        "ENABLE_FOLLOW_UP_GENERATION": "false",
+        "DEFAULT_USER_ROLE": "user",
+        "BYPASS_MODEL_ACCESS_CONTROL": "true",
+        "CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE": str(args.delta_chunk_size),
+    }
+
+
+async def wait_for(session, url, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{url} is not up after {timeout}s")
+        await asyncio.sleep(0.5)
+
+
+class ChatStream:
+    def __init__(self):
+        self.start = None
+        self.event_times = []
+        self.error = None
+        self.done = asyncio.Event()
+
+    def on_event(self, event):
+        if event.get("type") in ("chat:message:error", "chat:tasks:cancel"):
+            self.error = self.error or event.get("type")
+            self.done.set()
+        elif event.get("type") == "chat:completion":
+            data = event.get("data", {})
+            if data.get("error"):
+                self.error = str(data["error"])
+                self.done.set()
+            elif data.get("done"):
+                self.done.set()
+            elif "content" in data or "choices" in data:
+                self.event_times.append(time.perf_counter())
+
+    @property
+    def ttft(self):
+        return (self.event_times[0] - self.start) * 1000 if self.event_times else None
+
+    @property
+    def gaps(self):
+        return [
+            (current - previous) * 1000
+            for previous, current in zip(self.event_times, self.event_times[1:])
+        ]
+
+
+class VirtualUser:
+    def __init__(self, url, session, token, model):
+        self.url = url
+        self.session = session
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.token = token
+        self.model = model
+        self.streams = {}
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("chat-events", self.on_chat_event)
+
+    async def connect(self):
+        await self.sio.connect(
+            self.url,
+            socketio_path="/ws/socket.io",
+            transports=["websocket"],
+            auth={"token": self.token},
+        )
+        await self.sio.emit("user-join", {"auth": {"token": self.token}})
+
+    async def disconnect(self):
+        await self.sio.disconnect()
+
+    async def on_chat_event(self, data):
+        stream = self.streams.get(data.get("message_id"))
+        if stream:
+            stream.on_event(data.get("data", {}))
+
+    async def chat(self, timeout) -> ChatStream:
+        user_message = {
+            "id": str(uuid.uuid4()),
+            "parentId": None,
+            "childrenIds": [],
+            "role": "user",
+            "content": "Write a few paragraphs about load testing.",
+            "timestamp": int(time.time()),
+        }
+        message = {
+            "id": str(uuid.uuid4()),
+            "parentId": user_message["id"],
+            "childrenIds": [],
+            "role": "assistant",
+            "content": "",
+            "model": self.model,
+            "timestamp": int(time.time()),
+        }
+        user_message["childrenIds"].append(message["id"])
+
+        async with self.session.post(
+            f"{self.url}/api/v1/chats/new",
+            headers=self.headers,
+            json={
+                "chat": {
+                    "title": "Load test",
+                    "models": [self.model],
+                    "messages": [user_message, message],
+                    "history": {
+                        "messages": {
+                            user_message["id"]: user_message,
+                            message["id"]: message,
+                        },
+                        "currentId": message["id"],
+                    },
+                }
+            },
+        ) as response:
+            response.raise_for_status()
+            chat_id = (await response.json())["id"]
+
+        stream = ChatStream()
+        self.streams[message["id"]] = stream
+        try:
+            stream.start = time.perf_counter()
+            async with self.session.post(
+                f"{self.url}/api/chat/completions",
+                headers=self.headers,
+                json={
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": user_message["content"]}],
+                    "stream": True,
+                    "chat_id": chat_id,
+                    "id": message["id"],
+                    "session_id": self.sio.get_sid(),
+                    "background_tasks": {},
+                },
+            ) as response:
+                response.raise_for_status()
+
+            await asyncio.wait_for(stream.done.wait(), timeout)
+        except Exception as e:
+            stream.error = stream.error or repr(e)
+        finally:
+            del self.streams[message["id"]]
+        return stream
+
+
+async def sign_up(session, url, count, run_id):
+    # Signing up is disabled after the first user, the admin adds the others
+    async with session.post(
+        f"{url}/api/v1/auths/signup",
+        json={
+            "name": "Load 0",
+            "email": f"load-{run_id}-0@example.com",
+            "password": "load-test",
+        },
+    ) as response:
+        response.raise_for_status()
+        tokens = [(await response.json())["token"]]
+
+    for idx in range(1, count):
+        async with session.post(
+            f"{url}/api/v1/auths/add",
+            headers={"Authorization": f"Bearer {tokens[0]}"},
+            json={
+                "name": f"Load {idx}",
+                "email": f"load-{run_id}-{idx}@example.com",
+                "password": "load-test",
+                "role": "user",
+            },
+        ) as response:
+            response.raise_for_status()
+            tokens.append((await response.json())["token"])
+    return tokens
+
+
+async def get_stats(session, url):
+    async with session.get(f"{url}/api/benchmark/stats") as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def run_level(session, url, tokens, model, concurrency, args):
+    users = [VirtualUser(url, session, token, model) for token in tokens[:concurrency]]
+    await asyncio.gather(*(user.connect() for user in users))
+
+    async def run_user(user):
+        return [await user.chat(args.timeout) for _ in range(args.chats)]
+
+    try:
+        before = await get_stats(session, url)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_user(user) for user in users))
+        elapsed = time.perf_counter() - start
+        after = await get_stats(session, url)
+    finally:
+        await asyncio.gather(*(user.disconnect() for user in users))
+
+    streams = [stream for user_streams in results for stream in user_streams]
+    completed = [stream for stream in streams if not stream.error]
+    ttfts = [stream.ttft for stream in completed if stream.ttft is not None]
+    gaps = [gap for stream in completed for gap in stream.gaps]
+    jitters = [
+        statistics.pstdev(stream.gaps) for stream in completed if len(stream.gaps) > 1
+    ]
+
+    for stream in streams:
+        if stream.error:
+            print(f"  error: {stream.error}", file=sys.stderr)
+
+    print(
+        f"{concurrency:>5} {len(completed):>5} {len(streams) - len(completed):>4} "
+        f"{percentile(ttfts, 50):>8.0f} {percentile(ttfts, 99):>8.0f} "
+        f"{percentile(gaps, 50):>7.1f} {percentile(gaps, 99):>7.1f} "
+        f"{percentile(jitters, 50):>7.1f} {percentile(jitters, 99):>7.1f} "
+        f"{(after['cpu_seconds'] - before['cpu_seconds']) / elapsed * 100:>5.0f}% "
+        f"{(after['db_writes'] - before['db_writes']) / elapsed:>9.1f} "
+        f"{(after['db_commits'] - before['db_commits']) / elapsed:>9.1f}"
+    )
+
+
+async def run(args, data_dir):
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    url = f"http://127.0.0.1:{args.port}"
+    model = OPENAI_MODEL if args.backend == "openai" else OLLAMA_MODEL
+
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.load.upstream",
+                f"--port={args.upstream_port}",
+                f"--tokens={args.tokens}",
+                f"--tokens-per-second={args.tokens_per_second}",
+                f"--ttft-ms={args.ttft_ms}",
+            ],
+            cwd=BACKEND_DIR,
+        ),
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.load.server", f"--port={args.port}"],
+            cwd=BACKEND_DIR,
+            env=get_server_env(args, data_dir, upstream_url),
+        ),
+    ]
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_for(session, f"{upstream_url}/v1/models", 30)
+            await wait_for(session, f"{url}/health/ready", args.startup_timeout)
+
+            tokens = await sign_up(
+                session, url, max(args.concurrency), uuid.uuid4().hex[:8]
+            )
+
+            print(
+                f"{args.backend} upstream, {args.tokens} tokens at "
+                f"{args.tokens_per_second:g}/s after {args.ttft_ms:g} ms, "
+                f"{args.chats} chats per user, "
+                f"{'postgres' if args.database_url else 'sqlite'}"
+            )
+            print(
+                f"{'users':>5} {'chats':>5} {'errs':>4} "
+                f"{'ttft p50':>8} {'ttft p99':>8} {'gap p50':>7} {'gap p99':>7} "
+                f"{'jit p50':>7} {'jit p99':>7} {'CPU':>6} "
+                f"{'writes/s':>9} {'commits/s':>9}"
+            )
+            for concurrency in args.concurrency:
+                await run_level(session, url, tokens, model, concurrency, args)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["openai", "ollama"], default="openai")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--chats", type=int, default=5, help="chats per user")
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--ttft-ms", type=float, default=200)
+    parser.add_argument("--delta-chunk-size", type=int, default=1)
+    parser.add_argument("--database-url", help="Postgres database, SQLite if unset")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--upstream-port", type=int, default=11499)
+    parser.add_argument("--timeout", type=float, default=120, help="per chat")
+    parser.add_argument("--startup-timeout", type=float, default=180)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="open-webui-benchmark-")
+    try:
+        asyncio.run(run(args, data_dir))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Run Open WebUI for the load test with a `/api/benchmark/stats` route.
+
+    cd backend && python -m benchmarks.load.server --port 8089
+
+Started by `benchmarks.load.chat`, which configures it through the
+environment. The route reports the CPU time of the process and the number of
+write statements and commits sent to the database since the start. A single
+worker serves every request, so the numbers cover the whole server.
+"""
+
+import argparse
+import threading
+import time
+
+import uvicorn
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from open_webui.internal.db import engine
+from open_webui.main import app
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+lock = threading.Lock()
+stats = {"db_writes": 0, "db_commits": 0}
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def count_writes(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip()[:6].upper() in WRITE_STATEMENTS:
+        with lock:
+            stats["db_writes"] += 1
+
+
+@event.listens_for(engine, "commit")
+def count_commits(conn):
+    with lock:
+        stats["db_commits"] += 1
+
+
+def get_stats():
+    with lock:
+        return {**stats, "cpu_seconds": time.process_time()}
+
+
+# Ahead of the static files mounted at /
+app.router.routes.insert(
+    0, APIRoute("/api/benchmark/stats", get_stats, methods=["GET"])
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Stand-in OpenAI- and Ollama-compatible server for the load test, streaming
+made up tokens at a fixed rate.
+
+    cd backend && python -m benchmarks.load.upstream --port 11499 \\
+        --tokens 200 --tokens-per-second 50 --ttft-ms 200
+
+OpenAI endpoints are served under /v1 (models, chat completions, embeddings)
+and Ollama endpoints under /api (version, tags, ps, chat, embed). Both list a
+single model, `load-test` for OpenAI and `load-test:latest` for Ollama.
+Every completion waits `--ttft-ms` before its first token and then sends
+`--tokens` tokens at `--tokens-per-second`, on a fixed schedule so slow
+readers don't slow down the rate. Embeddings are deterministic
+pseudo-random unit vectors of `--dimensions`.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+
+from aiohttp import web
+
+OPENAI_MODEL = "load-test"
+OLLAMA_MODEL = "load-test:latest"
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+
+
+def get_embedding(text: str, dimensions: int) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class Upstream:
+    def __init__(
+        self, tokens: int, tokens_per_second: float, ttft_ms: float, dimensions: int
+    ):
+        self.tokens = tokens
+        self.interval = 1 / tokens_per_second if tokens_per_second > 0 else 0
+        self.ttft = ttft_ms / 1000
+        self.dimensions = dimensions
+
+    async def generate(self):
+        """Yield tokens on schedule, the first one after the time to first token."""
+        start = time.perf_counter() + self.ttft
+        for idx in range(self.tokens):
+            delay = start + idx * self.interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield f"{WORDS[idx % len(WORDS)]} "
+
+    def get_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/v1/models", self.openai_models),
+                web.post("/v1/chat/completions", self.openai_chat),
+                web.post("/v1/embeddings", self.openai_embeddings),
+                web.get("/api/version", self.ollama_version),
+                web.get("/api/tags", self.ollama_tags),
+                web.get("/api/ps", self.ollama_ps),
+                web.post("/api/chat", self.ollama_chat),
+                web.post("/api/embed", self.ollama_embed),
+            ]
+        )
+        return app
+
+    async def openai_models(self, request):
+        return web.json_response(
+            {
+                "object": "list",
+                "data": [
+                    {
+                        "id": OPENAI_MODEL,
+                        "object": "model",
+                        "created": 0,
+                        "owned_by": "load-test",
+                    }
+                ],
+            }
+        )
+
+    async def openai_chat(self, request):
+        body = await request.json()
+        completion_id = f"chatcmpl-{random.getrandbits(64):x}"
+        created = int(time.time())
+
+        def get_chunk(delta, finish_reason=None, **kwargs):
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body.get("model", OPENAI_MODEL),
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+                **kwargs,
+            }
+
+        if not body.get("stream"):
+            content = "".join([token async for token in self.generate()])
+            return web.json_response(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": body.get("model", OPENAI_MODEL),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 0,
+                        "completion_tokens": self.tokens,
+                        "total_tokens": self.tokens,
+                    },
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async for token in self.generate():
+            chunk = get_chunk({"content": token})
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        chunk = get_chunk(
+            {},
+            "stop",
+            usage={
+                "prompt_tokens": 0,
+                "completion_tokens": self.tokens,
+                "total_tokens": self.tokens,
+            },
+        )
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def openai_embeddings(self, request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return web.json_response(
+            {
+                "object": "list",
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": idx,
+                        "embedding": get_embedding(text, self.dimensions),
+                    }
+                    for idx, text in enumerate(inputs)
+                ],
+                "model": body.get("model", OPENAI_MODEL),
+            }
+        )
+
+    async def ollama_version(self, request):
+        return web.json_response({"version": "0.11.0"})
+
+    async def ollama_tags(self, request):
+        return web.json_response(
+            {
+                "models": [
+                    {
+                        "name": OLLAMA_MODEL,
+                        "model": OLLAMA_MODEL,
+                        "modified_at": "2025-01-01T00:00:00Z",
+                        "size": 0,
+                        "digest": "0" * 64,
+                        "details": {"family": "load-test"},
+                    }
+                ]
+            }
+        )
+
+    async def ollama_ps(self, request):
+        return web.json_response({"models": []})
+
+    async def ollama_chat(self, request):
+        body = await request.json()
+        model = body.get("model", OLLAMA_MODEL)
+        start = time.perf_counter_ns()
+
+        def get_chunk(content, done=False, **kwargs):
+            return {
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": content},
+                "done": done,
+                **kwargs,
+            }
+
+        def get_stats():
+            duration = time.perf_counter_ns() - start
+            return {
+                "done_reason": "stop",
+                "total_duration": duration,
+                "prompt_eval_count": 0,
+                "eval_count": self.tokens,
+                "eval_duration": duration,
+            }
+
+        if not body.get("stream", True):
+            content = "".join([token async for token in self.generate()])
+            return web.json_response(get_chunk(content, True, **get_stats()))
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+
+        async for token in self.generate():
+            await response.write(f"{json.dumps(get_chunk(token))}\n".encode())
+
+        chunk = get_chunk("", True, **get_stats())
+        await response.write(f"{json.dumps(chunk)}\n".encode())
+        await response.write_eof()
+        return response
+
+    async def ollama_embed(self, request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return web.json_response(
+            {
+                "model": body.get("model", OLLAMA_MODEL),
+                "embeddings": [get_embedding(text, self.dimensions) for text in inputs],
+            }
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11499)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--ttft-ms", type=float, default=200)
+    parser.add_argument("--dimensions", type=int, default=384)
+    args = parser.parse_args()
+
+    upstream = Upstream(
+        args.tokens, args.tokens_per_second, args.ttft_ms, args.dimensions
+    )
+    web.run_app(upstream.get_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
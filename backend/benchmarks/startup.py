@@ -0,0 +1,207 @@
+"""
+Report where the cold start of Open WebUI goes, from `python -X importtime`.
+
+    cd backend && python -m benchmarks.startup --top 25
+    python -m benchmarks.startup --serve --runs 3
+
+Imports open_webui.main in a fresh interpreter with a temporary DATA_DIR and
+prints the wall time, the slowest modules by cumulative and by self time, and
+the self time summed by top-level package, which is usually where to look for
+an import to defer. Cumulative times nest, a module's includes everything it
+imported first. With --serve the server is started with uvicorn as well, and
+the time until /health answers and until /health/ready reports the models
+loaded is measured.
+
+Migrations run on import unless ENABLE_DB_MIGRATIONS=false, the first run in a
+new DATA_DIR includes them, pass --migrate to run them ahead of the timings.
+
+Still imported eagerly and part of every timing: langchain_community (the web
+loaders and the BM25 retriever subclass its classes at module level), the
+storage provider cloud SDKs (their exception types are used in except
+clauses), markdown (routers/utils.py) and langchain itself. bs4, lxml, pydub
+and tiktoken are only imported on first use.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Return (module, self us, cumulative us) for every import."""
+    imports = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def get_env(data_dir: str, migrations: bool) -> dict:
+    return {
+        **os.environ,
+        "DATA_DIR": data_dir,
+        "WEBUI_SECRET_KEY": os.environ.get("WEBUI_SECRET_KEY", "benchmark"),
+        "ENABLE_DB_MIGRATIONS": "true" if migrations else "false",
+    }
+
+
+def migrate(data_dir: str):
+    subprocess.run(
+        [sys.executable, "-c", "import open_webui; open_webui.migrate()"],
+        env=get_env(data_dir, True),
+        check=True,
+        capture_output=True,
+    )
+
+
+def import_main(data_dir: str, migrations: bool) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import open_webui.main"],
+        env=get_env(data_dir, migrations),
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(f"Importing open_webui.main failed:\n{result.stderr[-4000:]}")
+    return elapsed, result.stderr
+
+
+def get_status(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def serve(data_dir: str, migrations: bool, timeout: float) -> tuple[float, float]:
+    """Start the server, return the seconds until it answers and is ready."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "open_webui.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=get_env(data_dir, migrations),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        listening = None
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                sys.exit(f"The server exited with {process.returncode}")
+
+            if listening is None:
+                if get_status(f"{url}/health") is not None:
+                    listening = time.perf_counter() - start
+            elif get_status(f"{url}/health/ready") == 200:
+                return listening, time.perf_counter() - start
+            time.sleep(0.05)
+        sys.exit(f"The server wasn't ready after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def print_table(title: str, rows: list[tuple[str, float]], total: float):
+    print(f"\n{title}")
+    for name, seconds in rows:
+        print(f"  {seconds * 1000:9.1f} ms {seconds / total:6.1%}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--migrate", action="store_true")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="open-webui-benchmark-")
+    try:
+        if args.migrate:
+            migrate(data_dir)
+        migrations = not args.migrate
+
+        runs = [import_main(data_dir, migrations) for _ in range(args.runs)]
+        wall = statistics.median(elapsed for elapsed, _ in runs)
+        # The last run has the warmest file system cache, like a restart
+        imports = parse_importtime(runs[-1][1])
+        total = sum(self_us for _, self_us, _ in imports) / 1e6
+
+        print(f"import open_webui.main: {wall:.2f} s wall, {total:.2f} s importing")
+        print(f"{len(imports)} modules")
+
+        cumulative = sorted(imports, key=lambda row: row[2], reverse=True)
+        print_table(
+            "Slowest modules, cumulative",
+            [(module, us / 1e6) for module, _, us in cumulative[: args.top]],
+            total,
+        )
+
+        own = sorted(imports, key=lambda row: row[1], reverse=True)
+        print_table(
+            "Slowest modules, self",
+            [(module, us / 1e6) for module, us, _ in own[: args.top]],
+            total,
+        )
+
+        packages = defaultdict(int)
+        for module, self_us, _ in imports:
+            packages[module.split(".")[0]] += self_us
+        print_table(
+            "Packages, self",
+            [
+                (package, us / 1e6)
+                for package, us in sorted(
+                    packages.items(), key=lambda item: item[1], reverse=True
+                )[: args.top]
+            ],
+            total,
+        )
+
+        if args.serve:
+            timings = [
+                serve(data_dir, migrations, args.timeout) for _ in range(args.runs)
+            ]
+            listening = statistics.median(listen for listen, _ in timings)
+            ready = statistics.median(ready for _, ready in timings)
+            print(f"\n/health answering after    {listening:.2f} s")
+            print(f"/health/ready ready after {ready:.2f} s")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
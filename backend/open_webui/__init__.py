@@ -30,6 +30,19 @@ def main(
     pass
 
 
+@app.command()
+def migrate():
+    """Run the database migrations, ahead of starting the server."""
+    # Don't run them a second time on import
+    os.environ["ENABLE_DB_MIGRATIONS"] = "false"
+
+    from open_webui.env import DATABASE_URL
+    from open_webui.internal.db import handle_peewee_migration, run_migrations
+
+    handle_peewee_migration(DATABASE_URL)
+    run_migrations(raise_errors=True)
+
+
 @app.command()
 def serve(
     host: str = "0.0.0.0",
@@ -72,6 +85,10 @@ def serve(
             os.environ["USE_CUDA_DOCKER"] = "false"
             os.environ["LD_LIBRARY_PATH"] = ":".join(LD_LIBRARY_PATH)
 
+    # Once here rather than in every worker
+    if os.getenv("ENABLE_DB_MIGRATIONS", "true").lower() == "true":
+        migrate()
+
     import open_webui.main  # we need set environment variables before importing main
     from open_webui.env import UVICORN_WORKERS  # Import the workers setting
 
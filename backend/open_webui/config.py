@@ -19,6 +19,7 @@ from authlib.integrations.starlette_client import OAuth
 from open_webui.env import (
     DATA_DIR,
     DATABASE_URL,
+    ENABLE_DB_MIGRATIONS,
     ENV,
     REDIS_URL,
     REDIS_KEY_PREFIX,
@@ -32,7 +33,7 @@ from open_webui.env import (
     WEBUI_NAME,
     log,
 )
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, get_db, run_migrations
 from open_webui.utils.redis import get_redis_connection
 
 
@@ -49,25 +50,8 @@ logging.getLogger("uvicorn.access").addFilter(EndpointFilter())
 ####################################
 
 
-# Function to run the alembic migrations
-def run_migrations():
-    log.info("Running migrations")
-    try:
-        from alembic import command
-        from alembic.config import Config
-
-        alembic_cfg = Config(OPEN_WEBUI_DIR / "alembic.ini")
-
-        # Set the script location dynamically
-        migrations_path = OPEN_WEBUI_DIR / "migrations"
-        alembic_cfg.set_main_option("script_location", str(migrations_path))
-
-        command.upgrade(alembic_cfg, "head")
-    except Exception as e:
-        log.exception(f"Error running migrations: {e}")
-
-
-run_migrations()
+if ENABLE_DB_MIGRATIONS:
+    run_migrations()
 
 
 class Config(Base):
@@ -901,6 +885,17 @@ AZURE_STORAGE_ENDPOINT = os.environ.get("AZURE_STORAGE_ENDPOINT", None)
 AZURE_STORAGE_CONTAINER_NAME = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", None)
 AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 
+# Uploads are streamed to storage in chunks of this size (also the multipart part size)
+STORAGE_UPLOAD_CHUNK_SIZE = int(
+    os.environ.get("STORAGE_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024))
+)
+STORAGE_UPLOAD_MAX_CONCURRENCY = int(
+    os.environ.get("STORAGE_UPLOAD_MAX_CONCURRENCY", "4")
+)
+
+# Local cache of files downloaded from S3/GCS/Azure, 0 disables it
+STORAGE_CACHE_MAX_SIZE_MB = int(os.environ.get("STORAGE_CACHE_MAX_SIZE_MB", "1024"))
+
 ####################################
 # File Upload DIR
 ####################################
@@ -1942,6 +1937,15 @@ CODE_INTERPRETER_JUPYTER_TIMEOUT = PersistentConfig(
     ),
 )
 
+# Warm Jupyter kernels shared by code execution and the code interpreter.
+# Chats keep their kernel between turns until it has been idle for
+# JUPYTER_KERNEL_POOL_IDLE_TIMEOUT seconds; a max size of 0 disables pooling.
+JUPYTER_KERNEL_POOL_MAX_SIZE = int(os.environ.get("JUPYTER_KERNEL_POOL_MAX_SIZE", "16"))
+JUPYTER_KERNEL_POOL_MIN_IDLE = int(os.environ.get("JUPYTER_KERNEL_POOL_MIN_IDLE", "1"))
+JUPYTER_KERNEL_POOL_IDLE_TIMEOUT = int(
+    os.environ.get("JUPYTER_KERNEL_POOL_IDLE_TIMEOUT", "600")
+)
+
 CODE_INTERPRETER_BLOCKED_MODULES = [
     library.strip()
     for library in os.environ.get("CODE_INTERPRETER_BLOCKED_MODULES", "").split(",")
@@ -1975,10 +1979,9 @@ VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
 if VECTOR_DB == "chroma":
-    import chromadb
-
-    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", chromadb.DEFAULT_TENANT)
-    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", chromadb.DEFAULT_DATABASE)
+    # chromadb.DEFAULT_TENANT and DEFAULT_DATABASE, without importing chromadb
+    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", "default_tenant")
+    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", "default_database")
     CHROMA_HTTP_HOST = os.environ.get("CHROMA_HTTP_HOST", "")
     CHROMA_HTTP_PORT = int(os.environ.get("CHROMA_HTTP_PORT", "8000"))
     CHROMA_CLIENT_AUTH_PROVIDER = os.environ.get("CHROMA_CLIENT_AUTH_PROVIDER", "")
@@ -2100,6 +2103,19 @@ else:
     except Exception:
         PGVECTOR_POOL_RECYCLE = 3600
 
+# Bulk ingestion: "copy" streams rows with COPY FROM STDIN into a staging table,
+# "values" uses batched multi-row INSERT statements, "orm" keeps the ORM path
+PGVECTOR_INSERT_METHOD = os.environ.get("PGVECTOR_INSERT_METHOD", "copy").lower()
+if PGVECTOR_INSERT_METHOD not in ["copy", "values", "orm"]:
+    PGVECTOR_INSERT_METHOD = "copy"
+
+PGVECTOR_INSERT_BATCH_SIZE = os.environ.get("PGVECTOR_INSERT_BATCH_SIZE", "1000")
+
+try:
+    PGVECTOR_INSERT_BATCH_SIZE = max(int(PGVECTOR_INSERT_BATCH_SIZE), 1)
+except Exception:
+    PGVECTOR_INSERT_BATCH_SIZE = 1000
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -2525,6 +2541,14 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Split, embed and insert uploaded files page by page instead of all at once
+ENABLE_RAG_STREAMING_INGESTION = (
+    os.environ.get("ENABLE_RAG_STREAMING_INGESTION", "True").lower() == "true"
+)
+
+# Number of chunks embedded and inserted together during streaming ingestion
+RAG_INGESTION_BATCH_SIZE = int(os.environ.get("RAG_INGESTION_BATCH_SIZE", "256"))
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
@@ -2549,6 +2573,17 @@ RAG_RERANKING_MODEL_TRUST_REMOTE_CODE = (
     os.environ.get("RAG_RERANKING_MODEL_TRUST_REMOTE_CODE", "True").lower() == "true"
 )
 
+# Number of (reranking model, query, chunk) scores kept in memory, 0 disables the cache
+RAG_RERANKING_CACHE_SIZE = int(os.environ.get("RAG_RERANKING_CACHE_SIZE", "10000"))
+
+# Number of documents whose ColBERT token embeddings are kept in memory, 0 disables the cache
+RAG_COLBERT_DOCUMENT_CACHE_SIZE = int(
+    os.environ.get("RAG_COLBERT_DOCUMENT_CACHE_SIZE", "1000")
+)
+
+# Maximum number of hybrid search candidates passed to the reranker, 0 means no limit
+RAG_RERANKING_MAX_CANDIDATES = int(os.environ.get("RAG_RERANKING_MAX_CANDIDATES", "0"))
+
 RAG_EXTERNAL_RERANKER_URL = PersistentConfig(
     "RAG_EXTERNAL_RERANKER_URL",
     "rag.external_reranker_url",
@@ -2666,6 +2701,28 @@ ENABLE_RAG_LOCAL_WEB_FETCH = (
     os.getenv("ENABLE_RAG_LOCAL_WEB_FETCH", "False").lower() == "true"
 )
 
+# How long SSL certificate checks of web loader hosts are cached, 0 disables it.
+# Resolved addresses are reused for at most 10 seconds.
+WEB_LOADER_HOST_CHECK_CACHE_TTL = int(
+    os.getenv("WEB_LOADER_HOST_CHECK_CACHE_TTL", "300")
+)
+
+# HTML text extractor for the safe_web loader: auto, selectolax, lxml or beautifulsoup
+WEB_LOADER_HTML_EXTRACTOR = os.getenv("WEB_LOADER_HTML_EXTRACTOR", "auto").lower()
+
+# Pages are parsed off the event loop in a "thread" or "process" pool of this size
+WEB_LOADER_PARSER_EXECUTOR = os.getenv("WEB_LOADER_PARSER_EXECUTOR", "thread").lower()
+WEB_LOADER_PARSER_WORKERS = int(os.getenv("WEB_LOADER_PARSER_WORKERS", "4"))
+
+# How long fetched web search pages and their chunk embeddings are reused, 0 disables it
+WEB_SEARCH_CACHE_TTL = int(os.getenv("WEB_SEARCH_CACHE_TTL", "3600"))
+WEB_SEARCH_CACHE_MAX_PAGES = int(os.getenv("WEB_SEARCH_CACHE_MAX_PAGES", "1000"))
+WEB_SEARCH_CACHE_MAX_CHUNKS = int(os.getenv("WEB_SEARCH_CACHE_MAX_CHUNKS", "50000"))
+
+# Unused web-search-* collections are deleted after this many seconds, 0 keeps them.
+# Chats that cited a deleted collection lose its sources, so this is opt-in.
+WEB_SEARCH_COLLECTION_TTL = int(os.getenv("WEB_SEARCH_COLLECTION_TTL", "0"))
+
 YOUTUBE_LOADER_LANGUAGE = PersistentConfig(
     "YOUTUBE_LOADER_LANGUAGE",
     "rag.youtube_loader_language",
@@ -2949,6 +3006,20 @@ PLAYWRIGHT_TIMEOUT = PersistentConfig(
     int(os.environ.get("PLAYWRIGHT_TIMEOUT", "10000")),
 )
 
+# Requests for these resource types are aborted by the shared Playwright browser
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = [
+    resource_type.strip()
+    for resource_type in os.environ.get(
+        "PLAYWRIGHT_BLOCKED_RESOURCE_TYPES", "image,font,media"
+    ).split(",")
+    if resource_type.strip()
+]
+
+# Browser contexts are recycled after serving this many pages
+PLAYWRIGHT_MAX_PAGES_PER_CONTEXT = int(
+    os.environ.get("PLAYWRIGHT_MAX_PAGES_PER_CONTEXT", "20")
+)
+
 FIRECRAWL_API_KEY = PersistentConfig(
     "FIRECRAWL_API_KEY",
     "rag.web.loader.firecrawl_api_key",
@@ -3251,6 +3322,23 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# faster-whisper quantization, empty picks int8 on CPU and int8_float16 on CUDA
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")
+
+# Transcriptions the local model runs in parallel, and CPU threads for each
+WHISPER_NUM_WORKERS = int(
+    os.getenv("WHISPER_NUM_WORKERS", str(max(1, min(4, (os.cpu_count() or 1) // 4))))
+)
+WHISPER_CPU_THREADS = int(
+    os.getenv(
+        "WHISPER_CPU_THREADS",
+        str(max(1, (os.cpu_count() or 1) // WHISPER_NUM_WORKERS)),
+    )
+)
+
+# Load (and warm up) the local whisper model at start-up instead of on first use
+WHISPER_MODEL_PREWARM = os.getenv("WHISPER_MODEL_PREWARM", "True").lower() == "true"
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
@@ -3387,6 +3475,15 @@ AUDIO_TTS_AZURE_SPEECH_OUTPUT_FORMAT = PersistentConfig(
     ),
 )
 
+# Synthesized speech kept in CACHE_DIR/audio/speech, 0 disables the limit
+AUDIO_TTS_CACHE_MAX_SIZE_MB = int(os.getenv("AUDIO_TTS_CACHE_MAX_SIZE_MB", "1024"))
+AUDIO_TTS_CACHE_MAX_AGE = int(
+    os.getenv("AUDIO_TTS_CACHE_MAX_AGE", str(30 * 24 * 60 * 60))
+)
+
+# Worker threads running local (transformers) speech synthesis
+AUDIO_TTS_WORKERS = int(os.getenv("AUDIO_TTS_WORKERS", "1"))
+
 
 ####################################
 # LDAP
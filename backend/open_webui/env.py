@@ -1,3 +1,4 @@
+import functools
 import importlib.metadata
 import json
 import logging
@@ -9,8 +10,6 @@ from uuid import uuid4
 from pathlib import Path
 from cryptography.hazmat.primitives import serialization
 
-import markdown
-from bs4 import BeautifulSoup
 from open_webui.constants import ERROR_MESSAGES
 
 ####################################
@@ -58,13 +57,15 @@ if USE_CUDA.lower() == "true":
 else:
     DEVICE_TYPE = "cpu"
 
-try:
-    import torch
+# Only Apple silicon has MPS, skip importing torch elsewhere
+if sys.platform == "darwin":
+    try:
+        import torch
 
-    if torch.backends.mps.is_available() and torch.backends.mps.is_built():
-        DEVICE_TYPE = "mps"
-except Exception:
-    pass
+        if torch.backends.mps.is_available() and torch.backends.mps.is_built():
+            DEVICE_TYPE = "mps"
+    except Exception:
+        pass
 
 ####################################
 # LOGGING
@@ -157,45 +158,59 @@ def parse_section(section):
     return items
 
 
-try:
-    changelog_path = BASE_DIR / "CHANGELOG.md"
-    with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
-        changelog_content = file.read()
+@functools.cache
+def get_changelog() -> dict:
+    """
+    The changelog as JSON, parsed on first use since markdown and
+    BeautifulSoup add to the start-up time.
+    """
+    import markdown
+    from bs4 import BeautifulSoup
 
-except Exception:
-    changelog_content = (pkgutil.get_data("open_webui", "CHANGELOG.md") or b"").decode()
+    try:
+        changelog_path = BASE_DIR / "CHANGELOG.md"
+        with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
+            changelog_content = file.read()
+
+    except Exception:
+        changelog_content = (
+            pkgutil.get_data("open_webui", "CHANGELOG.md") or b""
+        ).decode()
+
+    # Convert markdown content to HTML
+    html_content = markdown.markdown(changelog_content)
 
-# Convert markdown content to HTML
-html_content = markdown.markdown(changelog_content)
+    # Parse the HTML content
+    soup = BeautifulSoup(html_content, "html.parser")
 
-# Parse the HTML content
-soup = BeautifulSoup(html_content, "html.parser")
+    # Initialize JSON structure
+    changelog_json = {}
 
-# Initialize JSON structure
-changelog_json = {}
+    # Iterate over each version
+    for version in soup.find_all("h2"):
+        version_number = (
+            version.get_text().strip().split(" - ")[0][1:-1]
+        )  # Remove brackets
+        date = version.get_text().strip().split(" - ")[1]
 
-# Iterate over each version
-for version in soup.find_all("h2"):
-    version_number = version.get_text().strip().split(" - ")[0][1:-1]  # Remove brackets
-    date = version.get_text().strip().split(" - ")[1]
+        version_data = {"date": date}
 
-    version_data = {"date": date}
+        # Find the next sibling that is a h3 tag (section title)
+        current = version.find_next_sibling()
 
-    # Find the next sibling that is a h3 tag (section title)
-    current = version.find_next_sibling()
+        while current and current.name != "h2":
+            if current.name == "h3":
+                section_title = current.get_text().lower()  # e.g., "added", "fixed"
+                section_items = parse_section(current.find_next_sibling("ul"))
+                version_data[section_title] = section_items
 
-    while current and current.name != "h2":
-        if current.name == "h3":
-            section_title = current.get_text().lower()  # e.g., "added", "fixed"
-            section_items = parse_section(current.find_next_sibling("ul"))
-            version_data[section_title] = section_items
+            # Move to the next element
+            current = current.find_next_sibling()
 
-        # Move to the next element
-        current = current.find_next_sibling()
+        changelog_json[version_number] = version_data
 
-    changelog_json[version_number] = version_data
+    return changelog_json
 
-CHANGELOG = changelog_json
 
 ####################################
 # SAFE_MODE
@@ -343,6 +358,10 @@ DATABASE_ENABLE_SQLITE_WAL = (
     os.environ.get("DATABASE_ENABLE_SQLITE_WAL", "False").lower() == "true"
 )
 
+# Set to False when the migrations run as a separate step before the server
+# starts (`open-webui migrate`), so workers don't run them on import
+ENABLE_DB_MIGRATIONS = os.environ.get("ENABLE_DB_MIGRATIONS", "True").lower() == "true"
+
 DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = os.environ.get(
     "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", None
 )
@@ -364,6 +383,20 @@ ENABLE_REALTIME_CHAT_SAVE = (
 
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
+# Rows fetched per round trip when streaming chat exports
+CHAT_EXPORT_BATCH_SIZE = os.environ.get("CHAT_EXPORT_BATCH_SIZE", "100")
+try:
+    CHAT_EXPORT_BATCH_SIZE = max(int(CHAT_EXPORT_BATCH_SIZE), 1)
+except ValueError:
+    CHAT_EXPORT_BATCH_SIZE = 100
+
+# Chats inserted per transaction by the bulk chat import
+CHAT_IMPORT_BATCH_SIZE = os.environ.get("CHAT_IMPORT_BATCH_SIZE", "500")
+try:
+    CHAT_IMPORT_BATCH_SIZE = max(int(CHAT_IMPORT_BATCH_SIZE), 1)
+except ValueError:
+    CHAT_IMPORT_BATCH_SIZE = 500
+
 ####################################
 # REDIS
 ####################################
@@ -385,6 +418,36 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+####################################
+# COMMUNITY FEED
+####################################
+
+# Posts of authors with more followers than this aren't pushed to the cached
+# timelines of their followers, they are merged in when a feed is read
+COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS = os.environ.get(
+    "COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS", "1000"
+)
+try:
+    COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS = int(COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS)
+except ValueError:
+    COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS = 1000
+
+# Post ids kept in each cached timeline, older pages are read from the database
+COMMUNITY_FEED_TIMELINE_MAX_LENGTH = os.environ.get(
+    "COMMUNITY_FEED_TIMELINE_MAX_LENGTH", "800"
+)
+try:
+    COMMUNITY_FEED_TIMELINE_MAX_LENGTH = max(int(COMMUNITY_FEED_TIMELINE_MAX_LENGTH), 1)
+except ValueError:
+    COMMUNITY_FEED_TIMELINE_MAX_LENGTH = 800
+
+# Seconds a cached timeline lives without being rebuilt
+COMMUNITY_FEED_TIMELINE_TTL = os.environ.get("COMMUNITY_FEED_TIMELINE_TTL", "86400")
+try:
+    COMMUNITY_FEED_TIMELINE_TTL = max(int(COMMUNITY_FEED_TIMELINE_TTL), 1)
+except ValueError:
+    COMMUNITY_FEED_TIMELINE_TTL = 86400
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -679,6 +742,30 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+
+# Cross-request micro-batching for local (sentence-transformers) embedding and reranking models
+ENABLE_RAG_LOCAL_INFERENCE_BATCHING = (
+    os.environ.get("ENABLE_RAG_LOCAL_INFERENCE_BATCHING", "True").lower() == "true"
+)
+
+RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS = os.environ.get(
+    "RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS", "5"
+)
+
+try:
+    RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS = float(RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS)
+except Exception:
+    RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS = 5.0
+
+RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE = os.environ.get(
+    "RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE", "64"
+)
+
+try:
+    RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE = int(RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE)
+except Exception:
+    RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE = 64
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -692,6 +779,12 @@ if OFFLINE_MODE:
     os.environ["HF_HUB_OFFLINE"] = "1"
     ENABLE_VERSION_UPDATE_CHECK = False
 
+# Load the embedding and reranking models after the server has started,
+# /health/ready reports 503 until they are ready
+ENABLE_BACKGROUND_MODEL_LOADING = (
+    os.environ.get("ENABLE_BACKGROUND_MODEL_LOADING", "True").lower() == "true"
+)
+
 ####################################
 # AUDIT LOGGING
 ####################################
@@ -6,6 +6,7 @@ import mimetypes
 import os
 import shutil
 import sys
+import threading
 import time
 import random
 from uuid import uuid4
@@ -97,6 +98,12 @@ from open_webui.routers.retrieval import (
     get_rf,
 )
 
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.web.browser_pool import PLAYWRIGHT_BROWSER_POOL
+from open_webui.retrieval.web.cache import periodic_web_search_collection_cleanup
+from open_webui.retrieval.web.utils import close_web_loader_resources
+from open_webui.utils.code_interpreter import close_kernel_pools
+
 from open_webui.internal.db import Session, engine
 
 from open_webui.models.functions import Functions
@@ -192,6 +199,7 @@ from open_webui.config import (
     DEEPGRAM_API_KEY,
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_MODEL_DIR,
+    WHISPER_MODEL_PREWARM,
     # Retrieval
     RAG_TEMPLATE,
     DEFAULT_RAG_TEMPLATE,
@@ -410,7 +418,7 @@ from open_webui.env import (
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
-    CHANGELOG,
+    get_changelog,
     REDIS_URL,
     REDIS_CLUSTER,
     REDIS_KEY_PREFIX,
@@ -441,6 +449,7 @@ from open_webui.env import (
     ENABLE_OTEL,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
+    ENABLE_BACKGROUND_MODEL_LOADING,
 )
 
 
@@ -562,6 +571,21 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    if app.state.config.STT_ENGINE == "" and WHISPER_MODEL_PREWARM:
+        # Loaded in the background, transcriptions wait for it if needed
+        app.state.whisper_model_prewarm = asyncio.create_task(
+            asyncio.to_thread(audio.prewarm_faster_whisper_model, app)
+        )
+
+    if ENABLE_BACKGROUND_MODEL_LOADING:
+        # /health/ready reports 503 until they are loaded
+        app.state.retrieval_models_loading = asyncio.create_task(
+            asyncio.to_thread(load_retrieval_models)
+        )
+    app.state.web_search_collection_cleanup = asyncio.create_task(
+        periodic_web_search_collection_cleanup()
+    )
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -588,6 +612,11 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    app.state.web_search_collection_cleanup.cancel()
+    await PLAYWRIGHT_BROWSER_POOL.close()
+    await close_web_loader_resources()
+    await close_kernel_pools()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -931,65 +960,126 @@ app.state.rf = None
 app.state.YOUTUBE_LOADER_TRANSLATION = None
 
 
-try:
-    app.state.ef = get_ef(
-        app.state.config.RAG_EMBEDDING_ENGINE,
-        app.state.config.RAG_EMBEDDING_MODEL,
-        RAG_EMBEDDING_MODEL_AUTO_UPDATE,
-    )
+# Also held by the retrieval config handlers while they replace the models, so
+# a background load never overwrites them with the previous settings
+app.state.RETRIEVAL_MODELS_LOCK = threading.Lock()
+app.state.RETRIEVAL_MODELS_READY = threading.Event()
+
+
+def load_retrieval_models():
+    """
+    Load the embedding and reranking models and set the functions using them,
+    once. Called in the background on startup, or by the first use.
+    """
+    with app.state.RETRIEVAL_MODELS_LOCK:
+        if app.state.RETRIEVAL_MODELS_READY.is_set():
+            return
+
+        try:
+            # Connect to the vector db here too, so errors show up on startup
+            VECTOR_DB_CLIENT.load()
+        except Exception as e:
+            log.error(f"Error connecting to the vector db: {e}")
+
+        try:
+            try:
+                app.state.ef = get_ef(
+                    app.state.config.RAG_EMBEDDING_ENGINE,
+                    app.state.config.RAG_EMBEDDING_MODEL,
+                    RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+                )
+                if (
+                    app.state.config.ENABLE_RAG_HYBRID_SEARCH
+                    and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                ):
+                    app.state.rf = get_rf(
+                        app.state.config.RAG_RERANKING_ENGINE,
+                        app.state.config.RAG_RERANKING_MODEL,
+                        app.state.config.RAG_EXTERNAL_RERANKER_URL,
+                        app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+                        RAG_RERANKING_MODEL_AUTO_UPDATE,
+                    )
+                else:
+                    app.state.rf = None
+            except Exception as e:
+                log.error(f"Error updating models: {e}")
+
+            app.state.EMBEDDING_FUNCTION = get_embedding_function(
+                app.state.config.RAG_EMBEDDING_ENGINE,
+                app.state.config.RAG_EMBEDDING_MODEL,
+                embedding_function=app.state.ef,
+                url=(
+                    app.state.config.RAG_OPENAI_API_BASE_URL
+                    if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        app.state.config.RAG_OLLAMA_BASE_URL
+                        if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else app.state.config.RAG_AZURE_OPENAI_BASE_URL
+                    )
+                ),
+                key=(
+                    app.state.config.RAG_OPENAI_API_KEY
+                    if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        app.state.config.RAG_OLLAMA_API_KEY
+                        if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else app.state.config.RAG_AZURE_OPENAI_API_KEY
+                    )
+                ),
+                embedding_batch_size=app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                azure_api_version=(
+                    app.state.config.RAG_AZURE_OPENAI_API_VERSION
+                    if app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+                    else None
+                ),
+            )
+
+            app.state.RERANKING_FUNCTION = get_reranking_function(
+                app.state.config.RAG_RERANKING_ENGINE,
+                app.state.config.RAG_RERANKING_MODEL,
+                reranking_function=app.state.rf,
+            )
+        finally:
+            app.state.RETRIEVAL_MODELS_READY.set()
+
+
+def get_retrieval_model_function(name: str):
+    """
+    Stand in for app.state.<name> until the models are loaded. Calls from
+    threads load or wait for them, calls on the event loop fail instead of
+    blocking it.
+    """
+
+    def func(*args, **kwargs):
+        if not app.state.RETRIEVAL_MODELS_READY.is_set():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                load_retrieval_models()
+            else:
+                raise Exception("The retrieval models are still loading")
+
+        loaded = getattr(app.state, name)
+        if loaded is None or loaded is func:
+            raise Exception(f"{name} is not available")
+        return loaded(*args, **kwargs)
+
+    return func
+
+
+if ENABLE_BACKGROUND_MODEL_LOADING:
+    # Loaded from the lifespan
+    app.state.EMBEDDING_FUNCTION = get_retrieval_model_function("EMBEDDING_FUNCTION")
     if (
         app.state.config.ENABLE_RAG_HYBRID_SEARCH
         and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
     ):
-        app.state.rf = get_rf(
-            app.state.config.RAG_RERANKING_ENGINE,
-            app.state.config.RAG_RERANKING_MODEL,
-            app.state.config.RAG_EXTERNAL_RERANKER_URL,
-            app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-            RAG_RERANKING_MODEL_AUTO_UPDATE,
-        )
-    else:
-        app.state.rf = None
-except Exception as e:
-    log.error(f"Error updating models: {e}")
-    pass
-
-
-app.state.EMBEDDING_FUNCTION = get_embedding_function(
-    app.state.config.RAG_EMBEDDING_ENGINE,
-    app.state.config.RAG_EMBEDDING_MODEL,
-    embedding_function=app.state.ef,
-    url=(
-        app.state.config.RAG_OPENAI_API_BASE_URL
-        if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-        else (
-            app.state.config.RAG_OLLAMA_BASE_URL
-            if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-            else app.state.config.RAG_AZURE_OPENAI_BASE_URL
-        )
-    ),
-    key=(
-        app.state.config.RAG_OPENAI_API_KEY
-        if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-        else (
-            app.state.config.RAG_OLLAMA_API_KEY
-            if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-            else app.state.config.RAG_AZURE_OPENAI_API_KEY
+        app.state.RERANKING_FUNCTION = get_retrieval_model_function(
+            "RERANKING_FUNCTION"
         )
-    ),
-    embedding_batch_size=app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-    azure_api_version=(
-        app.state.config.RAG_AZURE_OPENAI_API_VERSION
-        if app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-        else None
-    ),
-)
+else:
+    load_retrieval_models()
 
-app.state.RERANKING_FUNCTION = get_reranking_function(
-    app.state.config.RAG_RERANKING_ENGINE,
-    app.state.config.RAG_RERANKING_MODEL,
-    reranking_function=app.state.rf,
-)
 
 ########################################
 #
@@ -1481,6 +1571,7 @@ async def chat_completion(
                 request, form_data, user, metadata, model
             )
 
+            started_at = time.perf_counter()
             response = await chat_completion_handler(request, form_data, user)
             if metadata.get("chat_id") and metadata.get("message_id"):
                 try:
@@ -1495,7 +1586,15 @@ async def chat_completion(
                     pass
 
             return await process_chat_response(
-                request, response, form_data, user, metadata, model, events, tasks
+                request,
+                response,
+                form_data,
+                user,
+                metadata,
+                model,
+                events,
+                tasks,
+                started_at=started_at,
             )
         except asyncio.CancelledError:
             log.info("Chat processing was cancelled")
@@ -1845,7 +1944,8 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
 
 @app.get("/api/changelog")
 async def get_app_changelog():
-    return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
+    changelog = get_changelog()
+    return {key: changelog[key] for idx, key in enumerate(changelog) if idx < 5}
 
 
 @app.get("/api/usage")
@@ -1941,6 +2041,14 @@ async def healthcheck():
     return {"status": True}
 
 
+@app.get("/health/ready")
+async def healthcheck_ready():
+    # The embedding and reranking models load in the background on startup
+    if not app.state.RETRIEVAL_MODELS_READY.is_set():
+        return JSONResponse(status_code=503, content={"status": False})
+    return {"status": True}
+
+
 @app.get("/health/db")
 async def healthcheck_with_db():
     Session.execute(text("SELECT 1;")).all()
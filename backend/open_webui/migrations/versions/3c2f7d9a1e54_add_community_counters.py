@@ -0,0 +1,68 @@
+"""Add community counters
+
+Revision ID: 3c2f7d9a1e54
+Revises: 749c5653f044
+Create Date: 2025-09-24 14:12:40.871215
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "3c2f7d9a1e54"
+down_revision = "749c5653f044"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "community_post",
+        sa.Column("like_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "community_post",
+        sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.create_table(
+        "community_user_stats",
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("following_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Backfill the counters from the existing likes, comments and follows
+    op.execute(
+        """
+        UPDATE community_post SET
+            like_count = (
+                SELECT COUNT(*) FROM community_post_like
+                WHERE community_post_like.post_id = community_post.id
+            ),
+            comment_count = (
+                SELECT COUNT(*) FROM community_comment
+                WHERE community_comment.post_id = community_post.id
+            )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO community_user_stats (user_id, follower_count, following_count)
+        SELECT user_id, SUM(follower_count), SUM(following_count) FROM (
+            SELECT following_id AS user_id, 1 AS follower_count, 0 AS following_count
+            FROM community_follow
+            UNION ALL
+            SELECT follower_id AS user_id, 0 AS follower_count, 1 AS following_count
+            FROM community_follow
+        ) AS follows
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("community_user_stats")
+    op.drop_column("community_post", "comment_count")
+    op.drop_column("community_post", "like_count")
@@ -0,0 +1,274 @@
+"""Add chat search index
+
+Revision ID: 5ef3b1741a87
+Revises: 38d63c18f30f, b5b741edfe1e
+Create Date: 2025-09-20 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5ef3b1741a87"
+down_revision: Union[str, Sequence[str], None] = ("38d63c18f30f", "b5b741edfe1e")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+# Text of all messages in `chat`.messages, newline separated
+SQLITE_CONTENT_SQL = """
+COALESCE((
+    SELECT group_concat(json_extract(message.value, '$.content'), char(10))
+    FROM json_each({chat}, '$.messages') AS message
+    WHERE message.type = 'object'
+), '')
+"""
+
+SQLITE_UPSERT_SQL = """
+INSERT INTO chat_search (chat_id, user_id, title, content)
+VALUES (NEW.id, NEW.user_id, NEW.title, {content})
+ON CONFLICT (chat_id) DO UPDATE SET
+    user_id = excluded.user_id,
+    title = excluded.title,
+    content = excluded.content;
+""".format(
+    content=SQLITE_CONTENT_SQL.format(chat="NEW.chat")
+)
+
+SQLITE_UPGRADE = [
+    """
+    CREATE TABLE chat_search (
+        id INTEGER PRIMARY KEY,
+        chat_id TEXT NOT NULL UNIQUE,
+        user_id TEXT,
+        title TEXT,
+        content TEXT
+    )
+    """,
+    "CREATE INDEX chat_search_user_id_idx ON chat_search (user_id)",
+    # External content FTS5 table over chat_search, kept in sync by the triggers
+    # below. Trigrams match substrings, so words in scripts written without
+    # spaces (Chinese, Japanese, ...) are found as well.
+    """
+    CREATE VIRTUAL TABLE chat_search_fts USING fts5(
+        title,
+        content,
+        content='chat_search',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+        INSERT INTO chat_search_fts (rowid, title, content)
+        VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+        INSERT INTO chat_search_fts (chat_search_fts, rowid, title, content)
+        VALUES ('delete', OLD.id, OLD.title, OLD.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+        INSERT INTO chat_search_fts (chat_search_fts, rowid, title, content)
+        VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        INSERT INTO chat_search_fts (rowid, title, content)
+        VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+    # Shared chat snapshots (user_id "shared-<chat id>") are never searched
+    f"""
+    CREATE TRIGGER chat_search_chat_ai AFTER INSERT ON chat
+    WHEN NEW.user_id NOT LIKE 'shared-%' BEGIN
+        {SQLITE_UPSERT_SQL}
+    END
+    """,
+    f"""
+    CREATE TRIGGER chat_search_chat_au AFTER UPDATE OF title, chat ON chat
+    WHEN NEW.user_id NOT LIKE 'shared-%' BEGIN
+        {SQLITE_UPSERT_SQL}
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_chat_ad AFTER DELETE ON chat BEGIN
+        DELETE FROM chat_search WHERE chat_id = OLD.id;
+    END
+    """,
+]
+
+SQLITE_BACKFILL_SQL = """
+INSERT INTO chat_search (chat_id, user_id, title, content)
+SELECT chat.id, chat.user_id, chat.title, {content}
+FROM chat
+WHERE chat.id > :first_id AND chat.id <= :last_id
+    AND chat.user_id NOT LIKE 'shared-%'
+ON CONFLICT (chat_id) DO NOTHING
+""".format(
+    content=SQLITE_CONTENT_SQL.format(chat="chat.chat")
+)
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS chat_search_chat_ad",
+    "DROP TRIGGER IF EXISTS chat_search_chat_au",
+    "DROP TRIGGER IF EXISTS chat_search_chat_ai",
+    "DROP TABLE IF EXISTS chat_search_fts",
+    "DROP TABLE IF EXISTS chat_search",
+]
+
+POSTGRES_UPGRADE = [
+    """
+    CREATE TABLE chat_search (
+        chat_id TEXT PRIMARY KEY REFERENCES chat (id) ON DELETE CASCADE,
+        user_id TEXT,
+        title TEXT,
+        content TEXT
+    )
+    """,
+    "CREATE INDEX chat_search_user_id_idx ON chat_search (user_id)",
+    # Trigram indexes serve substring ILIKE matches, in any script
+    "CREATE INDEX chat_search_title_idx ON chat_search USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX chat_search_content_idx ON chat_search USING GIN (content gin_trgm_ops)",
+    """
+    CREATE OR REPLACE FUNCTION chat_search_content(chat JSON) RETURNS TEXT AS $$
+        SELECT COALESCE(string_agg(message->>'content', E'\\n'), '')
+        FROM json_array_elements(
+            CASE WHEN json_typeof(chat->'messages') = 'array'
+                THEN chat->'messages' ELSE '[]'::JSON END
+        ) AS message
+        WHERE json_typeof(message) = 'object'
+    $$ LANGUAGE SQL IMMUTABLE
+    """,
+    # Chats whose content can't be indexed (NUL escapes) fall back to their
+    # title instead of failing the write.
+    """
+    CREATE OR REPLACE FUNCTION chat_search_index(
+        _chat_id TEXT, _user_id TEXT, _title TEXT, _chat JSON
+    ) RETURNS VOID AS $$
+    DECLARE
+        document TEXT := '';
+    BEGIN
+        BEGIN
+            document := chat_search_content(_chat);
+        EXCEPTION WHEN OTHERS THEN
+            RAISE WARNING 'chat_search: indexing title only for chat %: %', _chat_id, SQLERRM;
+            document := '';
+        END;
+
+        INSERT INTO chat_search (chat_id, user_id, title, content)
+        VALUES (_chat_id, _user_id, _title, document)
+        ON CONFLICT (chat_id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            title = EXCLUDED.title,
+            content = EXCLUDED.content;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION chat_search_update() RETURNS TRIGGER AS $$
+    BEGIN
+        IF NEW.user_id NOT LIKE 'shared-%' THEN
+            PERFORM chat_search_index(NEW.id, NEW.user_id, NEW.title, NEW.chat::JSON);
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER chat_search_update AFTER INSERT OR UPDATE OF title, chat ON chat
+    FOR EACH ROW EXECUTE PROCEDURE chat_search_update()
+    """,
+]
+
+POSTGRES_BACKFILL_SQL = """
+SELECT chat_search_index(chat.id, chat.user_id, chat.title, chat.chat::JSON)
+FROM chat
+WHERE chat.id > :first_id AND chat.id <= :last_id
+    AND chat.user_id NOT LIKE 'shared-%'
+"""
+
+POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS chat_search_update ON chat",
+    "DROP FUNCTION IF EXISTS chat_search_update()",
+    "DROP FUNCTION IF EXISTS chat_search_index(TEXT, TEXT, TEXT, JSON)",
+    "DROP FUNCTION IF EXISTS chat_search_content(JSON)",
+    "DROP TABLE IF EXISTS chat_search",
+]
+
+
+def backfill(conn, sql: str) -> None:
+    # Index existing chats in id order, BACKFILL_BATCH_SIZE chats per statement
+    chat_table = sa.table("chat", sa.column("id"))
+    last_id = ""
+    total = 0
+    while True:
+        ids = (
+            conn.execute(
+                sa.select(chat_table.c.id)
+                .where(chat_table.c.id > last_id)
+                .order_by(chat_table.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+
+        conn.execute(sa.text(sql), {"first_id": last_id, "last_id": ids[-1]})
+        last_id = ids[-1]
+        total += len(ids)
+        print(f"Indexed {total} chats for search")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "sqlite":
+        if not conn.execute(
+            sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        ).scalar():
+            print("SQLite was built without FTS5, chat search stays unindexed")
+            return
+
+        # The trigram tokenizer was added in SQLite 3.34
+        version = conn.execute(sa.text("SELECT sqlite_version()")).scalar()
+        if tuple(int(part) for part in version.split(".")[:2]) < (3, 34):
+            print(
+                f"SQLite {version} has no trigram tokenizer, chat search stays unindexed"
+            )
+            return
+
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+        backfill(conn, SQLITE_BACKFILL_SQL)
+
+    elif dialect_name == "postgresql":
+        try:
+            with conn.begin_nested():
+                conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except sa.exc.DBAPIError as e:
+            print(f"pg_trgm is not available, chat search stays unindexed: {e}")
+            return
+
+        for statement in POSTGRES_UPGRADE:
+            op.execute(statement)
+        backfill(conn, POSTGRES_BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect_name == "postgresql":
+        for statement in POSTGRES_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,50 @@
+"""Add keyset pagination indexes
+
+Revision ID: 749c5653f044
+Revises: 5ef3b1741a87
+Create Date: 2025-09-22 09:41:18.502337
+
+"""
+
+from alembic import op
+
+revision = "749c5653f044"
+down_revision = "5ef3b1741a87"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pages are read in (sort column, id) order after the cursor of the previous page
+
+    # WHERE user_id = ... ORDER BY updated_at DESC, id DESC
+    op.create_index(
+        "user_id_updated_at_id_idx", "chat", ["user_id", "updated_at", "id"]
+    )
+
+    # ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_community_post_created_at_id", "community_post", ["created_at", "id"]
+    )
+    # WHERE user_id = ... ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_community_post_user_id_created_at_id",
+        "community_post",
+        ["user_id", "created_at", "id"],
+    )
+
+    # WHERE channel_id = ... AND parent_id IS NULL ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_message_channel_id_parent_id_created_at_id",
+        "message",
+        ["channel_id", "parent_id", "created_at", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_message_channel_id_parent_id_created_at_id", table_name="message")
+    op.drop_index(
+        "ix_community_post_user_id_created_at_id", table_name="community_post"
+    )
+    op.drop_index("ix_community_post_created_at_id", table_name="community_post")
+    op.drop_index("user_id_updated_at_id_idx", table_name="chat")
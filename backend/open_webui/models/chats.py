@@ -1,17 +1,21 @@
+import html
 import logging
 import json
+import re
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import CHAT_EXPORT_BATCH_SIZE, SRC_LOG_LEVELS
+from open_webui.utils.pagination import OrderBy, paginate
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, inspect, table, column
+from sqlalchemy import literal_column
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -53,9 +57,40 @@ class Chat(Base):
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
+        # WHERE user_id = ... ORDER BY updated_at DESC, id DESC (keyset pagination)
+        Index("user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
     )
 
 
+# Trigram index of chat titles and message content, created and kept up to
+# date by database triggers (see the 5ef3b1741a87 migration). On SQLite it is
+# an FTS5 table over `chat_search`, on PostgreSQL pg_trgm GIN indexes.
+ChatSearch = table(
+    "chat_search",
+    column("id"),
+    column("chat_id"),
+    column("user_id"),
+    column("title"),
+    column("content"),
+)
+ChatSearchFts = table("chat_search_fts", column("rowid"))
+
+CHAT_SEARCH_TABLES = {
+    "sqlite": ["chat_search", "chat_search_fts"],
+    "postgresql": ["chat_search"],
+}
+CHAT_SEARCH_SNIPPET_START = "<mark>"
+CHAT_SEARCH_SNIPPET_END = "</mark>"
+# Private use characters the database marks matches with, replaced by the
+# tags above once the snippet text is HTML escaped
+CHAT_SEARCH_MATCH_START = "\ue000"
+CHAT_SEARCH_MATCH_END = "\ue001"
+# Trigram indexes can't look up shorter terms, those are searched without them
+CHAT_SEARCH_MIN_TERM_LENGTH = 3
+# Characters of message content shown around the first match on PostgreSQL
+CHAT_SEARCH_SNIPPET_CONTEXT = 48
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -120,9 +155,40 @@ class ChatTitleIdResponse(BaseModel):
     title: str
     updated_at: int
     created_at: int
+    # Search results only: HTML escaped matching text with the search terms
+    # wrapped in <mark></mark>
+    snippet: Optional[str] = None
+
+
+# Columns needed to list chats, selected instead of full rows so the `chat`
+# JSON with every message is never loaded or validated for a listing
+CHAT_TITLE_ID_COLUMNS = (Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
 
 
 class ChatTable:
+    def __init__(self):
+        self._search_index = {}
+
+    def has_search_index(self, db) -> bool:
+        dialect_name = db.bind.dialect.name
+        if dialect_name not in self._search_index:
+            inspector = inspect(db.bind)
+            table_names = CHAT_SEARCH_TABLES.get(dialect_name, [])
+            self._search_index[dialect_name] = bool(table_names) and all(
+                inspector.has_table(table_name) for table_name in table_names
+            )
+            if not self._search_index[dialect_name]:
+                log.warning(
+                    "Chat search index not found, searching message content without it"
+                )
+        return self._search_index[dialect_name]
+
+    def _get_chat_title_id_list(self, query) -> list[ChatTitleIdResponse]:
+        return [
+            ChatTitleIdResponse.model_validate(dict(chat._mapping))
+            for chat in query.with_entities(*CHAT_TITLE_ID_COLUMNS).all()
+        ]
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -148,36 +214,32 @@ class ChatTable:
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
 
+    def _new_import_chat(self, user_id: str, form_data: ChatImportForm) -> ChatModel:
+        return ChatModel(
+            **{
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "title": (
+                    form_data.chat["title"] if "title" in form_data.chat else "New Chat"
+                ),
+                "chat": form_data.chat,
+                "meta": form_data.meta or {},
+                "pinned": form_data.pinned,
+                "folder_id": form_data.folder_id,
+                "created_at": (
+                    form_data.created_at if form_data.created_at else int(time.time())
+                ),
+                "updated_at": (
+                    form_data.updated_at if form_data.updated_at else int(time.time())
+                ),
+            }
+        )
+
     def import_chat(
         self, user_id: str, form_data: ChatImportForm
     ) -> Optional[ChatModel]:
         with get_db() as db:
-            id = str(uuid.uuid4())
-            chat = ChatModel(
-                **{
-                    "id": id,
-                    "user_id": user_id,
-                    "title": (
-                        form_data.chat["title"]
-                        if "title" in form_data.chat
-                        else "New Chat"
-                    ),
-                    "chat": form_data.chat,
-                    "meta": form_data.meta,
-                    "pinned": form_data.pinned,
-                    "folder_id": form_data.folder_id,
-                    "created_at": (
-                        form_data.created_at
-                        if form_data.created_at
-                        else int(time.time())
-                    ),
-                    "updated_at": (
-                        form_data.updated_at
-                        if form_data.updated_at
-                        else int(time.time())
-                    ),
-                }
-            )
+            chat = self._new_import_chat(user_id, form_data)
 
             result = Chat(**chat.model_dump())
             db.add(result)
@@ -185,6 +247,19 @@ class ChatTable:
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
 
+    def import_chats(
+        self, user_id: str, forms: list[ChatImportForm]
+    ) -> list[ChatModel]:
+        """Insert the chats of `forms` with one multi-row INSERT in one transaction."""
+        chats = [self._new_import_chat(user_id, form_data) for form_data in forms]
+        if not chats:
+            return []
+
+        with get_db() as db:
+            db.execute(Chat.__table__.insert(), [chat.model_dump() for chat in chats])
+            db.commit()
+        return chats
+
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -412,14 +487,52 @@ class ChatTable:
         except Exception:
             return False
 
+    def _get_chat_list_order_by(self, filter: Optional[dict]) -> OrderBy:
+        order_by = filter.get("order_by") if filter else None
+        direction = filter.get("direction") if filter else None
+
+        if order_by and direction and getattr(Chat, order_by):
+            if direction.lower() not in ("asc", "desc"):
+                raise ValueError("Invalid direction for ordering")
+            descending = direction.lower() == "desc"
+            return [(getattr(Chat, order_by), descending), (Chat.id, descending)]
+        return [(Chat.updated_at, True), (Chat.id, True)]
+
+    def _get_chat_title_id_page(
+        self,
+        query,
+        order_by: OrderBy,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        keyset: bool = True,
+    ) -> tuple[list[ChatTitleIdResponse], Optional[str]]:
+        # Cursors can only resume from columns that are selected
+        selected = {column.key for column in CHAT_TITLE_ID_COLUMNS}
+        rows, next_cursor = paginate(
+            query.with_entities(*CHAT_TITLE_ID_COLUMNS),
+            order_by,
+            skip=skip or 0,
+            limit=limit,
+            cursor=cursor,
+            keyset=keyset and all(column.key in selected for column, _ in order_by),
+        )
+        return [
+            ChatTitleIdResponse.model_validate(dict(row._mapping)) for row in rows
+        ], next_cursor
+
     def get_archived_chat_list_by_user_id(
         self,
         user_id: str,
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
-
+        cursor: Optional[str] = None,
+    ) -> tuple[list[ChatTitleIdResponse], Optional[str]]:
+        """
+        Returns a page of archived chats and the cursor of the next page,
+        `cursor` takes precedence over `skip`.
+        """
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id, archived=True)
 
@@ -428,26 +541,13 @@ class ChatTable:
                 if query_key:
                     query = query.filter(Chat.title.ilike(f"%{query_key}%"))
 
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chat_title_id_page(
+                query,
+                self._get_chat_list_order_by(filter),
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+            )
 
     def get_chat_list_by_user_id(
         self,
@@ -456,7 +556,7 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id)
             if not include_archived:
@@ -467,26 +567,10 @@ class ChatTable:
                 if query_key:
                     query = query.filter(Chat.title.ilike(f"%{query_key}%"))
 
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            chats, _ = self._get_chat_title_id_page(
+                query, self._get_chat_list_order_by(filter), skip=skip, limit=limit
+            )
+            return chats
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -494,7 +578,12 @@ class ChatTable:
         include_archived: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> list[ChatTitleIdResponse]:
+        cursor: Optional[str] = None,
+    ) -> tuple[list[ChatTitleIdResponse], Optional[str]]:
+        """
+        Returns a page of the chats outside folders and pins, most recently
+        updated first, and the cursor of the next page.
+        """
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
@@ -502,42 +591,25 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+            return self._get_chat_title_id_page(
+                query,
+                [(Chat.updated_at, True), (Chat.id, True)],
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
             )
 
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
-
     def get_chat_list_by_chat_ids(
         self, chat_ids: list[str], skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            all_chats = (
+            query = (
                 db.query(Chat)
                 .filter(Chat.id.in_(chat_ids))
                 .filter_by(archived=False)
                 .order_by(Chat.updated_at.desc())
-                .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chat_title_id_list(query)
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
@@ -578,6 +650,27 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def iter_chats(
+        self, user_id: Optional[str] = None, archived: Optional[bool] = None
+    ) -> Iterator[ChatModel]:
+        """
+        Yield every chat, or those of `user_id`, newest first without loading
+        them all. Rows are fetched from a server-side cursor
+        CHAT_EXPORT_BATCH_SIZE at a time and the session stays open until the
+        generator is exhausted or closed. On SQLite that is a read
+        transaction, which only blocks writers without WAL.
+        """
+        with get_db() as db:
+            query = db.query(Chat)
+            if user_id is not None:
+                query = query.filter_by(user_id=user_id)
+            if archived is not None:
+                query = query.filter_by(archived=archived)
+
+            query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+            for chat in query.yield_per(CHAT_EXPORT_BATCH_SIZE):
+                yield ChatModel.model_validate(chat)
+
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -587,14 +680,14 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
+    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            all_chats = (
+            query = (
                 db.query(Chat)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chat_title_id_list(query)
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -612,16 +705,27 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> tuple[list[ChatTitleIdResponse], Optional[str]]:
         """
         Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Returns the page and the cursor of the next page, `cursor` takes precedence over `skip`.
         """
         search_text = search_text.replace("\u0000", "").lower().strip()
 
         if not search_text:
-            return self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit
-            )
+            with get_db() as db:
+                query = db.query(Chat).filter_by(user_id=user_id)
+                if not include_archived:
+                    query = query.filter_by(archived=False)
+
+                return self._get_chat_title_id_page(
+                    query,
+                    [(Chat.updated_at, True), (Chat.id, True)],
+                    skip=skip,
+                    limit=limit,
+                    cursor=cursor,
+                )
 
         search_text_words = search_text.split(" ")
 
@@ -674,6 +778,7 @@ class ChatTable:
         ]
 
         search_text = " ".join(search_text_words)
+        search_terms = self._get_search_terms(search_text)
 
         with get_db() as db:
             query = db.query(Chat).filter(Chat.user_id == user_id)
@@ -695,25 +800,35 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
+            rank = None
+            if (
+                search_terms
+                and min(map(len, search_terms)) >= CHAT_SEARCH_MIN_TERM_LENGTH
+                and self.has_search_index(db)
+            ):
+                query, rank = self._filter_by_search_index(
+                    db, query, user_id, search_terms
+                )
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                if rank is None:
+                    # SQLite case: using JSON1 extension for JSON searching
+                    sqlite_content_sql = (
+                        "EXISTS ("
+                        "    SELECT 1 "
+                        "    FROM json_each(Chat.chat, '$.messages') AS message "
+                        "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
+                        ")"
+                    )
+                    sqlite_content_clause = text(sqlite_content_sql)
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            sqlite_content_clause,
+                        ).params(title_key=f"%{search_text}%", content_key=search_text)
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -746,21 +861,22 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                postgres_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_array_elements(Chat.chat->'messages') AS message "
-                    "    WHERE LOWER(message->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                postgres_content_clause = text(postgres_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                if rank is None:
+                    # PostgreSQL relies on proper JSON query for search
+                    postgres_content_sql = (
+                        "EXISTS ("
+                        "    SELECT 1 "
+                        "    FROM json_array_elements(Chat.chat->'messages') AS message "
+                        "    WHERE LOWER(message->>'content') LIKE '%' || :content_key || '%'"
+                        ")"
+                    )
+                    postgres_content_clause = text(postgres_content_sql)
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            postgres_content_clause,
+                        ).params(title_key=f"%{search_text}%", content_key=search_text)
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -796,17 +912,155 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            # Perform pagination at the SQL level
-            all_chats = query.offset(skip).limit(limit).all()
+            order_by = [(Chat.updated_at, True), (Chat.id, True)]
+            if rank is not None:
+                order_by = [rank, *order_by]
+
+            # Perform pagination at the SQL level. Relevance depends on the
+            # whole index, so ranked results are paged by offset.
+            all_chats, next_cursor = self._get_chat_title_id_page(
+                query,
+                order_by,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                keyset=rank is None,
+            )
 
             log.info(f"The number of chats: {len(all_chats)}")
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            if rank is not None:
+                snippets = self._get_search_snippets(
+                    db, [chat.id for chat in all_chats], search_terms
+                )
+                for chat in all_chats:
+                    chat.snippet = snippets.get(chat.id)
+
+            return all_chats, next_cursor
+
+    def _get_search_terms(self, search_text: str) -> list[str]:
+        # Letters and digits only, so the terms are safe to put in an FTS5
+        # phrase or a LIKE pattern
+        return re.findall(r"[^\W_]+", search_text)
+
+    def _get_search_match(self, terms: list[str]) -> str:
+        # Every term has to appear in the title or messages
+        return " ".join(f'"{term}"' for term in terms)
+
+    def _filter_by_search_index(self, db, query, user_id: str, terms: list[str]):
+        """
+        Restrict `query` to chats whose title or messages contain every term,
+        returns the query and the expression to order by relevance with and
+        its direction.
+        """
+        query = query.join(ChatSearch, ChatSearch.c.chat_id == Chat.id).filter(
+            ChatSearch.c.user_id == user_id
+        )
+
+        if db.bind.dialect.name == "sqlite":
+            query = query.join(
+                ChatSearchFts, ChatSearchFts.c.rowid == ChatSearch.c.id
+            ).filter(
+                text("chat_search_fts MATCH :search_match").bindparams(
+                    search_match=self._get_search_match(terms)
+                )
+            )
+            # bm25 is lower for better matches, title matches weigh 10x
+            return query, (
+                func.bm25(literal_column("chat_search_fts"), 10.0, 1.0),
+                False,
+            )
+
+        patterns = [f"%{term}%" for term in terms]
+        query = query.filter(
+            and_(
+                *[
+                    or_(
+                        ChatSearch.c.title.ilike(pattern),
+                        ChatSearch.c.content.ilike(pattern),
+                    )
+                    for pattern in patterns
+                ]
+            )
+        )
+        # Chats with every term in the title first
+        return query, (
+            and_(*[ChatSearch.c.title.ilike(pattern) for pattern in patterns]),
+            True,
+        )
+
+    def _get_search_snippets(
+        self, db, chat_ids: list[str], terms: list[str]
+    ) -> dict[str, str]:
+        if not chat_ids:
+            return {}
+
+        if db.bind.dialect.name == "sqlite":
+            statement = text(
+                "SELECT chat_search.chat_id, "
+                "snippet(chat_search_fts, -1, :start, :end, '…', 64) "
+                "FROM chat_search_fts "
+                "JOIN chat_search ON chat_search.id = chat_search_fts.rowid "
+                "WHERE chat_search_fts MATCH :search_match "
+                "AND chat_search.chat_id IN :chat_ids"
+            )
+        else:
+            statement = text(
+                "SELECT chat_id, concat_ws(' ', title, content) "
+                "FROM chat_search WHERE chat_id IN :chat_ids"
+            )
+
+        try:
+            rows = db.execute(
+                statement.bindparams(bindparam("chat_ids", expanding=True)),
+                {
+                    "chat_ids": chat_ids,
+                    "search_match": self._get_search_match(terms),
+                    "start": CHAT_SEARCH_MATCH_START,
+                    "end": CHAT_SEARCH_MATCH_END,
+                },
+            ).all()
+        except Exception as e:
+            db.rollback()
+            log.warning(f"Failed to build chat search snippets: {e}")
+            return {}
+
+        if db.bind.dialect.name != "sqlite":
+            rows = [
+                (chat_id, self._mark_snippet(document, terms))
+                for chat_id, document in rows
+            ]
+
+        return {chat_id: self._format_snippet(snippet) for chat_id, snippet in rows}
+
+    def _mark_snippet(self, document: str, terms: list[str]) -> Optional[str]:
+        # Text around the first match with every match in it marked, the way
+        # SQLite's snippet() does
+        pattern = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+        match = pattern.search(document)
+        if match is None:
+            return None
+
+        start = max(match.start() - CHAT_SEARCH_SNIPPET_CONTEXT, 0)
+        end = min(match.end() + CHAT_SEARCH_SNIPPET_CONTEXT, len(document))
+        snippet = pattern.sub(
+            lambda m: f"{CHAT_SEARCH_MATCH_START}{m.group()}{CHAT_SEARCH_MATCH_END}",
+            document[start:end],
+        )
+        return f"{'…' if start else ''}{snippet}{'…' if end < len(document) else ''}"
+
+    def _format_snippet(self, snippet: Optional[str]) -> Optional[str]:
+        if snippet is None:
+            return None
+        return (
+            html.escape(snippet)
+            .replace(CHAT_SEARCH_MATCH_START, CHAT_SEARCH_SNIPPET_START)
+            .replace(CHAT_SEARCH_MATCH_END, CHAT_SEARCH_SNIPPET_END)
+        )
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
@@ -814,8 +1068,7 @@ class ChatTable:
 
             query = query.order_by(Chat.updated_at.desc())
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chat_title_id_list(query)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -855,7 +1108,7 @@ class ChatTable:
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
@@ -880,9 +1133,9 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            all_chats = query.all()
+            all_chats = self._get_chat_title_id_list(query)
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return all_chats
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
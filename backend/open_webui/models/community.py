@@ -3,10 +3,22 @@ import uuid
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, JSON, Text, UniqueConstraint, func
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    Integer,
+    JSON,
+    Text,
+    UniqueConstraint,
+    exists,
+    false,
+)
+from sqlalchemy.exc import IntegrityError
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.users import UserResponse, Users
+from open_webui.utils.pagination import OrderBy, paginate
 
 
 ####################
@@ -26,9 +38,23 @@ class CommunityPost(Base):
     attachments = Column(JSON, nullable=True)
     meta = Column(JSON, nullable=True)
 
+    # Maintained in the transactions that add or remove likes and comments
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(BigInteger, nullable=False)
     updated_at = Column(BigInteger, nullable=False)
 
+    __table_args__ = (
+        Index("ix_community_post_created_at_id", "created_at", "id"),
+        Index(
+            "ix_community_post_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
+
 
 class CommunityComment(Base):
     __tablename__ = "community_comment"
@@ -71,6 +97,15 @@ class CommunityFollow(Base):
     )
 
 
+class CommunityUserStats(Base):
+    __tablename__ = "community_user_stats"
+
+    # Maintained in the transactions that add or remove follows
+    user_id = Column(Text, primary_key=True)
+    follower_count = Column(Integer, nullable=False, default=0, server_default="0")
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
 ####################
 # Pydantic Models
 ####################
@@ -83,6 +118,8 @@ class CommunityPostModel(BaseModel):
     content: str
     attachments: Optional[Any] = None
     meta: Optional[Any] = None
+    like_count: int = 0
+    comment_count: int = 0
     created_at: int
     updated_at: int
 
@@ -101,8 +138,6 @@ class CommunityCommentModel(BaseModel):
 
 
 class CommunityPostWithUser(CommunityPostModel):
-    like_count: int = 0
-    comment_count: int = 0
     viewer_has_liked: bool = False
     author: Optional[UserResponse] = None
     viewer_is_following_author: bool = False
@@ -132,7 +167,8 @@ class CommunityCommentForm(BaseModel):
 
 class CommunityPostListResponse(BaseModel):
     posts: list[CommunityPostWithUser]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class CommunityPostDetailResponse(BaseModel):
@@ -161,6 +197,52 @@ def _current_time_ns() -> int:
     return int(time.time_ns())
 
 
+# Newest first, ties broken by id
+POST_ORDER_BY: OrderBy = [(CommunityPost.created_at, True), (CommunityPost.id, True)]
+
+
+def _get_user_map(user_ids: set[str]) -> dict[str, UserResponse]:
+    return {
+        user.id: UserResponse(**user.model_dump())
+        for user in Users.get_users_by_user_ids(list(user_ids))
+    }
+
+
+def _update_post_count(db, post_id: str, column, delta: int):
+    db.query(CommunityPost).filter_by(id=post_id).update(
+        {column: column + delta}, synchronize_session=False
+    )
+
+
+def _update_user_stats(
+    db, user_id: str, follower_delta: int = 0, following_delta: int = 0
+):
+    values = {
+        CommunityUserStats.follower_count: (
+            CommunityUserStats.follower_count + follower_delta
+        ),
+        CommunityUserStats.following_count: (
+            CommunityUserStats.following_count + following_delta
+        ),
+    }
+    query = db.query(CommunityUserStats).filter_by(user_id=user_id)
+    if query.update(values, synchronize_session=False):
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(
+                CommunityUserStats(
+                    user_id=user_id,
+                    follower_count=max(follower_delta, 0),
+                    following_count=max(following_delta, 0),
+                )
+            )
+    except IntegrityError:
+        # Created by a concurrent follow since the update
+        query.update(values, synchronize_session=False)
+
+
 class CommunityPostsTable:
     def create_post(self, form_data: CommunityPostForm, user_id: str) -> CommunityPostModel:
         with get_db() as db:
@@ -222,7 +304,9 @@ class CommunityPostsTable:
     def get_post_by_id(
         self, post_id: str, viewer_id: Optional[str] = None
     ) -> Optional[CommunityPostWithUser]:
-        posts, _ = self.get_posts(viewer_id=viewer_id, post_ids=[post_id])
+        posts, _, _ = self.get_posts(
+            viewer_id=viewer_id, post_ids=[post_id], include_total=False
+        )
         return posts[0] if posts else None
 
     def get_posts(
@@ -230,10 +314,18 @@ class CommunityPostsTable:
         *,
         viewer_id: Optional[str] = None,
         user_id: Optional[str] = None,
+        user_ids: Optional[list[str]] = None,
         post_ids: Optional[list[str]] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> tuple[list[CommunityPostWithUser], int]:
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[list[CommunityPostWithUser], Optional[int], Optional[str]]:
+        """
+        Returns a page of posts, newest first, the total number of matching
+        posts (`None` unless `include_total`) and the cursor of the next page.
+        `cursor` takes precedence over `skip`.
+        """
         with get_db() as db:
             query = db.query(CommunityPost)
 
@@ -243,79 +335,69 @@ class CommunityPostsTable:
             if user_id:
                 query = query.filter(CommunityPost.user_id == user_id)
 
-            total = query.count()
-
-            query = query.order_by(CommunityPost.created_at.desc())
+            if user_ids is not None:
+                query = query.filter(CommunityPost.user_id.in_(user_ids))
 
-            if skip is not None:
-                query = query.offset(skip)
-            if limit is not None:
-                query = query.limit(limit)
-
-            posts = query.all()
-            if not posts:
-                return [], total
+            total = query.count() if include_total else None
 
-            post_ids = [post.id for post in posts]
-            author_ids = {post.user_id for post in posts}
+            # Counters are columns of the post and the viewer state correlated
+            # subqueries, so a page is this query and the one for the authors
+            if viewer_id:
+                viewer_has_liked = exists().where(
+                    CommunityPostLike.post_id == CommunityPost.id,
+                    CommunityPostLike.user_id == viewer_id,
+                )
+                viewer_is_following_author = exists().where(
+                    CommunityFollow.follower_id == viewer_id,
+                    CommunityFollow.following_id == CommunityPost.user_id,
+                )
+            else:
+                viewer_has_liked = viewer_is_following_author = false()
 
-            like_counts = dict(
-                db.query(CommunityPostLike.post_id, func.count(CommunityPostLike.id))
-                .filter(CommunityPostLike.post_id.in_(post_ids))
-                .group_by(CommunityPostLike.post_id)
-                .all()
+            query = query.with_entities(
+                *CommunityPost.__table__.columns,
+                viewer_has_liked.label("viewer_has_liked"),
+                viewer_is_following_author.label("viewer_is_following_author"),
             )
 
-            comment_counts = dict(
-                db.query(CommunityComment.post_id, func.count(CommunityComment.id))
-                .filter(CommunityComment.post_id.in_(post_ids))
-                .group_by(CommunityComment.post_id)
-                .all()
+            posts, next_cursor = paginate(
+                query,
+                POST_ORDER_BY,
+                skip=skip or 0,
+                limit=limit,
+                cursor=cursor,
             )
+            if not posts:
+                return [], total, next_cursor
 
-            viewer_likes: set[str] = set()
-            viewer_following: set[str] = set()
+            user_map = _get_user_map({post.user_id for post in posts})
 
-            if viewer_id:
-                viewer_likes = {
-                    like.post_id
-                    for like in db.query(CommunityPostLike)
-                    .filter(
-                        CommunityPostLike.user_id == viewer_id,
-                        CommunityPostLike.post_id.in_(post_ids),
-                    )
-                    .all()
-                }
-
-                viewer_following = {
-                    row.following_id
-                    for row in db.query(CommunityFollow)
-                    .filter(
-                        CommunityFollow.follower_id == viewer_id,
-                        CommunityFollow.following_id.in_(author_ids),
-                    )
-                    .all()
-                }
-
-            user_map: dict[str, UserResponse] = {}
-            for author_id in author_ids:
-                user = Users.get_user_by_id(author_id)
-                if user:
-                    user_map[author_id] = UserResponse(**user.model_dump())
-
-            post_models: list[CommunityPostWithUser] = []
-            for post in posts:
-                post_model = CommunityPostWithUser(
-                    **CommunityPostModel.model_validate(post).model_dump(),
-                    like_count=like_counts.get(post.id, 0),
-                    comment_count=comment_counts.get(post.id, 0),
-                    viewer_has_liked=post.id in viewer_likes,
+            post_models = [
+                CommunityPostWithUser(
+                    **post._mapping,
                     author=user_map.get(post.user_id),
-                    viewer_is_following_author=post.user_id in viewer_following,
                 )
-                post_models.append(post_model)
+                for post in posts
+            ]
+
+            return post_models, total, next_cursor
+
+    def get_post_refs(
+        self, user_ids: list[str], limit: int, cursor: Optional[str] = None
+    ) -> list[tuple[str, int]]:
+        """
+        Returns `(id, created_at)` of the newest `limit` posts of `user_ids`
+        after `cursor`, without loading the posts.
+        """
+        if not user_ids:
+            return []
 
-            return post_models, total
+        with get_db() as db:
+            query = db.query(CommunityPost.id, CommunityPost.created_at).filter(
+                CommunityPost.user_id.in_(user_ids)
+            )
+            rows, _ = paginate(query, POST_ORDER_BY, limit=limit, cursor=cursor)
+            return [(row.id, row.created_at) for row in rows]
 
 
 class CommunityCommentsTable:
@@ -333,6 +415,7 @@ class CommunityCommentsTable:
             )
 
             db.add(CommunityComment(**comment.model_dump()))
+            _update_post_count(db, post_id, CommunityPost.comment_count, 1)
             db.commit()
             return comment
 
@@ -350,12 +433,7 @@ class CommunityCommentsTable:
             if not comments:
                 return []
 
-            user_ids = {comment.user_id for comment in comments}
-            user_map: dict[str, UserResponse] = {}
-            for user_id in user_ids:
-                user = Users.get_user_by_id(user_id)
-                if user:
-                    user_map[user_id] = UserResponse(**user.model_dump())
+            user_map = _get_user_map({comment.user_id for comment in comments})
 
             return [
                 CommunityCommentWithUser(
@@ -376,6 +454,7 @@ class CommunityCommentsTable:
                 return False
 
             db.delete(comment)
+            _update_post_count(db, comment.post_id, CommunityPost.comment_count, -1)
             db.commit()
             return True
 
@@ -399,6 +478,7 @@ class CommunityLikesTable:
             )
 
             db.add(like)
+            _update_post_count(db, post_id, CommunityPost.like_count, 1)
             db.commit()
             return True
 
@@ -409,6 +489,8 @@ class CommunityLikesTable:
                 .filter_by(post_id=post_id, user_id=user_id)
                 .delete()
             )
+            if deleted:
+                _update_post_count(db, post_id, CommunityPost.like_count, -1)
             db.commit()
             return bool(deleted)
 
@@ -424,8 +506,8 @@ class CommunityLikesTable:
     def get_like_count(self, post_id: str) -> int:
         with get_db() as db:
             return (
-                db.query(func.count(CommunityPostLike.id))
-                .filter(CommunityPostLike.post_id == post_id)
+                db.query(CommunityPost.like_count)
+                .filter(CommunityPost.id == post_id)
                 .scalar()
                 or 0
             )
@@ -453,6 +535,8 @@ class CommunityFollowersTable:
             )
 
             db.add(follow)
+            _update_user_stats(db, following_id, follower_delta=1)
+            _update_user_stats(db, follower_id, following_delta=1)
             db.commit()
             return True
 
@@ -463,6 +547,9 @@ class CommunityFollowersTable:
                 .filter_by(follower_id=follower_id, following_id=following_id)
                 .delete()
             )
+            if deleted:
+                _update_user_stats(db, following_id, follower_delta=-1)
+                _update_user_stats(db, follower_id, following_delta=-1)
             db.commit()
             return bool(deleted)
 
@@ -475,23 +562,41 @@ class CommunityFollowersTable:
                 is not None
             )
 
-    def get_counts(self, user_id: str) -> tuple[int, int]:
+    def get_following_ids(self, follower_id: str) -> list[str]:
         with get_db() as db:
-            followers = (
-                db.query(func.count(CommunityFollow.id))
-                .filter(CommunityFollow.following_id == user_id)
-                .scalar()
-                or 0
-            )
+            return [
+                row.following_id
+                for row in db.query(CommunityFollow.following_id)
+                .filter(CommunityFollow.follower_id == follower_id)
+                .all()
+            ]
 
-            following = (
-                db.query(func.count(CommunityFollow.id))
-                .filter(CommunityFollow.follower_id == user_id)
-                .scalar()
-                or 0
+    def get_follower_ids(self, following_id: str) -> list[str]:
+        with get_db() as db:
+            return [
+                row.follower_id
+                for row in db.query(CommunityFollow.follower_id)
+                .filter(CommunityFollow.following_id == following_id)
+                .all()
+            ]
+
+    def get_follower_counts(self, user_ids: list[str]) -> dict[str, int]:
+        if not user_ids:
+            return {}
+
+        with get_db() as db:
+            return dict(
+                db.query(CommunityUserStats.user_id, CommunityUserStats.follower_count)
+                .filter(CommunityUserStats.user_id.in_(user_ids))
+                .all()
             )
 
-            return followers, following
+    def get_counts(self, user_id: str) -> tuple[int, int]:
+        with get_db() as db:
+            stats = db.get(CommunityUserStats, user_id)
+            if not stats:
+                return 0, 0
+            return stats.follower_count, stats.following_count
 
 
 Posts = CommunityPostsTable()
@@ -210,6 +210,22 @@ class FilesTable:
 
                 return None
 
+    def delete_file_data_keys_by_id(
+        self, id: str, keys: list[str]
+    ) -> Optional[FileModel]:
+        with get_db() as db:
+            try:
+                file = db.query(File).filter_by(id=id).first()
+                file.data = {
+                    key: value
+                    for key, value in (file.data if file.data else {}).items()
+                    if key not in keys
+                }
+                db.commit()
+                return FileModel.model_validate(file)
+            except Exception:
+                return None
+
     def update_file_metadata_by_id(self, id: str, meta: dict) -> Optional[FileModel]:
         with get_db() as db:
             try:
@@ -5,10 +5,11 @@ from typing import Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
+from open_webui.utils.pagination import paginate
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -52,6 +53,17 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... AND parent_id IS NULL ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_message_channel_id_parent_id_created_at_id",
+            "channel_id",
+            "parent_id",
+            "created_at",
+            "id",
+        ),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -158,18 +170,27 @@ class MessageTable:
             ]
 
     def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
-    ) -> list[MessageModel]:
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[MessageModel], Optional[str]]:
+        """
+        Returns a page of top-level messages, newest first, and the cursor of
+        the next (older) page. `cursor` takes precedence over `skip`.
+        """
         with get_db() as db:
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            all_messages, next_cursor = paginate(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=None),
+                [(Message.created_at, True), (Message.id, True)],
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
             )
-            return [MessageModel.model_validate(message) for message in all_messages]
+            return [
+                MessageModel.model_validate(message) for message in all_messages
+            ], next_cursor
 
     def get_messages_by_parent_id(
         self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
@@ -0,0 +1,225 @@
+import logging
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    ENABLE_RAG_LOCAL_INFERENCE_BATCHING,
+    RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS,
+    RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+meter = metrics.get_meter(__name__)
+
+batch_size_histogram = meter.create_histogram(
+    name="rag.inference.batch_size",
+    description="Number of inputs run in one local model forward pass",
+    unit="1",
+)
+batch_requests_histogram = meter.create_histogram(
+    name="rag.inference.batch_requests",
+    description="Number of concurrent requests merged into one forward pass",
+    unit="1",
+)
+queue_depth_counter = meter.create_up_down_counter(
+    name="rag.inference.queue_depth",
+    description="Requests waiting for a local model forward pass",
+    unit="1",
+)
+
+
+class _BatchRequest:
+    __slots__ = ("items", "key", "future")
+
+    def __init__(self, items: list, key: Hashable):
+        self.items = items
+        self.key = key
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent calls to a local model into micro-batches.
+
+    Callers block on `submit`, a single worker thread collects whatever is
+    queued within `window_ms` (up to `max_batch_size` inputs), runs one
+    forward pass per key and scatters the results back. Requests with
+    different keys (e.g. different embedding prefixes) are never merged.
+    The worker exits when idle and is restarted on the next submit.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list, Hashable], Any],
+        name: str,
+        window_ms: float = RAG_LOCAL_INFERENCE_BATCH_WINDOW_MS,
+        max_batch_size: int = RAG_LOCAL_INFERENCE_MAX_BATCH_SIZE,
+        idle_timeout: float = 30.0,
+    ):
+        self.fn = fn
+        self.name = name
+        self.window = max(window_ms, 0) / 1000
+        self.max_batch_size = max(max_batch_size, 1)
+        self.idle_timeout = idle_timeout
+
+        self._queue: "queue.Queue[_BatchRequest]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "items": 0,
+            "max_batch_size": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, items: list, key: Hashable = None) -> list:
+        if not items:
+            return []
+
+        request = _BatchRequest(items, key)
+
+        # Large requests (e.g. document ingestion) already saturate a forward pass
+        if len(items) >= self.max_batch_size:
+            self._run([request], key)
+            return request.future.result()
+
+        with self._lock:
+            self._queue.put(request)
+            queue_depth_counter.add(1, {"model": self.name})
+            if self._worker is None:
+                self._start_worker()
+
+        return request.future.result()
+
+    def _start_worker(self):
+        # Called with the lock held
+        self._worker = threading.Thread(
+            target=self._loop, name=f"micro-batcher-{self.name}", daemon=True
+        )
+        self._worker.start()
+
+    def _next(self, timeout: float) -> Optional[_BatchRequest]:
+        try:
+            if timeout > 0:
+                request = self._queue.get(timeout=timeout)
+            else:
+                request = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        queue_depth_counter.add(-1, {"model": self.name})
+        return request
+
+    def _loop(self):
+        try:
+            while True:
+                request = self._next(self.idle_timeout)
+                if request is None:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._worker = None
+                            return
+                    continue
+
+                batch = [request]
+                size = len(request.items)
+                deadline = time.monotonic() + self.window
+                while size < self.max_batch_size:
+                    request = self._next(deadline - time.monotonic())
+                    if request is None:
+                        break
+                    batch.append(request)
+                    size += len(request.items)
+
+                groups: dict[Hashable, list[_BatchRequest]] = {}
+                for request in batch:
+                    groups.setdefault(request.key, []).append(request)
+
+                for key, requests in groups.items():
+                    self._run(requests, key)
+        finally:
+            with self._lock:
+                if self._worker is threading.current_thread():
+                    # Died instead of exiting idle, submit() only starts a
+                    # worker when there is none and queued requests need one
+                    self._worker = None
+                    if not self._queue.empty():
+                        self._start_worker()
+
+    def _run(self, requests: list[_BatchRequest], key: Hashable):
+        items = [item for request in requests for item in request.items]
+
+        with self._lock:
+            self.stats["requests"] += len(requests)
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(items))
+        batch_size_histogram.record(len(items), {"model": self.name})
+        batch_requests_histogram.record(len(requests), {"model": self.name})
+
+        try:
+            results = self.fn(items, key)
+        except BaseException as e:
+            log.exception(f"MicroBatcher({self.name}): batch failed: {e}")
+            for request in requests:
+                request.future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        offset = 0
+        for request in requests:
+            request.future.set_result(results[offset : offset + len(request.items)])
+            offset += len(request.items)
+
+
+# One batcher per loaded model; entries go away with the model itself
+_batchers: "weakref.WeakKeyDictionary[Any, MicroBatcher]" = weakref.WeakKeyDictionary()
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(
+    model: Any, fn: Callable[[Any, list, Hashable], Any], name: str
+) -> Optional[MicroBatcher]:
+    """
+    Return the shared batcher for `model`, or None if batching is disabled.
+    `fn(model, items, key)` runs one forward pass; the batcher only holds a
+    weak reference to the model so replacing it releases the old weights.
+    """
+    if not ENABLE_RAG_LOCAL_INFERENCE_BATCHING or model is None:
+        return None
+
+    with _batchers_lock:
+        batcher = _batchers.get(model)
+        if batcher is None:
+            model_ref = weakref.ref(model)
+
+            def run(items, key):
+                target = model_ref()
+                if target is None:
+                    raise RuntimeError(f"{name} model has been unloaded")
+                return fn(target, items, key)
+
+            batcher = MicroBatcher(run, name=name)
+            _batchers[model] = batcher
+        return batcher
+
+
+def get_batcher_stats() -> dict:
+    return {
+        batcher.name: {**batcher.stats, "queue_depth": batcher.queue_depth}
+        for batcher in list(_batchers.values())
+    }
@@ -3,24 +3,8 @@ import logging
 import ftfy
 import sys
 import json
+from typing import Iterator
 
-from azure.identity import DefaultAzureCredential
-from langchain_community.document_loaders import (
-    AzureAIDocumentIntelligenceLoader,
-    BSHTMLLoader,
-    CSVLoader,
-    Docx2txtLoader,
-    OutlookMessageLoader,
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredEPubLoader,
-    UnstructuredExcelLoader,
-    UnstructuredODTLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredRSTLoader,
-    UnstructuredXMLLoader,
-    YoutubeLoader,
-)
 from langchain_core.documents import Document
 
 from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
@@ -242,6 +226,25 @@ class Loader:
             for doc in docs
         ]
 
+    def lazy_load(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> Iterator[Document]:
+        """
+        Yield documents (usually pages) as the underlying loader parses them.
+        Loaders without `lazy_load` (e.g. remote extraction engines) return
+        everything at once and are yielded from their `load` result.
+        """
+        loader = self._get_loader(filename, file_content_type, file_path)
+        if hasattr(loader, "lazy_load"):
+            docs = loader.lazy_load()
+        else:
+            docs = iter(loader.load())
+
+        for doc in docs:
+            yield Document(
+                page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
+            )
+
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
             file_content_type
@@ -251,6 +254,24 @@ class Loader:
         )
 
     def _get_loader(self, filename: str, file_content_type: str, file_path: str):
+        # The document loaders and their dependencies are only imported once a
+        # file is processed, to keep them out of the startup time
+        from langchain_community.document_loaders import (
+            AzureAIDocumentIntelligenceLoader,
+            BSHTMLLoader,
+            CSVLoader,
+            Docx2txtLoader,
+            OutlookMessageLoader,
+            PyPDFLoader,
+            TextLoader,
+            UnstructuredEPubLoader,
+            UnstructuredExcelLoader,
+            UnstructuredODTLoader,
+            UnstructuredPowerPointLoader,
+            UnstructuredRSTLoader,
+            UnstructuredXMLLoader,
+        )
+
         file_ext = filename.split(".")[-1].lower()
 
         if (
@@ -364,6 +385,8 @@ class Loader:
                     api_key=self.kwargs.get("DOCUMENT_INTELLIGENCE_KEY"),
                 )
             else:
+                from azure.identity import DefaultAzureCredential
+
                 loader = AzureAIDocumentIntelligenceLoader(
                     file_path=file_path,
                     api_endpoint=self.kwargs.get("DOCUMENT_INTELLIGENCE_ENDPOINT"),
@@ -3,6 +3,10 @@ from typing import Optional, List, Tuple
 
 
 class BaseReranker(ABC):
+    # Whether a (query, document) score is independent of the other documents
+    # scored in the same call, i.e. whether pairs may be cached or batched
+    independent_scores: bool = True
+
     @abstractmethod
     def predict(self, sentences: List[Tuple[str, str]]) -> Optional[List[float]]:
         pass
@@ -1,11 +1,11 @@
 import os
+import hashlib
 import logging
 import torch
 import numpy as np
-from colbert.infra import ColBERTConfig
-from colbert.modeling.checkpoint import Checkpoint
 
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.misc import LRUCache
 
 from open_webui.retrieval.models.base_reranker import BaseReranker
 
@@ -14,7 +14,13 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ColBERT(BaseReranker):
+    # Scores are softmax-normalized across the documents of a query
+    independent_scores = False
+
     def __init__(self, name, **kwargs) -> None:
+        from colbert.infra import ColBERTConfig
+        from colbert.modeling.checkpoint import Checkpoint
+
         log.info("ColBERT: Loading model", name)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -35,9 +41,13 @@ class ColBERT(BaseReranker):
             name,
             colbert_config=ColBERTConfig(model_name=name),
         ).to(self.device)
-        pass
 
-    def calculate_similarity_scores(self, query_embeddings, document_embeddings):
+        # Token embeddings of recently scored documents, keyed by content hash
+        self.cache = LRUCache(maxsize=kwargs.get("cache_size") or 0)
+
+    def calculate_similarity_scores(
+        self, query_embeddings, document_embeddings, document_mask=None
+    ):
 
         query_embeddings = query_embeddings.to(self.device)
         document_embeddings = document_embeddings.to(self.device)
@@ -56,34 +66,101 @@ class ColBERT(BaseReranker):
                 "There should be either one query or queries equal to the number of documents."
             )
 
-        # Transpose the query embeddings to align for matrix multiplication
-        transposed_query_embeddings = query_embeddings.permute(0, 2, 1)
-        # Compute similarity scores using batch matrix multiplication
-        computed_scores = torch.matmul(document_embeddings, transposed_query_embeddings)
-        # Apply max pooling to extract the highest semantic similarity across each document's sequence
-        maximum_scores = torch.max(computed_scores, dim=1).values
-
-        # Sum up the maximum scores across features to get the overall document relevance scores
-        final_scores = maximum_scores.sum(dim=1)
+        final_scores = maxsim(
+            query_embeddings,
+            document_embeddings,
+            document_mask.to(self.device) if document_mask is not None else None,
+        )
 
         normalized_scores = torch.softmax(final_scores, dim=0)
 
         return normalized_scores.detach().cpu().numpy().astype(np.float32)
 
+    def encode_documents(self, docs: list[str]) -> list[torch.Tensor]:
+        """
+        Return the unpadded token embeddings of each document, encoding only
+        the documents missing from the token embedding cache.
+        """
+        keys = [hashlib.sha256(doc.encode()).hexdigest() for doc in docs]
+        embeddings = [self.cache.get(key) for key in keys]
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self.ckpt.docFromText(
+                [docs[idx] for idx in missing], bsize=32, keep_dims=False
+            )[0]
+            for idx, embedding in zip(missing, encoded):
+                embeddings[idx] = embedding
+                self.cache.set(keys[idx], embedding)
+
+        return embeddings
+
     def predict(self, sentences):
 
         query = sentences[0][0]
         docs = [i[1] for i in sentences]
 
-        # Embedding the documents
-        embedded_docs = self.ckpt.docFromText(docs, bsize=32)[0]
-        # Embedding the queries
+        # Embedding the documents, packed into one (tokens, dim) matrix
+        embedded_docs = self.encode_documents(docs)
+        document_lengths = torch.tensor(
+            [embedding.size(0) for embedding in embedded_docs], device=self.device
+        )
+        packed_docs = torch.cat(embedded_docs).to(self.device)
+        # Embedding the query once, it is scored against every document token
         embedded_queries = self.ckpt.queryFromText([query], bsize=32)
-        embedded_query = embedded_queries[0]
+        embedded_query = embedded_queries[0].to(self.device)
 
         # Calculate retrieval scores for the query against all documents
-        scores = self.calculate_similarity_scores(
-            embedded_query.unsqueeze(0), embedded_docs
+        scores = torch.softmax(
+            packed_maxsim(embedded_query, packed_docs, document_lengths), dim=0
         )
 
-        return scores
+        return scores.detach().cpu().numpy().astype(np.float32)
+
+
+def maxsim(query_embeddings, document_embeddings, document_mask=None):
+    """
+    Late-interaction score of padded documents of shape (documents, tokens,
+    dim): for each query token take the best matching document token, then
+    sum over query tokens. Padded document tokens are masked out of the max.
+    """
+    # (documents, query_tokens, document_tokens), a single query is broadcast
+    computed_scores = torch.matmul(
+        query_embeddings.to(document_embeddings.dtype),
+        document_embeddings.transpose(1, 2),
+    )
+    if document_mask is not None:
+        computed_scores.masked_fill_(~document_mask.unsqueeze(1), float("-inf"))
+
+    return computed_scores.max(dim=2).values.sum(dim=1).float()
+
+
+def packed_maxsim(query_embedding, document_embeddings, document_lengths):
+    """
+    Late-interaction score of documents packed back to back into a single
+    (total_tokens, dim) matrix, with `document_lengths` tokens each. This is
+    one matrix multiplication plus a segmented max, without padding.
+    """
+    # (query_tokens, total_tokens)
+    computed_scores = torch.matmul(
+        query_embedding.to(document_embeddings.dtype), document_embeddings.T
+    )
+    document_index = torch.repeat_interleave(
+        torch.arange(document_lengths.size(0), device=document_lengths.device),
+        document_lengths,
+    )
+
+    maximum_scores = torch.full(
+        (computed_scores.size(0), document_lengths.size(0)),
+        float("-inf"),
+        dtype=computed_scores.dtype,
+        device=computed_scores.device,
+    )
+    maximum_scores.scatter_reduce_(
+        1,
+        document_index.unsqueeze(0).expand_as(computed_scores),
+        computed_scores,
+        reduce="amax",
+    )
+
+    return maximum_scores.sum(dim=0).float()
@@ -8,7 +8,6 @@ from concurrent.futures import ThreadPoolExecutor
 import time
 
 from urllib.parse import quote
-from huggingface_hub import snapshot_download
 from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
 from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
@@ -24,8 +23,11 @@ from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.batching import get_batcher
+from open_webui.retrieval.web.cache import WEB_SEARCH_COLLECTIONS
 from open_webui.utils.access_control import has_access
-from open_webui.utils.misc import get_message_list
+from open_webui.utils.misc import get_message_list, LRUCache
+from open_webui.utils.telemetry.pipeline import record_stage, timed_stage
 
 
 from open_webui.env import (
@@ -37,6 +39,8 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_RERANKING_CACHE_SIZE,
+    RAG_RERANKING_MAX_CANDIDATES,
 )
 
 log = logging.getLogger(__name__)
@@ -60,11 +64,13 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=self.collection_name,
-            vectors=[self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)],
-            limit=self.top_k,
-        )
+        vector = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        with record_stage("vector_search", backend=VECTOR_DB):
+            result = VECTOR_DB_CLIENT.search(
+                collection_name=self.collection_name,
+                vectors=[vector],
+                limit=self.top_k,
+            )
 
         ids = result.ids[0]
         metadatas = result.metadatas[0]
@@ -74,6 +80,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=ids[idx],
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -81,16 +88,29 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class TimedBM25Retriever(BM25Retriever):
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        with record_stage("bm25"):
+            return super()._get_relevant_documents(query, run_manager=run_manager)
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
     try:
         log.debug(f"query_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=collection_name,
-            vectors=[query_embedding],
-            limit=k,
-        )
+        WEB_SEARCH_COLLECTIONS.mark_used(collection_name)
+        with record_stage("vector_search", backend=VECTOR_DB):
+            result = VECTOR_DB_CLIENT.search(
+                collection_name=collection_name,
+                vectors=[query_embedding],
+                limit=k,
+            )
 
         if result:
             log.info(f"query_doc:result {result.ids} {result.metadatas}")
@@ -104,6 +124,7 @@ def query_doc(
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
+        WEB_SEARCH_COLLECTIONS.mark_used(collection_name)
         result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
 
         if result:
@@ -133,10 +154,12 @@ def query_doc_with_hybrid_search(
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
-        )
+        with record_stage("bm25_index"):
+            bm25_retriever = TimedBM25Retriever.from_texts(
+                texts=collection_result.documents[0],
+                metadatas=collection_result.metadatas[0],
+                ids=collection_result.ids[0],
+            )
         bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
@@ -164,6 +187,7 @@ def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            collection_name=collection_name,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -350,9 +374,11 @@ def query_collection_with_hybrid_search(
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
-            )
+            WEB_SEARCH_COLLECTIONS.mark_used(collection_name)
+            with record_stage("collection_fetch", backend=VECTOR_DB):
+                collection_results[collection_name] = VECTOR_DB_CLIENT.get(
+                    collection_name=collection_name
+                )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
             collection_results[collection_name] = None
@@ -416,9 +442,18 @@ def get_embedding_function(
     azure_api_version=None,
 ):
     if embedding_engine == "":
-        return lambda query, prefix=None, user=None: embedding_function.encode(
-            query, **({"prompt": prefix} if prefix else {})
-        ).tolist()
+        batcher = get_batcher(embedding_function, _encode_batch, "embedding")
+
+        def encode(query, prefix=None, user=None):
+            if batcher is None:
+                return embedding_function.encode(
+                    query, **({"prompt": prefix} if prefix else {})
+                ).tolist()
+            if isinstance(query, list):
+                return batcher.submit(query, prefix).tolist() if query else []
+            return batcher.submit([query], prefix)[0].tolist()
+
+        return timed_stage(encode, "embedding", model=embedding_model, backend="local")
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         func = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -447,22 +482,102 @@ def get_embedding_function(
             else:
                 return func(query, prefix, user)
 
-        return lambda query, prefix=None, user=None: generate_multiple(
-            query, prefix, user, func
+        return timed_stage(
+            lambda query, prefix=None, user=None: generate_multiple(
+                query, prefix, user, func
+            ),
+            "embedding",
+            model=embedding_model,
+            backend=embedding_engine,
         )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
 
+def _encode_batch(model, texts: list[str], prefix: Optional[str]):
+    return model.encode(texts, **({"prompt": prefix} if prefix else {}))
+
+
+def _predict_batch(model, sentences: list[tuple[str, str]], key=None):
+    return model.predict(sentences)
+
+
+RERANKING_SCORE_CACHE = LRUCache(maxsize=RAG_RERANKING_CACHE_SIZE)
+
+
+def get_cached_reranking_function(cache_key: str, reranking_function):
+    """
+    Wrap `reranking_function` so that only (query, document) pairs missing
+    from RERANKING_SCORE_CACHE are sent to the model.
+    """
+
+    def sha256(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    def rerank(sentences, user=None):
+        query_hashes = {query: sha256(query) for query in {q for q, _ in sentences}}
+        keys = [
+            (cache_key, query_hashes[query], sha256(document))
+            for query, document in sentences
+        ]
+
+        scores = [RERANKING_SCORE_CACHE.get(key) for key in keys]
+        missing = [idx for idx, score in enumerate(scores) if score is None]
+        if missing:
+            new_scores = reranking_function(
+                [sentences[idx] for idx in missing], user=user
+            )
+            if new_scores is None:
+                return None
+
+            new_scores = (
+                new_scores.tolist() if not isinstance(new_scores, list) else new_scores
+            )
+            for idx, score in zip(missing, new_scores):
+                scores[idx] = float(score)
+                RERANKING_SCORE_CACHE.set(keys[idx], scores[idx])
+
+        log.debug(
+            f"get_cached_reranking_function: {len(sentences) - len(missing)}/{len(sentences)} cached scores"
+        )
+        return scores
+
+    return rerank
+
+
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
+
+    # Scores from the previous model or endpoint are no longer valid
+    RERANKING_SCORE_CACHE.clear()
+
+    # ColBERT normalizes scores across the documents of a single query, so its
+    # pairs can neither be merged with other requests nor cached individually
+    independent_scores = getattr(reranking_function, "independent_scores", True)
+
     if reranking_engine == "external":
-        return lambda sentences, user=None: reranking_function.predict(
+        func = lambda sentences, user=None: reranking_function.predict(
             sentences, user=user
         )
     else:
-        return lambda sentences, user=None: reranking_function.predict(sentences)
+        batcher = (
+            get_batcher(reranking_function, _predict_batch, "reranking")
+            if independent_scores
+            else None
+        )
+        if batcher is not None:
+            func = lambda sentences, user=None: batcher.submit(sentences)
+        else:
+            func = lambda sentences, user=None: reranking_function.predict(sentences)
+
+    if independent_scores and RAG_RERANKING_CACHE_SIZE > 0:
+        func = get_cached_reranking_function(
+            f"{reranking_engine}:{reranking_model}", func
+        )
+    return timed_stage(
+        func, "rerank", model=reranking_model, backend=reranking_engine or "local"
+    )
 
 
 def get_sources_from_items(
@@ -767,6 +882,8 @@ def get_model_path(model: str, update_model: bool = False):
 
     # Attempt to query the huggingface_hub library to determine the local path and/or to update
     try:
+        from huggingface_hub import snapshot_download
+
         model_repo_path = snapshot_download(**snapshot_kwargs)
         log.debug(f"model_repo_path: {model_repo_path}")
         return model_repo_path
@@ -980,6 +1097,8 @@ class RerankCompressor(BaseDocumentCompressor):
     top_n: int
     reranking_function: Any
     r_score: float
+    collection_name: Optional[str] = None
+    max_candidates: int = RAG_RERANKING_MAX_CANDIDATES
 
     class Config:
         extra = "forbid"
@@ -993,6 +1112,10 @@ class RerankCompressor(BaseDocumentCompressor):
     ) -> Sequence[Document]:
         reranking = self.reranking_function is not None
 
+        # Candidates arrive ordered by fused rank, keep only the best ones
+        if self.max_candidates and len(documents) > self.max_candidates:
+            documents = documents[: self.max_candidates]
+
         scores = None
         if reranking:
             scores = self.reranking_function(
@@ -1002,8 +1125,8 @@ class RerankCompressor(BaseDocumentCompressor):
             from sentence_transformers import util
 
             query_embedding = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-            document_embedding = self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            document_embedding = self.get_document_embeddings(
+                documents, len(query_embedding)
             )
             scores = util.cos_sim(query_embedding, document_embedding)[0]
 
@@ -1025,6 +1148,7 @@ class RerankCompressor(BaseDocumentCompressor):
                 metadata = doc.metadata
                 metadata["score"] = doc_score
                 doc = Document(
+                    id=doc.id,
                     page_content=doc.page_content,
                     metadata=metadata,
                 )
@@ -1035,3 +1159,35 @@ class RerankCompressor(BaseDocumentCompressor):
                 "No valid scores found, check your reranking function. Returning original documents."
             )
             return documents
+
+    def get_document_embeddings(
+        self, documents: Sequence[Document], dimension: int
+    ) -> list[list[float]]:
+        """
+        Use the vectors already stored in the vector DB where possible and
+        only embed the documents the backend could not return vectors for.
+        """
+        embeddings = [None] * len(documents)
+
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            vectors = VECTOR_DB_CLIENT.get_vectors(self.collection_name, ids) or {}
+            for idx, doc in enumerate(documents):
+                vector = vectors.get(doc.id) if doc.id else None
+                # pgvector pads vectors with zeros, which doesn't change cosine scores
+                if vector is not None and len(vector) >= dimension:
+                    embeddings[idx] = vector[:dimension]
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            log.debug(
+                f"RerankCompressor: embedding {len(missing)}/{len(documents)} documents without stored vectors"
+            )
+            computed = self.embedding_function(
+                [documents[idx].page_content for idx in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for idx, embedding in zip(missing, computed):
+                embeddings[idx] = embedding
+
+        return embeddings
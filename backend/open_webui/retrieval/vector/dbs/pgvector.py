@@ -1,4 +1,6 @@
 from typing import Optional, List, Dict, Any
+import csv
+import io
 import logging
 import json
 from sqlalchemy import (
@@ -21,7 +23,7 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -44,6 +46,8 @@ from open_webui.config import (
     PGVECTOR_POOL_MAX_OVERFLOW,
     PGVECTOR_POOL_TIMEOUT,
     PGVECTOR_POOL_RECYCLE,
+    PGVECTOR_INSERT_METHOD,
+    PGVECTOR_INSERT_BATCH_SIZE,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -223,9 +227,155 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+    def _copy_items(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> bool:
+        """
+        Stream the items with COPY FROM STDIN into a transaction-scoped staging
+        table, then move them into document_chunk with one INSERT ... SELECT,
+        encrypting there when pgcrypto is enabled. Returns False if the DBAPI
+        driver doesn't support COPY.
+
+        Duplicate ids behave like the row by row writes: an upsert keeps the
+        last item with an id, an insert raises, except with pgcrypto where
+        it has always skipped existing ids.
+        """
+        cursor = self.session.connection().connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            cursor.close()
+            return False
+
         try:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS document_chunk_staging ("
+                "position INTEGER, "
+                f"id TEXT, vector vector({VECTOR_LENGTH}), collection_name TEXT, "
+                "text TEXT, vmetadata TEXT) ON COMMIT DROP"
+            )
+
+            for i in range(0, len(items), PGVECTOR_INSERT_BATCH_SIZE):
+                buffer = io.StringIO()
+                # Unquoted empty fields are NULL in CSV, quoted they stay ''
+                writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+                for position, item in enumerate(
+                    items[i : i + PGVECTOR_INSERT_BATCH_SIZE], start=i
+                ):
+                    vector = self.adjust_vector_length(item["vector"])
+                    writer.writerow(
+                        [
+                            position,
+                            item["id"],
+                            "[" + ",".join(str(float(v)) for v in vector) + "]",
+                            collection_name,
+                            item["text"],
+                            json.dumps(
+                                item["metadata"]
+                                if PGVECTOR_PGCRYPTO
+                                else stringify_metadata(item["metadata"])
+                            ),
+                        ]
+                    )
+                buffer.seek(0)
+                cursor.copy_expert(
+                    "COPY document_chunk_staging "
+                    "(position, id, vector, collection_name, text, vmetadata) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+        finally:
+            cursor.close()
+
+        if PGVECTOR_PGCRYPTO:
+            columns = "pgp_sym_encrypt(text, :key), pgp_sym_encrypt(vmetadata, :key)"
+        else:
+            columns = "text, vmetadata::jsonb"
+
+        if upsert:
+            # A row can only be updated once per statement, the last item wins
+            select = (
+                f"SELECT DISTINCT ON (id) id, vector, collection_name, {columns} "
+                "FROM document_chunk_staging ORDER BY id, position DESC "
+                "ON CONFLICT (id) DO UPDATE SET vector = EXCLUDED.vector, "
+                "collection_name = EXCLUDED.collection_name, "
+                "text = EXCLUDED.text, vmetadata = EXCLUDED.vmetadata"
+            )
+        else:
+            select = (
+                f"SELECT id, vector, collection_name, {columns} "
+                "FROM document_chunk_staging"
+            )
             if PGVECTOR_PGCRYPTO:
+                select += " ON CONFLICT (id) DO NOTHING"
+
+        self.session.execute(
+            text(
+                "INSERT INTO document_chunk (id, vector, collection_name, text, vmetadata) "
+                + select
+            ),
+            {"key": PGVECTOR_PGCRYPTO_KEY} if PGVECTOR_PGCRYPTO else {},
+        )
+        self.session.execute(text("TRUNCATE document_chunk_staging"))
+        return True
+
+    def _insert_values(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> None:
+        # Batched multi-row INSERT ... VALUES, one statement per batch
+        for i in range(0, len(items), PGVECTOR_INSERT_BATCH_SIZE):
+            rows = []
+            for item in items[i : i + PGVECTOR_INSERT_BATCH_SIZE]:
+                row = {
+                    "id": item["id"],
+                    "vector": self.adjust_vector_length(item["vector"]),
+                    "collection_name": collection_name,
+                }
+                if PGVECTOR_PGCRYPTO:
+                    row["text"] = pgcrypto_encrypt(item["text"], PGVECTOR_PGCRYPTO_KEY)
+                    row["vmetadata"] = pgcrypto_encrypt(
+                        json.dumps(item["metadata"]), PGVECTOR_PGCRYPTO_KEY
+                    )
+                else:
+                    row["text"] = item["text"]
+                    row["vmetadata"] = stringify_metadata(item["metadata"])
+                rows.append(row)
+
+            if upsert:
+                # A row can only be updated once per statement, the last item wins
+                rows = list({row["id"]: row for row in rows}.values())
+
+            stmt = pg_insert(DocumentChunk.__table__).values(rows)
+            if upsert:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        "vector": stmt.excluded.vector,
+                        "collection_name": stmt.excluded.collection_name,
+                        "text": stmt.excluded.text,
+                        "vmetadata": stmt.excluded.vmetadata,
+                    },
+                )
+            elif PGVECTOR_PGCRYPTO:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
+            self.session.execute(stmt)
+
+    def _bulk_write(
+        self, collection_name: str, items: List[VectorItem], upsert: bool
+    ) -> None:
+        if PGVECTOR_INSERT_METHOD == "copy" and self._copy_items(
+            collection_name, items, upsert
+        ):
+            return
+        self._insert_values(collection_name, items, upsert)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        try:
+            if PGVECTOR_INSERT_METHOD != "orm":
+                self._bulk_write(collection_name, items, upsert=False)
+                self.session.commit()
+                log.info(
+                    f"Inserted {len(items)} items into collection '{collection_name}'."
+                )
+            elif PGVECTOR_PGCRYPTO:
                 for item in items:
                     vector = self.adjust_vector_length(item["vector"])
                     # Use raw SQL for BYTEA/pgcrypto
@@ -280,7 +430,13 @@ class PgvectorClient(VectorDBBase):
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
-            if PGVECTOR_PGCRYPTO:
+            if PGVECTOR_INSERT_METHOD != "orm":
+                self._bulk_write(collection_name, items, upsert=True)
+                self.session.commit()
+                log.info(
+                    f"Upserted {len(items)} items into collection '{collection_name}'."
+                )
+            elif PGVECTOR_PGCRYPTO:
                 for item in items:
                     vector = self.adjust_vector_length(item["vector"])
                     json_metadata = json.dumps(item["metadata"])
@@ -560,6 +716,26 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            stmt = select(DocumentChunk.id, DocumentChunk.vector).where(
+                DocumentChunk.collection_name == collection_name,
+                DocumentChunk.id.in_(ids),
+            )
+            results = self.session.execute(stmt).all()
+            self.session.rollback()  # read-only transaction
+            return {
+                row.id: [float(value) for value in row.vector]
+                for row in results
+                if row.vector is not None
+            }
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
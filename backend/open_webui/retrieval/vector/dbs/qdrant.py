@@ -201,6 +201,26 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        # Get the stored vectors for the given point ids.
+        try:
+            points = self.client.retrieve(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                ids=ids,
+                with_payload=False,
+                with_vectors=True,
+            )
+            return {
+                str(point.id): point.vector
+                for point in points
+                if isinstance(point.vector, list)
+            }
+        except Exception as e:
+            log.debug(f"Error getting vectors from {collection_name}: {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -1,3 +1,5 @@
+import threading
+
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import VECTOR_DB, ENABLE_QDRANT_MULTITENANCY_MODE
@@ -60,4 +62,26 @@ class Vector:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+class LazyVectorDBClient:
+    """
+    Creates the vector db client on first use, so importing the routers
+    doesn't import the client library or connect to the database.
+    """
+
+    def __init__(self, vector_type: str):
+        self._vector_type = vector_type
+        self._client = None
+        self._lock = threading.Lock()
+
+    def load(self) -> VectorDBBase:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = Vector.get_vector(self._vector_type)
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+
+VECTOR_DB_CLIENT = LazyVectorDBClient(VECTOR_DB)
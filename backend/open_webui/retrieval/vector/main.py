@@ -70,6 +70,16 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """
+        Retrieve the stored vectors for the given ids, keyed by id.
+        Backends that can't return stored vectors return None and callers
+        fall back to re-embedding the documents.
+        """
+        return None
+
     @abstractmethod
     def delete(
         self,
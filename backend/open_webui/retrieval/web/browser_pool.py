@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from open_webui.config import (
+    PLAYWRIGHT_BLOCKED_RESOURCE_TYPES,
+    PLAYWRIGHT_MAX_PAGES_PER_CONTEXT,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class _PooledContext:
+    __slots__ = ("context", "browser", "pages")
+
+    def __init__(self, context, browser):
+        self.context = context
+        self.browser = browser
+        self.pages = 0
+
+
+class PlaywrightBrowserPool:
+    """
+    Long-lived Playwright browser shared by all web loaders.
+
+    The browser is launched (or connected to over `PLAYWRIGHT_WS_URL`) on
+    first use and kept until the app shuts down or its settings change.
+    Pages are opened in pooled browser contexts that abort requests for
+    blocked resource types; a context is closed after serving
+    `max_pages_per_context` pages so cookies and caches don't pile up.
+    A browser replaced after a settings change is closed once the pages
+    still open in it are done.
+    """
+
+    def __init__(
+        self,
+        max_pages_per_context: int = PLAYWRIGHT_MAX_PAGES_PER_CONTEXT,
+        blocked_resource_types: Optional[List[str]] = None,
+    ):
+        self.max_pages_per_context = max(max_pages_per_context, 1)
+        self.blocked_resource_types = set(
+            PLAYWRIGHT_BLOCKED_RESOURCE_TYPES
+            if blocked_resource_types is None
+            else blocked_resource_types
+        )
+
+        self._playwright = None
+        self._browser = None
+        self._browser_key = None
+        self._loop = None
+        self._lock = asyncio.Lock()
+        self._idle_contexts: List[_PooledContext] = []
+        # Open pages per browser, and replaced browsers waiting for theirs
+        self._open_pages: Dict[Any, int] = {}
+        self._retired_browsers: List[Any] = []
+
+    async def _block_resources(self, route):
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _get_browser(
+        self, ws_url: Optional[str], headless: bool, proxy: Optional[Dict[str, str]]
+    ):
+        key = (ws_url, headless, json.dumps(proxy, sort_keys=True))
+        if (
+            self._browser is not None
+            and self._browser_key == key
+            and self._browser.is_connected()
+        ):
+            return self._browser
+
+        await self._retire_browser()
+
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+
+        if ws_url:
+            self._browser = await self._playwright.chromium.connect(ws_url)
+        else:
+            self._browser = await self._playwright.chromium.launch(
+                headless=headless, proxy=proxy
+            )
+        self._browser_key = key
+        log.info("Started shared Playwright browser")
+        return self._browser
+
+    async def _acquire_context(
+        self, ws_url: Optional[str], headless: bool, proxy: Optional[Dict[str, str]]
+    ) -> _PooledContext:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Playwright objects are bound to the loop that created them
+            if self._loop is not None:
+                log.warning("Event loop changed, discarding the Playwright browser")
+            self._playwright = self._browser = self._browser_key = None
+            self._idle_contexts = []
+            self._open_pages = {}
+            self._retired_browsers = []
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            browser = await self._get_browser(ws_url, headless, proxy)
+            while self._idle_contexts:
+                pooled = self._idle_contexts.pop()
+                if pooled.browser is browser:
+                    break
+            else:
+                context = await browser.new_context()
+                if self.blocked_resource_types:
+                    await context.route("**/*", self._block_resources)
+                pooled = _PooledContext(context, browser)
+
+            pooled.pages += 1
+            self._open_pages[browser] = self._open_pages.get(browser, 0) + 1
+        return pooled
+
+    async def _release_context(self, pooled: _PooledContext):
+        browser = pooled.browser
+        open_pages = self._open_pages.get(browser, 0) - 1
+        if open_pages > 0:
+            self._open_pages[browser] = open_pages
+        else:
+            self._open_pages.pop(browser, None)
+
+        if (
+            pooled.pages >= self.max_pages_per_context
+            or browser is not self._browser
+            or not browser.is_connected()
+        ):
+            with suppress(Exception):
+                await pooled.context.close()
+        else:
+            self._idle_contexts.append(pooled)
+
+        if browser in self._retired_browsers and browser not in self._open_pages:
+            self._retired_browsers.remove(browser)
+            with suppress(Exception):
+                await browser.close()
+
+    @asynccontextmanager
+    async def page(
+        self,
+        ws_url: Optional[str] = None,
+        headless: bool = True,
+        proxy: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator:
+        """Open a page in a pooled context, it is closed again on exit."""
+        pooled = await self._acquire_context(ws_url, headless, proxy)
+        page = None
+        try:
+            page = await pooled.context.new_page()
+            yield page
+        finally:
+            if page is not None:
+                with suppress(Exception):
+                    await page.close()
+            await self._release_context(pooled)
+
+    async def _close_idle_contexts(self):
+        for pooled in self._idle_contexts:
+            with suppress(Exception):
+                await pooled.context.close()
+        self._idle_contexts = []
+
+    async def _retire_browser(self):
+        # Searches may still be loading pages in the current browser
+        browser = self._browser
+        await self._close_idle_contexts()
+        self._browser = None
+        self._browser_key = None
+
+        if browser is None:
+            return
+        if browser in self._open_pages:
+            self._retired_browsers.append(browser)
+        else:
+            with suppress(Exception):
+                await browser.close()
+
+    async def _close_browser(self):
+        await self._close_idle_contexts()
+
+        for browser in [self._browser, *self._retired_browsers]:
+            if browser is not None:
+                with suppress(Exception):
+                    await browser.close()
+        self._browser = None
+        self._browser_key = None
+        self._retired_browsers = []
+
+    async def close(self):
+        if self._loop is not asyncio.get_running_loop():
+            return
+        async with self._lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                with suppress(Exception):
+                    await self._playwright.stop()
+                self._playwright = None
+
+
+PLAYWRIGHT_BROWSER_POOL = PlaywrightBrowserPool()
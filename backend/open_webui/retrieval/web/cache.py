@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from langchain_core.documents import Document
+
+from open_webui.config import (
+    WEB_SEARCH_CACHE_MAX_CHUNKS,
+    WEB_SEARCH_CACHE_MAX_PAGES,
+    WEB_SEARCH_CACHE_TTL,
+    WEB_SEARCH_COLLECTION_TTL,
+)
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+    UVICORN_WORKERS,
+)
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.utils.misc import LRUCache
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Normalized URL -> list of Documents returned by the web loader for that URL
+WEB_PAGE_CACHE = LRUCache(
+    maxsize=WEB_SEARCH_CACHE_MAX_PAGES if WEB_SEARCH_CACHE_TTL > 0 else 0,
+    ttl=WEB_SEARCH_CACHE_TTL,
+)
+
+# (embedding engine and model, sha256 of the chunk text) -> embedding vector
+WEB_CHUNK_EMBEDDING_CACHE = LRUCache(
+    maxsize=WEB_SEARCH_CACHE_MAX_CHUNKS if WEB_SEARCH_CACHE_TTL > 0 else 0,
+    ttl=WEB_SEARCH_CACHE_TTL,
+)
+
+TRACKING_QUERY_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "ref_src"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of `url` used as cache key: lower-cased scheme and host,
+    no default port, fragment or tracking parameters, sorted query string.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").rstrip(".")
+    if ":" in netloc:
+        netloc = f"[{netloc}]"
+    if parts.username or parts.password:
+        netloc = f"{parts.username or ''}:{parts.password or ''}@{netloc}"
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.startswith("utm_") and key not in TRACKING_QUERY_PARAMS
+        )
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def get_cached_pages(urls: list[str]) -> tuple[dict[str, list[Document]], list[str]]:
+    """Split `urls` into the pages found in WEB_PAGE_CACHE and the ones to fetch."""
+    cached, missing = {}, []
+    for url in urls:
+        docs = WEB_PAGE_CACHE.get(normalize_url(url))
+        if docs is None:
+            missing.append(url)
+        else:
+            cached[url] = docs
+    return cached, missing
+
+
+def cache_pages(docs: list[Document]) -> None:
+    pages: dict[str, list[Document]] = {}
+    for doc in docs:
+        source = doc.metadata.get("source")
+        if source and doc.page_content:
+            pages.setdefault(normalize_url(source), []).append(doc)
+
+    for url, page_docs in pages.items():
+        WEB_PAGE_CACHE.set(url, page_docs)
+
+
+def get_content_hash(docs: list[Document]) -> str:
+    return sha256(
+        "\n".join(
+            f"{doc.metadata.get('source', '')}:{sha256(doc.page_content)}"
+            for doc in docs
+        )
+    )
+
+
+def get_cached_embedding_function(cache_key: str, embedding_function):
+    """
+    Wrap a document `embedding_function` so that only chunks missing from
+    WEB_CHUNK_EMBEDDING_CACHE are embedded.
+    """
+
+    def embed(texts, prefix=None, user=None):
+        keys = [(cache_key, prefix, sha256(text)) for text in texts]
+        embeddings = [WEB_CHUNK_EMBEDDING_CACHE.get(key) for key in keys]
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            new_embeddings = embedding_function(
+                [texts[idx] for idx in missing], prefix=prefix, user=user
+            )
+            for idx, embedding in zip(missing, new_embeddings):
+                embeddings[idx] = embedding
+                WEB_CHUNK_EMBEDDING_CACHE.set(keys[idx], embedding)
+
+        log.debug(
+            f"get_cached_embedding_function: {len(texts) - len(missing)}/{len(texts)} cached embeddings"
+        )
+        return embeddings
+
+    return embed
+
+
+class WebSearchCollections:
+    """
+    Tracks the `web-search-*` collections, when they were last used and a hash
+    of their content, so identical searches reuse the collection and unused
+    ones can be deleted in the background.
+
+    With Redis configured the state is shared by all workers and survives
+    restarts, otherwise it only covers the collections of this process.
+    """
+
+    def __init__(self, redis=None, redis_key_prefix: str = REDIS_KEY_PREFIX):
+        self._redis = redis
+        self._last_used_key = f"{redis_key_prefix}:web_search_collections:last_used"
+        self._hashes_key = f"{redis_key_prefix}:web_search_collections:hashes"
+        self._collections: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        return self._redis is not None
+
+    def is_current(self, collection_name: str, content_hash: str) -> bool:
+        if self._redis is not None:
+            if self._redis.hget(self._hashes_key, collection_name) != content_hash:
+                return False
+            # Only refreshed while tracked, a concurrent cleanup wins otherwise
+            if not self._redis.zadd(
+                self._last_used_key, {collection_name: time.time()}, xx=True, ch=True
+            ):
+                return False
+        else:
+            with self._lock:
+                entry = self._collections.get(collection_name)
+                if entry is None or entry[1] != content_hash:
+                    return False
+                self._collections[collection_name] = (time.time(), content_hash)
+
+        return VECTOR_DB_CLIENT.has_collection(collection_name=collection_name)
+
+    def touch(self, collection_name: str, content_hash: str) -> None:
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            pipe.hset(self._hashes_key, collection_name, content_hash)
+            pipe.zadd(self._last_used_key, {collection_name: time.time()})
+            pipe.execute()
+            return
+
+        with self._lock:
+            self._collections[collection_name] = (time.time(), content_hash)
+
+    def mark_used(self, collection_name: str) -> None:
+        """Keep a collection that chats still read from."""
+        if self._redis is not None:
+            self._redis.zadd(
+                self._last_used_key, {collection_name: time.time()}, xx=True
+            )
+            return
+
+        with self._lock:
+            entry = self._collections.get(collection_name)
+            if entry is not None:
+                self._collections[collection_name] = (time.time(), entry[1])
+
+    def is_tracked(self, collection_name: str) -> bool:
+        if self._redis is not None:
+            return self._redis.zscore(self._last_used_key, collection_name) is not None
+
+        with self._lock:
+            return collection_name in self._collections
+
+    def discard(self, collection_name: str) -> None:
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            pipe.zrem(self._last_used_key, collection_name)
+            pipe.hdel(self._hashes_key, collection_name)
+            pipe.execute()
+            return
+
+        with self._lock:
+            self._collections.pop(collection_name, None)
+
+    def pop_expired(self, ttl: int) -> list[str]:
+        cutoff = time.time() - ttl
+        if self._redis is not None:
+            # Read and remove in one transaction, so a collection used in
+            # between is neither returned nor dropped
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.zrangebyscore(self._last_used_key, "-inf", cutoff)
+            pipe.zremrangebyscore(self._last_used_key, "-inf", cutoff)
+            expired, _ = pipe.execute()
+            if expired:
+                self._redis.hdel(self._hashes_key, *expired)
+            return list(expired)
+
+        with self._lock:
+            expired = [
+                collection_name
+                for collection_name, (last_used, _) in self._collections.items()
+                if last_used < cutoff
+            ]
+            for collection_name in expired:
+                del self._collections[collection_name]
+        return expired
+
+    def cleanup(self, ttl: int) -> int:
+        deleted = 0
+        for collection_name in self.pop_expired(ttl):
+            # Recreated by another search since it expired
+            if self.is_tracked(collection_name):
+                continue
+            try:
+                if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                    deleted += 1
+            except Exception as e:
+                log.warning(f"Failed to delete collection {collection_name}: {e}")
+        return deleted
+
+
+WEB_SEARCH_COLLECTIONS = WebSearchCollections(
+    get_redis_connection(
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_cluster=REDIS_CLUSTER,
+    )
+)
+
+
+async def periodic_web_search_collection_cleanup(
+    ttl: Optional[int] = WEB_SEARCH_COLLECTION_TTL,
+):
+    if not ttl or ttl <= 0:
+        return
+
+    if not WEB_SEARCH_COLLECTIONS.shared and UVICORN_WORKERS > 1:
+        # Each worker would only see its own collections and could delete
+        # the ones the other workers still use
+        log.warning(
+            "WEB_SEARCH_COLLECTION_TTL requires REDIS_URL with multiple workers, "
+            "web search collections are not cleaned up"
+        )
+        return
+
+    interval = min(ttl, 3600)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await asyncio.to_thread(WEB_SEARCH_COLLECTIONS.cleanup, ttl)
+            if deleted:
+                log.info(f"Deleted {deleted} unused web search collections")
+        except Exception as e:
+            log.exception(f"Web search collection cleanup failed: {e}")
@@ -2,8 +2,6 @@ import logging
 from typing import Optional
 
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
-from ddgs import DDGS
-from ddgs.exceptions import RatelimitException
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
@@ -25,6 +23,10 @@ def search_duckduckgo(
     Returns:
         list[SearchResult]: A list of search results
     """
+    # ddgs pulls in lxml, imported here to keep it out of the start-up
+    from ddgs import DDGS
+    from ddgs.exceptions import RatelimitException
+
     # Use the DDGS context manager to create a DDGS object
     search_results = []
     with DDGS() as ddgs:
@@ -0,0 +1,154 @@
+"""
+HTML to text extraction for the web loaders.
+
+Kept free of open_webui.config and other heavy imports so the functions can
+run in a spawned worker process. Extractors:
+
+- "selectolax": fastest, requires the optional `selectolax` package
+- "lxml": requires the optional `lxml` package
+- "beautifulsoup": always available, slowest
+- "auto": the first available one in the order above
+"""
+
+from functools import cache
+from typing import Optional
+
+BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "iframe"]
+EXTRACTORS = ["selectolax", "lxml", "beautifulsoup"]
+
+
+@cache
+def is_available(extractor: str) -> bool:
+    try:
+        if extractor == "selectolax":
+            _selectolax_parser()
+        elif extractor == "lxml":
+            import lxml.html  # noqa: F401
+        else:
+            import bs4  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_extractor(extractor: str) -> str:
+    if extractor in EXTRACTORS and is_available(extractor):
+        return extractor
+    return next((name for name in EXTRACTORS if is_available(name)), "beautifulsoup")
+
+
+def _metadata(url: str, title=None, description=None, language=None) -> dict:
+    metadata = {"source": url}
+    if title is not None:
+        metadata["title"] = title
+    if description is not None:
+        metadata["description"] = description or "No description found."
+    if language is not None:
+        metadata["language"] = language or "No language found."
+    return metadata
+
+
+def _selectolax_parser():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborHTMLParser
+    except ImportError:
+        # selectolax < 0.3.13 only ships the modest backend
+        from selectolax.parser import HTMLParser
+
+        return HTMLParser
+
+
+def _extract_selectolax(html: str, url: str) -> tuple[str, dict]:
+    tree = _selectolax_parser()(html)
+    title = tree.css_first("title")
+    description = tree.css_first('meta[name="description"]')
+    root = tree.css_first("html")
+    metadata = _metadata(
+        url,
+        title=title.text() if title else None,
+        description=description.attributes.get("content") if description else None,
+        language=root.attributes.get("lang") if root else None,
+    )
+
+    tree.strip_tags(BOILERPLATE_TAGS)
+    node = tree.body or tree.root
+    return (node.text(separator="") if node else ""), metadata
+
+
+def _extract_lxml(html: str, url: str) -> tuple[str, dict]:
+    import lxml.html
+    from lxml.etree import ParserError
+
+    try:
+        tree = lxml.html.document_fromstring(html)
+    except ParserError:
+        return "", _metadata(url)
+
+    title = tree.find(".//title")
+    description = tree.find(".//meta[@name='description']")
+    metadata = _metadata(
+        url,
+        title=title.text_content() if title is not None else None,
+        description=description.get("content") if description is not None else None,
+        language=tree.get("lang") if tree.tag == "html" else None,
+    )
+
+    for element in tree.iter(*BOILERPLATE_TAGS):
+        element.drop_tree()
+    body = tree.find("body")
+    return (body if body is not None else tree).text_content(), metadata
+
+
+def _extract_beautifulsoup(
+    html: str,
+    url: str,
+    parser: Optional[str],
+    bs_kwargs: Optional[dict],
+    get_text_kwargs: Optional[dict],
+) -> tuple[str, dict]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, parser or "html.parser", **(bs_kwargs or {}))
+    title = soup.find("title")
+    description = soup.find("meta", attrs={"name": "description"})
+    root = soup.find("html")
+    metadata = _metadata(
+        url,
+        title=title.get_text() if title else None,
+        description=(
+            description.get("content", "No description found.") if description else None
+        ),
+        language=root.get("lang", "No language found.") if root else None,
+    )
+
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+    return soup.get_text(**(get_text_kwargs or {})), metadata
+
+
+def extract_text(
+    html: str,
+    url: str,
+    extractor: str = "auto",
+    parser: Optional[str] = None,
+    bs_kwargs: Optional[dict] = None,
+    get_text_kwargs: Optional[dict] = None,
+) -> tuple[str, dict]:
+    """
+    Return the visible text of `html` without scripts, styles and similar
+    boilerplate, along with source, title, description and language metadata.
+    XML documents, an explicit BeautifulSoup `parser` or `get_text_kwargs`
+    always use BeautifulSoup.
+    """
+    if url.endswith(".xml") and not parser:
+        # BeautifulSoup's xml parser is provided by lxml
+        parser = "xml" if is_available("lxml") else "html.parser"
+
+    extractor = resolve_extractor(extractor)
+    if parser or get_text_kwargs or extractor == "beautifulsoup":
+        return _extract_beautifulsoup(html, url, parser, bs_kwargs, get_text_kwargs)
+    if extractor == "selectolax":
+        return _extract_selectolax(html, url)
+    return _extract_lxml(html, url)
@@ -1,10 +1,14 @@
 import asyncio
+import functools
+import ipaddress
 import logging
+import multiprocessing
 import socket
 import ssl
 import urllib.parse
 import urllib.request
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, time, timedelta
 from typing import (
     Any,
@@ -18,6 +22,8 @@ from typing import (
     Literal,
 )
 import aiohttp
+from aiohttp.abc import ResolveResult
+from aiohttp.resolver import ThreadedResolver
 import certifi
 import validators
 from langchain_community.document_loaders import PlaywrightURLLoader, WebBaseLoader
@@ -26,9 +32,15 @@ from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
+from open_webui.retrieval.web.browser_pool import PLAYWRIGHT_BROWSER_POOL
+from open_webui.retrieval.web.extract import extract_text, resolve_extractor
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.config import (
     ENABLE_RAG_LOCAL_WEB_FETCH,
+    WEB_LOADER_HOST_CHECK_CACHE_TTL,
+    WEB_LOADER_HTML_EXTRACTOR,
+    WEB_LOADER_PARSER_EXECUTOR,
+    WEB_LOADER_PARSER_WORKERS,
     PLAYWRIGHT_WS_URL,
     PLAYWRIGHT_TIMEOUT,
     WEB_LOADER_ENGINE,
@@ -40,10 +52,127 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_API_KEY,
 )
 from open_webui.env import SRC_LOG_LEVELS, AIOHTTP_CLIENT_SESSION_SSL
+from open_webui.utils.misc import LRUCache
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+SSL_VERIFICATION_TIMEOUT = 10
+# Resolved addresses are only reused briefly, a longer TTL would let a host
+# switch to a private address after it was checked (DNS rebinding)
+HOSTNAME_CACHE_MAX_TTL = 10
+
+# Per-host addresses from DNS resolution and results of SSL certificate
+# verification
+HOSTNAME_CACHE = LRUCache(
+    maxsize=4096 if WEB_LOADER_HOST_CHECK_CACHE_TTL > 0 else 0,
+    ttl=min(WEB_LOADER_HOST_CHECK_CACHE_TTL, HOSTNAME_CACHE_MAX_TTL),
+)
+SSL_CERT_CACHE = LRUCache(
+    maxsize=4096 if WEB_LOADER_HOST_CHECK_CACHE_TTL > 0 else 0,
+    ttl=WEB_LOADER_HOST_CHECK_CACHE_TTL,
+)
+
+# Shared by all SafeWebBaseLoader instances, see get_http_session and
+# get_parser_executor; released again by close_web_loader_resources
+_HTTP_SESSIONS: Dict[bool, tuple] = {}
+_PARSER_EXECUTOR: Optional[Executor] = None
+
+
+def get_http_session(trust_env: bool = False) -> aiohttp.ClientSession:
+    """
+    Return the aiohttp session shared by web loaders on the running event
+    loop. Cookies are never stored, loaders pass their own with each request.
+    """
+    loop = asyncio.get_running_loop()
+    session_loop, session = _HTTP_SESSIONS.get(trust_env, (None, None))
+    if session is None or session.closed or session_loop is not loop:
+        session = aiohttp.ClientSession(
+            trust_env=trust_env,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                ttl_dns_cache=300,
+                # With a proxy from the environment only the proxy is resolved
+                resolver=None if trust_env else PublicAddressResolver(),
+            ),
+        )
+        _HTTP_SESSIONS[trust_env] = (loop, session)
+    return session
+
+
+def get_parser_executor() -> Executor:
+    """Bounded pool that parses fetched HTML off the event loop."""
+    global _PARSER_EXECUTOR
+    if _PARSER_EXECUTOR is None:
+        workers = max(WEB_LOADER_PARSER_WORKERS, 1)
+        if WEB_LOADER_PARSER_EXECUTOR == "process":
+            # spawn, forking the server process with its threads is unsafe
+            _PARSER_EXECUTOR = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _PARSER_EXECUTOR = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="web_loader_parser"
+            )
+        log.info(
+            f"Parsing web pages with {resolve_extractor(WEB_LOADER_HTML_EXTRACTOR)} "
+            f"in a {WEB_LOADER_PARSER_EXECUTOR} pool of {workers} workers"
+        )
+    return _PARSER_EXECUTOR
+
+
+async def close_web_loader_resources():
+    global _PARSER_EXECUTOR
+
+    loop = asyncio.get_running_loop()
+    for session_loop, session in _HTTP_SESSIONS.values():
+        if session_loop is loop and not session.closed:
+            await session.close()
+    _HTTP_SESSIONS.clear()
+
+    if _PARSER_EXECUTOR is not None:
+        _PARSER_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _PARSER_EXECUTOR = None
+
+
+def _check_resolved_addresses(ipv4_addresses, ipv6_addresses):
+    # Check if any of the resolved addresses are private
+    # This is technically still vulnerable to DNS rebinding attacks, as we don't control WebBaseLoader
+    for ip in ipv4_addresses:
+        if validators.ipv4(ip, private=True):
+            raise ValueError(ERROR_MESSAGES.INVALID_URL)
+    for ip in ipv6_addresses:
+        # validators.ipv6 has no private check, drop the zone of link-local ones
+        address = ipaddress.IPv6Address(ip.split("%")[0])
+        if address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.is_private or address.is_loopback or address.is_link_local:
+            raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+
+class PublicAddressResolver(ThreadedResolver):
+    """
+    Resolver of the web loader sessions that refuses private addresses unless
+    local web fetch is enabled. Connections then go to exactly the addresses
+    that were checked, including redirects.
+    """
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> List[ResolveResult]:
+        results = await super().resolve(host, port, family)
+        if not ENABLE_RAG_LOCAL_WEB_FETCH:
+            try:
+                _check_resolved_addresses(
+                    [r["host"] for r in results if r["family"] == socket.AF_INET],
+                    [r["host"] for r in results if r["family"] == socket.AF_INET6],
+                )
+            except ValueError as e:
+                # Reported by aiohttp as a failed connection
+                raise OSError(f"{host} resolves to a private address") from e
+        return results
+
 
 def validate_url(url: Union[str, Sequence[str]]):
     if isinstance(url, str):
@@ -54,14 +183,7 @@ def validate_url(url: Union[str, Sequence[str]]):
             parsed_url = urllib.parse.urlparse(url)
             # Get IPv4 and IPv6 addresses
             ipv4_addresses, ipv6_addresses = resolve_hostname(parsed_url.hostname)
-            # Check if any of the resolved addresses are private
-            # This is technically still vulnerable to DNS rebinding attacks, as we don't control WebBaseLoader
-            for ip in ipv4_addresses:
-                if validators.ipv4(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
-            for ip in ipv6_addresses:
-                if validators.ipv6(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
+            _check_resolved_addresses(ipv4_addresses, ipv6_addresses)
         return True
     elif isinstance(url, Sequence):
         return all(validate_url(u) for u in url)
@@ -69,6 +191,17 @@ def validate_url(url: Union[str, Sequence[str]]):
         return False
 
 
+async def avalidate_url(url: str) -> bool:
+    """Async version of validate_url for a single URL, resolving off the event loop."""
+    if isinstance(validators.url(url), validators.ValidationError):
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+    if not ENABLE_RAG_LOCAL_WEB_FETCH:
+        parsed_url = urllib.parse.urlparse(url)
+        ipv4_addresses, ipv6_addresses = await aresolve_hostname(parsed_url.hostname)
+        _check_resolved_addresses(ipv4_addresses, ipv6_addresses)
+    return True
+
+
 def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     valid_urls = []
     for u in url:
@@ -80,10 +213,22 @@ def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     return valid_urls
 
 
-def resolve_hostname(hostname):
-    # Get address information
-    addr_info = socket.getaddrinfo(hostname, None)
+async def asafe_validate_urls(url: Sequence[str]) -> Sequence[str]:
+    """Validate all URLs concurrently, dropping the ones that fail."""
+    results = await asyncio.gather(
+        *[avalidate_url(u) for u in url], return_exceptions=True
+    )
+    valid_urls = []
+    for u, result in zip(url, results):
+        if result is True:
+            valid_urls.append(u)
+        elif not isinstance(result, ValueError):
+            # Unresolvable hosts are skipped just like invalid ones
+            log.debug(f"Error validating {u}: {result}")
+    return valid_urls
 
+
+def _split_addresses(addr_info):
     # Extract IP addresses from address information
     ipv4_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET]
     ipv6_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET6]
@@ -91,6 +236,25 @@ def resolve_hostname(hostname):
     return ipv4_addresses, ipv6_addresses
 
 
+def resolve_hostname(hostname):
+    addresses = HOSTNAME_CACHE.get(hostname)
+    if addresses is None:
+        # Get address information
+        addresses = _split_addresses(socket.getaddrinfo(hostname, None))
+        HOSTNAME_CACHE.set(hostname, addresses)
+    return addresses
+
+
+async def aresolve_hostname(hostname):
+    addresses = HOSTNAME_CACHE.get(hostname)
+    if addresses is None:
+        # Runs getaddrinfo in the default executor instead of blocking the loop
+        addr_info = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+        addresses = _split_addresses(addr_info)
+        HOSTNAME_CACHE.set(hostname, addresses)
+    return addresses
+
+
 def extract_metadata(soup, url):
     metadata = {"source": url}
     if title := soup.find("title"):
@@ -107,18 +271,63 @@ def verify_ssl_cert(url: str) -> bool:
     if not url.startswith("https://"):
         return True
 
+    hostname = url.split("://")[-1].split("/")[0]
+    verified = SSL_CERT_CACHE.get(hostname)
+    if verified is not None:
+        return verified
+
     try:
-        hostname = url.split("://")[-1].split("/")[0]
         context = ssl.create_default_context(cafile=certifi.where())
         with context.wrap_socket(ssl.socket(), server_hostname=hostname) as s:
+            s.settimeout(SSL_VERIFICATION_TIMEOUT)
             s.connect((hostname, 443))
-        return True
+        verified = True
     except ssl.SSLError:
+        verified = False
+    except Exception as e:
+        # Connection errors and timeouts may be transient, don't cache them
+        log.warning(f"SSL verification failed for {url}: {str(e)}")
         return False
+
+    SSL_CERT_CACHE.set(hostname, verified)
+    return verified
+
+
+async def averify_ssl_cert(url: str) -> bool:
+    """Verify SSL certificate for the given URL without blocking the event loop."""
+    if not url.startswith("https://"):
+        return True
+
+    hostname = url.split("://")[-1].split("/")[0]
+    verified = SSL_CERT_CACHE.get(hostname)
+    if verified is not None:
+        return verified
+
+    try:
+        context = ssl.create_default_context(cafile=certifi.where())
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                hostname, 443, ssl=context, server_hostname=hostname
+            ),
+            timeout=SSL_VERIFICATION_TIMEOUT,
+        )
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            # The handshake succeeded, errors while shutting down don't matter
+            pass
+        verified = True
+    except ssl.SSLError:
+        verified = False
     except Exception as e:
+        # Connection errors and timeouts may be transient, don't cache them
         log.warning(f"SSL verification failed for {url}: {str(e)}")
         return False
 
+    SSL_CERT_CACHE.set(hostname, verified)
+    return verified
+
 
 class RateLimitMixin:
     async def _wait_for_rate_limit(self):
@@ -145,9 +354,23 @@ class URLProcessingMixin:
         """Verify SSL certificate for a URL."""
         return verify_ssl_cert(url)
 
+    async def _averify_ssl_cert(self, url: str) -> bool:
+        """Verify SSL certificate for a URL without blocking the event loop."""
+        return await averify_ssl_cert(url)
+
+    async def _averify_ssl_certs(self, urls: Sequence[str]) -> None:
+        """Verify the certificates of all hosts concurrently to warm the cache."""
+        if not self.verify_ssl or SSL_CERT_CACHE.maxsize <= 0:
+            return
+        # One check per host, the cache answers for the remaining URLs
+        urls_by_host = {url.split("://")[-1].split("/")[0]: url for url in urls}
+        await asyncio.gather(
+            *[self._averify_ssl_cert(url) for url in urls_by_host.values()]
+        )
+
     async def _safe_process_url(self, url: str) -> bool:
         """Perform safety checks before processing a URL."""
-        if self.verify_ssl and not self._verify_ssl_cert(url):
+        if self.verify_ssl and not await self._averify_ssl_cert(url):
             raise ValueError(f"SSL certificate verification failed for {url}")
         await self._wait_for_rate_limit()
         return True
@@ -240,6 +463,7 @@ class SafeFireCrawlLoader(BaseLoader, RateLimitMixin, URLProcessingMixin):
 
     async def alazy_load(self):
         """Async version of lazy_load."""
+        await self._averify_ssl_certs(self.web_paths)
         for url in self.web_paths:
             try:
                 await self._safe_process_url(url)
@@ -341,6 +565,7 @@ class SafeTavilyLoader(BaseLoader, RateLimitMixin, URLProcessingMixin):
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Async version with rate limiting and SSL verification."""
+        await self._averify_ssl_certs(self.web_paths)
         valid_urls = []
         for url in self.web_paths:
             try:
@@ -386,6 +611,7 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
         proxy (dict): Proxy override settings for the Playwright session.
         playwright_ws_url (Optional[str]): WebSocket endpoint URI for remote browser connection.
         playwright_timeout (Optional[int]): Maximum operation time in milliseconds.
+        concurrent_requests (Optional[int]): Number of pages loaded in parallel by `alazy_load`.
     """
 
     def __init__(
@@ -400,6 +626,7 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
         proxy: Optional[Dict[str, str]] = None,
         playwright_ws_url: Optional[str] = None,
         playwright_timeout: Optional[int] = 10000,
+        concurrent_requests: Optional[int] = None,
     ):
         """Initialize with additional safety parameters and remote browser support."""
 
@@ -427,6 +654,7 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
         self.playwright_ws_url = playwright_ws_url
         self.trust_env = trust_env
         self.playwright_timeout = playwright_timeout
+        self.concurrent_requests = concurrent_requests
 
     def lazy_load(self) -> Iterator[Document]:
         """Safely load URLs synchronously with support for remote browser."""
@@ -458,35 +686,48 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
             browser.close()
 
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Safely load URLs asynchronously with support for remote browser."""
-        from playwright.async_api import async_playwright
+        """
+        Safely load URLs asynchronously in pages of the shared browser pool.
+        Up to `concurrent_requests` pages load in parallel, documents are
+        yielded in URL order.
+        """
+        await self._averify_ssl_certs(self.urls)
 
-        async with async_playwright() as p:
-            # Use remote browser if ws_endpoint is provided, otherwise use local browser
-            if self.playwright_ws_url:
-                browser = await p.chromium.connect(self.playwright_ws_url)
-            else:
-                browser = await p.chromium.launch(
-                    headless=self.headless, proxy=self.proxy
-                )
+        semaphore = asyncio.Semaphore(max(self.concurrent_requests or 1, 1))
+        rate_limit_lock = asyncio.Lock()
 
-            for url in self.urls:
-                try:
+        async def load(url: str) -> Document:
+            async with semaphore:
+                async with rate_limit_lock:
                     await self._safe_process_url(url)
-                    page = await browser.new_page()
+
+                async with PLAYWRIGHT_BROWSER_POOL.page(
+                    ws_url=self.playwright_ws_url,
+                    headless=self.headless,
+                    proxy=self.proxy,
+                ) as page:
                     response = await page.goto(url, timeout=self.playwright_timeout)
                     if response is None:
                         raise ValueError(f"page.goto() returned None for url {url}")
 
-                    text = await self.evaluator.evaluate_async(page, browser, response)
-                    metadata = {"source": url}
-                    yield Document(page_content=text, metadata=metadata)
+                    text = await self.evaluator.evaluate_async(
+                        page, page.context.browser, response
+                    )
+                    return Document(page_content=text, metadata={"source": url})
+
+        tasks = [asyncio.create_task(load(url)) for url in self.urls]
+        try:
+            for url, task in zip(self.urls, tasks):
+                try:
+                    yield await task
                 except Exception as e:
                     if self.continue_on_failure:
                         log.exception(f"Error loading {url}: {e}")
                         continue
                     raise e
-            await browser.close()
+        finally:
+            for task in tasks:
+                task.cancel()
 
 
 class SafeWebBaseLoader(WebBaseLoader):
@@ -504,33 +745,33 @@ class SafeWebBaseLoader(WebBaseLoader):
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
-        async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
+        session = get_http_session(self.trust_env)
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers=self.session.headers,
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs["ssl"] = False
+
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                    allow_redirects=False,
+                ) as response:
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    return await response.text()
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(
+                        f"Error fetching {url} with attempt "
+                        f"{i + 1}/{retries}: {e}. Retrying..."
                     )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                        allow_redirects=False,
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(
-                            f"Error fetching {url} with attempt "
-                            f"{i + 1}/{retries}: {e}. Retrying..."
-                        )
-                        await asyncio.sleep(cooldown * backoff**i)
+                    await asyncio.sleep(cooldown * backoff**i)
         raise ValueError("retry count exceeded")
 
     def _unpack_fetch_results(
@@ -556,7 +797,9 @@ class SafeWebBaseLoader(WebBaseLoader):
     ) -> List[Any]:
         """Async fetch all urls, then return soups for all results."""
         results = await self.fetch_all(urls)
-        return self._unpack_fetch_results(results, urls, parser=parser)
+        return await asyncio.to_thread(
+            self._unpack_fetch_results, results, urls, parser=parser
+        )
 
     def lazy_load(self) -> Iterator[Document]:
         """Lazy load text from the url(s) in web_path with error handling."""
@@ -573,21 +816,54 @@ class SafeWebBaseLoader(WebBaseLoader):
                 # Log the error and continue with the next URL
                 log.exception(f"Error loading {path}: {e}")
 
+    async def _aload_url(self, url: str, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                html = await self._fetch(url)
+            except Exception as e:
+                if not self.continue_on_failure:
+                    raise
+                log.warning(f"Error fetching {url}: {e}")
+                return None
+
+        # Parsing happens outside of the semaphore so the next fetch can start
+        try:
+            text, metadata = await asyncio.get_running_loop().run_in_executor(
+                get_parser_executor(),
+                functools.partial(
+                    extract_text,
+                    html,
+                    url,
+                    extractor=WEB_LOADER_HTML_EXTRACTOR,
+                    bs_kwargs=self.bs_kwargs,
+                    get_text_kwargs=self.bs_get_text_kwargs,
+                ),
+            )
+        except Exception as e:
+            if not self.continue_on_failure:
+                raise
+            log.warning(f"Error parsing {url}: {e}")
+            return None
+        return Document(page_content=text, metadata=metadata)
+
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        """
+        Async lazy load text from the url(s) in web_path. Documents are
+        yielded as soon as their page is fetched and parsed, not in order.
+        """
+        semaphore = asyncio.Semaphore(self.requests_per_second)
+        tasks = [
+            asyncio.create_task(self._aload_url(url, semaphore))
+            for url in self.web_paths
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                document = await task
+                if document is not None:
+                    yield document
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
@@ -599,10 +875,46 @@ def get_web_loader(
     verify_ssl: bool = True,
     requests_per_second: int = 2,
     trust_env: bool = False,
+    concurrent_requests: Optional[int] = None,
 ):
     # Check if the URLs are valid
     safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
 
+    return _create_web_loader(
+        safe_urls, verify_ssl, requests_per_second, trust_env, concurrent_requests
+    )
+
+
+async def aget_web_loader(
+    urls: Union[str, Sequence[str]],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+    concurrent_requests: Optional[int] = None,
+):
+    """
+    Async version of get_web_loader. URLs are validated concurrently and, for
+    loaders that verify certificates themselves, all hosts are checked up
+    front so loading does not wait on them one by one.
+    """
+    safe_urls = await asafe_validate_urls([urls] if isinstance(urls, str) else urls)
+
+    web_loader = _create_web_loader(
+        safe_urls, verify_ssl, requests_per_second, trust_env, concurrent_requests
+    )
+    if isinstance(web_loader, URLProcessingMixin):
+        await web_loader._averify_ssl_certs(safe_urls)
+
+    return web_loader
+
+
+def _create_web_loader(
+    safe_urls: Sequence[str],
+    verify_ssl: bool,
+    requests_per_second: int,
+    trust_env: bool,
+    concurrent_requests: Optional[int] = None,
+):
     web_loader_args = {
         "web_paths": safe_urls,
         "verify_ssl": verify_ssl,
@@ -616,6 +928,7 @@ def get_web_loader(
     if WEB_LOADER_ENGINE.value == "playwright":
         WebLoaderClass = SafePlaywrightURLLoader
         web_loader_args["playwright_timeout"] = PLAYWRIGHT_TIMEOUT.value
+        web_loader_args["concurrent_requests"] = concurrent_requests
         if PLAYWRIGHT_WS_URL.value:
             web_loader_args["playwright_ws_url"] = PLAYWRIGHT_WS_URL.value
 
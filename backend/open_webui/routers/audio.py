@@ -1,11 +1,14 @@
+import asyncio
 import hashlib
+import io
 import json
 import logging
 import os
+import re
+import threading
 import uuid
 from functools import lru_cache
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
+import subprocess
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -28,7 +31,7 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -38,9 +41,14 @@ from open_webui.config import (
     WHISPER_MODEL_DIR,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_NUM_WORKERS,
+    WHISPER_CPU_THREADS,
+    AUDIO_TTS_WORKERS,
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.utils.audio import SPEECH_CACHE, SPEECH_CACHE_DIR
 from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     AIOHTTP_CLIENT_TIMEOUT,
@@ -62,8 +70,15 @@ AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to byte
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 
-SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Local speech synthesis runs here instead of on the event loop
+TTS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(AUDIO_TTS_WORKERS, 1), thread_name_prefix="tts"
+)
+
+SPEECH_PIPELINE_LOCK = threading.Lock()
+
+# Longer inputs are synthesized and streamed back in chunks of about this size
+TTS_CHUNK_LENGTH = 200
 
 
 ##########################################
@@ -72,9 +87,6 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 #
 ##########################################
 
-from pydub import AudioSegment
-from pydub.utils import mediainfo
-
 
 def is_audio_conversion_required(file_path):
     """
@@ -86,6 +98,8 @@ def is_audio_conversion_required(file_path):
         log.error(f"File not found: {file_path}")
         return False
 
+    from pydub.utils import mediainfo
+
     try:
         info = mediainfo(file_path)
         codec_name = info.get("codec_name", "").lower()
@@ -106,12 +120,23 @@ def is_audio_conversion_required(file_path):
         return False
 
 
+def run_ffmpeg(*args):
+    """Run ffmpeg without reading the input into memory, raise on failure."""
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg failed: {result.stderr.strip()[-500:]}")
+
+
 def convert_audio_to_mp3(file_path):
     """Convert audio file to mp3 format."""
     try:
         output_path = os.path.splitext(file_path)[0] + ".mp3"
-        audio = AudioSegment.from_file(file_path)
-        audio.export(output_path, format="mp3")
+        run_ffmpeg("-i", file_path, "-vn", "-f", "mp3", output_path)
         log.info(f"Converted {file_path} to {output_path}")
         return output_path
     except Exception as e:
@@ -124,10 +149,16 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
     if model:
         from faster_whisper import WhisperModel
 
+        device = DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu"
         faster_whisper_kwargs = {
             "model_size_or_path": model,
-            "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
-            "compute_type": "int8",
+            "device": device,
+            "compute_type": WHISPER_COMPUTE_TYPE
+            or ("int8_float16" if device == "cuda" else "int8"),
+            # One model, several workers: transcribe() calls from different
+            # threads run in parallel instead of queueing on a single replica
+            "num_workers": max(WHISPER_NUM_WORKERS, 1),
+            "cpu_threads": WHISPER_CPU_THREADS,
             "download_root": WHISPER_MODEL_DIR,
             "local_files_only": not auto_update,
         }
@@ -143,6 +174,39 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
     return whisper_model
 
 
+WHISPER_MODEL_LOCK = threading.Lock()
+
+
+def get_faster_whisper_model(app):
+    """Return the local whisper model, loading it once if needed."""
+    if app.state.faster_whisper_model is None:
+        with WHISPER_MODEL_LOCK:
+            if app.state.faster_whisper_model is None:
+                app.state.faster_whisper_model = set_faster_whisper_model(
+                    app.state.config.WHISPER_MODEL
+                )
+    return app.state.faster_whisper_model
+
+
+def prewarm_faster_whisper_model(app):
+    """Load the local whisper model and run it once on a second of silence."""
+    try:
+        import numpy as np
+
+        model = get_faster_whisper_model(app)
+        if model is None:
+            return
+
+        segments, _ = model.transcribe(
+            np.zeros(16000, dtype=np.float32), beam_size=1, language="en"
+        )
+        for _ in segments:
+            pass
+        log.info(f"Whisper model {app.state.config.WHISPER_MODEL} is ready")
+    except Exception as e:
+        log.warning(f"Failed to pre-warm the whisper model: {e}")
+
+
 ##########################################
 #
 # Audio API
@@ -253,8 +317,10 @@ async def update_audio_config(
     )
 
     if request.app.state.config.STT_ENGINE == "":
-        request.app.state.faster_whisper_model = set_faster_whisper_model(
-            form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
+        request.app.state.faster_whisper_model = await asyncio.to_thread(
+            set_faster_whisper_model,
+            form_data.stt.WHISPER_MODEL,
+            WHISPER_MODEL_AUTO_UPDATE,
         )
     else:
         request.app.state.faster_whisper_model = None
@@ -293,6 +359,11 @@ def load_speech_pipeline(request):
     from transformers import pipeline
     from datasets import load_dataset
 
+    with SPEECH_PIPELINE_LOCK:
+        _load_speech_pipeline(request, pipeline, load_dataset)
+
+
+def _load_speech_pipeline(request, pipeline, load_dataset):
     if request.app.state.speech_synthesiser is None:
         request.app.state.speech_synthesiser = pipeline(
             "text-to-speech", "microsoft/speecht5_tts"
@@ -304,6 +375,211 @@ def load_speech_pipeline(request):
         )
 
 
+def get_speaker_embedding(request):
+    import torch
+
+    load_speech_pipeline(request)
+
+    embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
+
+    speaker_index = 6799
+    try:
+        speaker_index = embeddings_dataset["filename"].index(
+            request.app.state.config.TTS_MODEL
+        )
+    except Exception:
+        pass
+
+    return torch.tensor(embeddings_dataset[speaker_index]["xvector"]).unsqueeze(0)
+
+
+def synthesize_speech(request, text: str, speaker_embedding) -> bytes:
+    import soundfile as sf
+
+    speech = request.app.state.speech_synthesiser(
+        text,
+        forward_params={"speaker_embeddings": speaker_embedding},
+    )
+
+    buffer = io.BytesIO()
+    sf.write(buffer, speech["audio"], samplerate=speech["sampling_rate"], format="MP3")
+    return buffer.getvalue()
+
+
+def split_speech_text(text: str, max_length: int = TTS_CHUNK_LENGTH) -> list[str]:
+    """Split `text` on sentence ends into chunks of up to about `max_length`."""
+    chunks = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?\u3002\uff01\uff1f])\s+|\n+", text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > max_length:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        chunks.append(current)
+    return chunks or [text]
+
+
+# Layer III bitrates (kbps) by bitrate index and sample rates by index, for
+# MPEG 1 and for MPEG 2 and 2.5
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],  # MPEG 2.5
+}
+
+
+def get_mp3_frame_length(data: bytes, offset: int) -> Optional[int]:
+    """Length of the Layer III frame at `offset`, None if there is none."""
+    header = data[offset : offset + 4]
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header[2] >> 1) & 0x01
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+
+def strip_mp3_headers(data: bytes) -> bytes:
+    """
+    Drop the ID3 tags and the Xing/Info/VBRI frame of an MP3 encoded on its
+    own. They describe that chunk alone, and in the joined stream would make
+    players misreport its length or stop after the first chunk.
+    """
+    start, end = 0, len(data)
+    while data[start : start + 3] == b"ID3" and end - start >= 10:
+        size = 0
+        for byte in data[start + 6 : start + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[start + 5] & 0x10 else 0
+        start += 10 + size + footer
+
+    if end - start >= 128 and data[end - 128 : end - 125] == b"TAG":
+        end -= 128
+
+    frame_length = get_mp3_frame_length(data, start)
+    if frame_length and any(
+        marker in data[start : start + frame_length]
+        for marker in (b"Xing", b"Info", b"VBRI")
+    ):
+        start += frame_length
+
+    return data[start:end]
+
+
+class SpeechSynthesis:
+    """
+    Local synthesis of one speech request, run on TTS_EXECUTOR chunk by chunk.
+
+    The MP3 of every chunk is streamed to all listeners as soon as it is
+    ready, without its own headers so the chunks form one MP3 stream, and
+    written to the speech cache once complete. Identical requests
+    arriving meanwhile attach to the running synthesis instead of starting
+    another one, and a listener disconnecting does not stop it.
+    """
+
+    def __init__(self, request, name: str, payload: dict):
+        self.request = request
+        self.name = name
+        self.payload = payload
+        self.texts = split_speech_text(payload["input"])
+
+        self.chunks: list[bytes] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._condition = asyncio.Condition()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _publish(self, chunk: Optional[bytes] = None) -> None:
+        async with self._condition:
+            if chunk is not None:
+                self.chunks.append(chunk)
+            self._condition.notify_all()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        file_path = SPEECH_CACHE_DIR.joinpath(f"{self.name}.mp3")
+        tmp_path = SPEECH_CACHE_DIR.joinpath(f"{self.name}.{uuid.uuid4().hex}.part")
+
+        try:
+            speaker_embedding = await loop.run_in_executor(
+                TTS_EXECUTOR, get_speaker_embedding, self.request
+            )
+
+            with open(tmp_path, "wb") as f:
+                for text in self.texts:
+                    chunk = await loop.run_in_executor(
+                        TTS_EXECUTOR,
+                        synthesize_speech,
+                        self.request,
+                        text,
+                        speaker_embedding,
+                    )
+                    chunk = strip_mp3_headers(chunk)
+                    f.write(chunk)
+                    await self._publish(chunk)
+
+            os.replace(tmp_path, file_path)
+            async with aiofiles.open(
+                SPEECH_CACHE_DIR.joinpath(f"{self.name}.json"), "w"
+            ) as f:
+                await f.write(json.dumps(self.payload))
+            SPEECH_CACHE.add(self.name)
+        except Exception as e:
+            log.exception(e)
+            self.error = e
+            tmp_path.unlink(missing_ok=True)
+        finally:
+            SPEECH_SYNTHESES.pop(self.name, None)
+            self.done = True
+            await self._publish()
+
+    async def wait(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.done)
+
+    async def stream(self):
+        sent = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(
+                    lambda: self.done or len(self.chunks) > sent
+                )
+                chunks = self.chunks[sent:]
+                done = self.done
+
+            for chunk in chunks:
+                yield chunk
+            sent += len(chunks)
+
+            if done:
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+SPEECH_SYNTHESES: dict[str, SpeechSynthesis] = {}
+
+
 @router.post("/speech")
 async def speech(request: Request, user=Depends(get_verified_user)):
     body = await request.body()
@@ -317,8 +593,8 @@ async def speech(request: Request, user=Depends(get_verified_user)):
     file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
 
     # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
+    if cached_path := SPEECH_CACHE.get(name, ".mp3"):
+        return FileResponse(cached_path)
 
     payload = None
     try:
@@ -363,6 +639,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
                 async with aiofiles.open(file_body_path, "w") as f:
                     await f.write(json.dumps(payload))
+                SPEECH_CACHE.add(name)
 
             return FileResponse(file_path)
 
@@ -423,6 +700,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
                     async with aiofiles.open(file_body_path, "w") as f:
                         await f.write(json.dumps(payload))
+                    SPEECH_CACHE.add(name)
 
             return FileResponse(file_path)
 
@@ -482,6 +760,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
                     async with aiofiles.open(file_body_path, "w") as f:
                         await f.write(json.dumps(payload))
+                    SPEECH_CACHE.add(name)
 
                     return FileResponse(file_path)
 
@@ -510,36 +789,52 @@ async def speech(request: Request, user=Depends(get_verified_user)):
             log.exception(e)
             raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-        import torch
-        import soundfile as sf
+        synthesis = SPEECH_SYNTHESES.get(name)
+        if synthesis is None:
+            synthesis = SpeechSynthesis(request, name, payload)
+            SPEECH_SYNTHESES[name] = synthesis
+            synthesis.start()
 
-        load_speech_pipeline(request)
+        if len(synthesis.texts) > 1:
+            return StreamingResponse(synthesis.stream(), media_type="audio/mpeg")
 
-        embeddings_dataset = request.app.state.speech_speaker_embeddings_dataset
-
-        speaker_index = 6799
-        try:
-            speaker_index = embeddings_dataset["filename"].index(
-                request.app.state.config.TTS_MODEL
+        await synthesis.wait()
+        if synthesis.error is not None:
+            raise HTTPException(
+                status_code=500,
+                detail=ERROR_MESSAGES.DEFAULT(synthesis.error),
             )
-        except Exception:
-            pass
+        return FileResponse(file_path)
 
-        speaker_embedding = torch.tensor(
-            embeddings_dataset[speaker_index]["xvector"]
-        ).unsqueeze(0)
 
-        speech = request.app.state.speech_synthesiser(
-            payload["input"],
-            forward_params={"speaker_embeddings": speaker_embedding},
-        )
+def transcribe_segments(request, file_path, language=None):
+    """Yield the local whisper model's segments of `file_path` as they decode."""
+    model = get_faster_whisper_model(request.app)
+    segments, info = model.transcribe(
+        file_path,
+        beam_size=5,
+        vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
+        language=language,
+    )
+    log.info(
+        "Detected language '%s' with probability %f"
+        % (info.language, info.language_probability)
+    )
+    yield from segments
 
-        sf.write(file_path, speech["audio"], samplerate=speech["sampling_rate"])
 
-        async with aiofiles.open(file_body_path, "w") as f:
-            await f.write(json.dumps(payload))
+def save_local_transcript(file_path, transcript: str) -> dict:
+    data = {"text": transcript.strip()}
 
-        return FileResponse(file_path)
+    # save the transcript to a json file next to the audio
+    filename = os.path.basename(file_path)
+    id = filename.split(".")[0]
+    transcript_file = f"{os.path.dirname(file_path)}/{id}.json"
+    with open(transcript_file, "w") as f:
+        json.dump(data, f)
+
+    log.debug(data)
+    return data
 
 
 def transcription_handler(request, file_path, metadata):
@@ -555,33 +850,11 @@ def transcription_handler(request, file_path, metadata):
     ]
 
     if request.app.state.config.STT_ENGINE == "":
-        if request.app.state.faster_whisper_model is None:
-            request.app.state.faster_whisper_model = set_faster_whisper_model(
-                request.app.state.config.WHISPER_MODEL
-            )
-
-        model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
-            file_path,
-            beam_size=5,
-            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
-            language=languages[0],
+        transcript = "".join(
+            segment.text
+            for segment in transcribe_segments(request, file_path, languages[0])
         )
-        log.info(
-            "Detected language '%s' with probability %f"
-            % (info.language, info.language_probability)
-        )
-
-        transcript = "".join([segment.text for segment in list(segments)])
-        data = {"text": transcript.strip()}
-
-        # save the transcript to a json file
-        transcript_file = f"{file_dir}/{id}.json"
-        with open(transcript_file, "w") as f:
-            json.dump(data, f)
-
-        log.debug(data)
-        return data
+        return save_local_transcript(file_path, transcript)
     elif request.app.state.config.STT_ENGINE == "openai":
         r = None
         try:
@@ -825,31 +1098,29 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
     if is_audio_conversion_required(file_path):
         file_path = convert_audio_to_mp3(file_path)
 
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
-
-    # Always produce a list of chunk paths (could be one entry if small)
-    try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
-    except Exception as e:
-        log.exception(e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
-
+    # Chunks are transcribed while the next ones are still being cut
+    chunk_paths = []
     results = []
     try:
         with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(transcription_handler, request, chunk_path, metadata)
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
+            futures = []
+            try:
+                for chunk_path in split_audio(file_path, MAX_FILE_SIZE):
+                    chunk_paths.append(chunk_path)
+                    futures.append(
+                        executor.submit(
+                            transcription_handler, request, chunk_path, metadata
+                        )
+                    )
+            except Exception as e:
+                log.exception(e)
+                for future in futures:
+                    future.cancel()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=ERROR_MESSAGES.DEFAULT(e),
+                )
+
             for future in futures:
                 try:
                     results.append(future.result())
@@ -872,66 +1143,223 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
     }
 
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
+# Chunks are re-encoded for transcription as mono 16 kHz mp3 at this bitrate
+CHUNK_BITRATE_KBPS = 32
+CHUNK_SAMPLE_RATE = 16000
 
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
+# Chunks are cut in the middle of a pause of at least this length and volume
+SILENCE_MIN_DURATION = 0.4
+SILENCE_THRESHOLD_DB = -35
 
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
 
-        return compressed_path
-    else:
-        return file_path
+def transcribe_stream(
+    request: Request, file_path: str, metadata: Optional[dict] = None
+):
+    """
+    Yield the transcript of `file_path` in parts whose concatenation is the
+    full text: one per segment as the local whisper model decodes it, one
+    per audio chunk for the other engines.
+    """
+    log.info(f"transcribe_stream: {file_path} {metadata}")
+
+    if request.app.state.config.STT_ENGINE == "":
+        metadata = metadata or {}
+        language = (
+            metadata.get("language", None) if not WHISPER_LANGUAGE else WHISPER_LANGUAGE
+        )
+        parts = []
+        for segment in transcribe_segments(request, file_path, language):
+            parts.append(segment.text)
+            yield segment.text
+        # The same transcript file as transcription_handler leaves behind
+        save_local_transcript(file_path, "".join(parts))
+        return
+
+    if is_audio_conversion_required(file_path):
+        file_path = convert_audio_to_mp3(file_path)
+
+    separator = ""
+    for chunk_path in split_audio(file_path, MAX_FILE_SIZE):
+        try:
+            result = transcription_handler(request, chunk_path, metadata)
+        finally:
+            if chunk_path != file_path and os.path.isfile(chunk_path):
+                os.remove(chunk_path)
+
+        yield separator + result["text"]
+        separator = " "
+
+
+def encode_audio_chunk(file_path, chunk_path, start=0.0, end=None):
+    args = ["-ss", f"{start:.3f}", "-i", file_path]
+    if end is not None:
+        args += ["-t", f"{end - start:.3f}"]
+    run_ffmpeg(
+        *args,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(CHUNK_SAMPLE_RATE),
+        "-b:a",
+        f"{CHUNK_BITRATE_KBPS}k",
+        "-f",
+        "mp3",
+        chunk_path,
+    )
+
+
+def detect_silences(file_path):
+    """
+    Yield (start, end) of the pauses in `file_path` while ffmpeg's
+    silencedetect filter streams through the file.
+    """
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-hide_banner",
+            "-i",
+            file_path,
+            "-vn",
+            "-af",
+            f"silencedetect=noise={SILENCE_THRESHOLD_DB}dB:d={SILENCE_MIN_DURATION}",
+            "-f",
+            "null",
+            "-",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        silence_start = None
+        for line in process.stderr:
+            if match := re.search(r"silence_start: (-?[\d.]+)", line):
+                silence_start = max(float(match.group(1)), 0.0)
+            elif silence_start is not None and (
+                match := re.search(r"silence_end: ([\d.]+)", line)
+            ):
+                yield silence_start, float(match.group(1))
+                silence_start = None
+    finally:
+        process.stderr.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
 
 
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
+def plan_audio_chunks(silences, max_duration, duration=None):
     """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
+    Yield (start, end) of consecutive chunks of at most `max_duration`
+    seconds, cutting in the middle of the last pause in the second half of
+    each chunk when there is one. The last chunk ends at None (end of file).
+    Chunks are planned while `silences` is still being produced.
     """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+    start = 0.0
+    cut = None
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+    def next_chunk():
+        nonlocal start, cut
+        end = cut if cut is not None else start + max_duration
+        chunk = (start, end)
+        start, cut = end, None
+        return chunk
+
+    for silence_start, silence_end in silences:
+        midpoint = (silence_start + silence_end) / 2
+        while midpoint > start + max_duration:
+            yield next_chunk()
+
+        if midpoint - start >= max_duration / 2:
+            cut = midpoint
+
+    while duration is not None and duration - start > max_duration:
+        yield next_chunk()
+
+    yield start, None
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
 
+def split_audio(file_path, max_bytes):
+    """
+    Yield chunk file paths not exceeding max_bytes, each as soon as it is
+    encoded. If the audio fits, only the original path is yielded.
+
+    ffmpeg streams through the file to find pauses, and each chunk is cut
+    at a pause and encoded once at CHUNK_BITRATE_KBPS. The audio is never
+    decoded into memory.
+    """
+    if os.path.getsize(file_path) <= max_bytes:
+        yield file_path  # Nothing to split
+        return
+
+    # Leave 5% headroom for mp3 framing and container overhead
+    max_duration = max_bytes * 0.95 / (CHUNK_BITRATE_KBPS * 1000 / 8)
     base, _ = os.path.splitext(file_path)
 
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+    from pydub.utils import mediainfo
+
+    try:
+        duration = float(mediainfo(file_path).get("duration"))
+    except Exception:
+        duration = None
+
+    # Encoded size of a second of audio, a chunk of less than a tenth of a
+    # second only holds the mp3 headers
+    bytes_per_second = CHUNK_BITRATE_KBPS * 1000 / 8
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+    def encode(i, start, end):
+        chunk_path = f"{base}_chunk_{i}.mp3"
+        encode_audio_chunk(file_path, chunk_path, start, end)
 
-        if os.path.getsize(chunk_path) > max_bytes:
+        size = os.path.getsize(chunk_path)
+        if size > max_bytes:
             os.remove(chunk_path)
             raise Exception("Audio chunk cannot be reduced below max file size.")
 
-        chunks.append(chunk_path)
-        start = end
+        log.debug(f"Encoded audio chunk {chunk_path} starting at {start:.1f}s")
+        return chunk_path, size
+
+    i = 0
+    for start, end in plan_audio_chunks(
+        detect_silences(file_path), max_duration, duration
+    ):
+        if end is None and duration is None:
+            # Without the duration, the rest may not fit in one chunk. Cut it
+            # every max_duration seconds until a chunk comes out short.
+            while True:
+                chunk_path, size = encode(i, start, start + max_duration)
+                i += 1
+                if size < bytes_per_second / 10:
+                    os.remove(chunk_path)
+                    return
+
+                yield chunk_path
+                if size < max_duration * bytes_per_second * 0.9:
+                    return
+                start += max_duration
+
+        chunk_path, _ = encode(i, start, end)
         i += 1
+        yield chunk_path
 
-    return chunks
+
+def transcription_event_stream(request, file_path, metadata):
+    parts = []
+    try:
+        for text in transcribe_stream(request, file_path, metadata):
+            parts.append(text)
+            yield f"data: {json.dumps({'text': text})}\n\n"
+
+        result = {
+            "text": "".join(parts).strip(),
+            "filename": os.path.basename(file_path),
+            "done": True,
+        }
+        yield f"data: {json.dumps(result)}\n\n"
+    except Exception as e:
+        log.exception(e)
+        yield f"data: {json.dumps({'error': ERROR_MESSAGES.DEFAULT(e), 'done': True})}\n\n"
 
 
 @router.post("/transcriptions")
@@ -939,6 +1367,7 @@ def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     log.info(f"file.content_type: {file.content_type}")
@@ -981,6 +1410,12 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
+            if stream:
+                return StreamingResponse(
+                    transcription_event_stream(request, file_path, metadata),
+                    media_type="text/event-stream",
+                )
+
             result = transcribe(request, file_path, metadata)
 
             return {
@@ -56,9 +56,6 @@ from typing import Optional, List
 
 from ssl import CERT_NONE, CERT_REQUIRED, PROTOCOL_TLS
 
-from ldap3 import Server, Connection, NONE, Tls
-from ldap3.utils.conv import escape_filter_chars
-
 router = APIRouter()
 
 log = logging.getLogger(__name__)
@@ -209,6 +206,9 @@ async def ldap_auth(request: Request, response: Response, form_data: LdapForm):
     if not ENABLE_LDAP:
         raise HTTPException(400, detail="LDAP authentication is not enabled")
 
+    from ldap3 import Server, Connection, NONE, Tls
+    from ldap3.utils.conv import escape_filter_chars
+
     try:
         tls = Tls(
             validate=LDAP_VALIDATE_CERT,
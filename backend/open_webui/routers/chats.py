@@ -1,12 +1,14 @@
 import json
 import logging
-from typing import Optional
+import zlib
+from typing import Iterator, Optional
 
 
 from open_webui.socket.main import get_event_emitter
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
+    ChatModel,
     ChatResponse,
     Chats,
     ChatTitleIdResponse,
@@ -16,19 +18,84 @@ from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import SRC_LOG_LEVELS
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import BaseModel
+from open_webui.env import CHAT_IMPORT_BATCH_SIZE, SRC_LOG_LEVELS
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.pagination import NEXT_CURSOR_HEADER
+from open_webui.utils.streaming import (
+    STREAM_FORMATS,
+    encode_stream,
+    gzip_stream,
+    iter_ndjson,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def stream_chats(
+    chats: Iterator[ChatModel], filename: str, format: str, gzip: bool
+) -> StreamingResponse:
+    """
+    Stream `chats` as a JSON array or as NDJSON, optionally as a gzip file
+    download. Chats are serialized one by one as the response is written.
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                f"format must be one of {', '.join(STREAM_FORMATS)}"
+            ),
+        )
+
+    chunks = encode_stream(
+        (ChatResponse(**chat.model_dump()).model_dump_json() for chat in chats),
+        format,
+    )
+    if not gzip:
+        return StreamingResponse(chunks, media_type=STREAM_FORMATS[format])
+
+    return StreamingResponse(
+        gzip_stream(chunks),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}.gz"'
+        },
+    )
+
+
+def insert_missing_tags(tags: list[str], user_id: str):
+    for tag_id in tags:
+        tag_id = tag_id.replace(" ", "_").lower()
+        tag_name = " ".join([word.capitalize() for word in tag_id.split("_")])
+        if (
+            tag_id != "none"
+            and Tags.get_tag_by_name_and_user_id(tag_name, user_id) is None
+        ):
+            Tags.insert_new_tag(tag_name, user_id)
+
+
 ############################
 # GetChatList
 ############################
@@ -37,18 +104,24 @@ router = APIRouter()
 @router.get("/", response_model=list[ChatTitleIdResponse])
 @router.get("/list", response_model=list[ChatTitleIdResponse])
 def get_session_user_chat_list(
-    user=Depends(get_verified_user), page: Optional[int] = None
+    response: Response,
+    user=Depends(get_verified_user),
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
     try:
-        if page is not None:
+        if page is not None or cursor is not None:
             limit = 60
-            skip = (page - 1) * limit
+            skip = (page - 1) * limit if page else 0
 
-            return Chats.get_chat_title_id_list_by_user_id(
-                user.id, skip=skip, limit=limit
+            chat_list, next_cursor = Chats.get_chat_title_id_list_by_user_id(
+                user.id, skip=skip, limit=limit, cursor=cursor
             )
+            set_next_cursor(response, next_cursor)
+            return chat_list
         else:
-            return Chats.get_chat_title_id_list_by_user_id(user.id)
+            chat_list, _ = Chats.get_chat_title_id_list_by_user_id(user.id)
+            return chat_list
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -142,15 +215,7 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
     try:
         chat = Chats.import_chat(user.id, form_data)
         if chat:
-            tags = chat.meta.get("tags", [])
-            for tag_id in tags:
-                tag_id = tag_id.replace(" ", "_").lower()
-                tag_name = " ".join([word.capitalize() for word in tag_id.split("_")])
-                if (
-                    tag_id != "none"
-                    and Tags.get_tag_by_name_and_user_id(tag_name, user.id) is None
-                ):
-                    Tags.insert_new_tag(tag_name, user.id)
+            insert_missing_tags(chat.meta.get("tags", []), user.id)
 
         return ChatResponse(**chat.model_dump())
     except Exception as e:
@@ -160,6 +225,59 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
         )
 
 
+############################
+# ImportChats
+############################
+
+
+class ChatBulkImportResponse(BaseModel):
+    imported: int
+    skipped: int
+
+
+@router.post("/import/bulk", response_model=ChatBulkImportResponse)
+def import_chats(file: UploadFile = File(...), user=Depends(get_verified_user)):
+    """
+    Import an NDJSON file, optionally gzipped, with one `ChatImportForm` (or
+    one exported chat) per line, e.g. the output of `/all?format=ndjson`.
+    The file is read line by line and inserted CHAT_IMPORT_BATCH_SIZE chats
+    per transaction, so a failure keeps the batches already committed. Lines
+    that aren't valid chats are skipped.
+    """
+    imported, skipped = 0, 0
+    batch, tags = [], set()
+
+    def insert_batch():
+        nonlocal imported
+        for chat in Chats.import_chats(user.id, batch):
+            tags.update(chat.meta.get("tags", []))
+        imported += len(batch)
+        batch.clear()
+
+    try:
+        for line_number, data in iter_ndjson(file.file):
+            try:
+                batch.append(ChatImportForm.model_validate(data))
+            except ValidationError:
+                log.debug(f"skipping invalid chat on line {line_number}")
+                skipped += 1
+                continue
+
+            if len(batch) >= CHAT_IMPORT_BATCH_SIZE:
+                insert_batch()
+        insert_batch()
+    except (EOFError, OSError, zlib.error) as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(f"{e}, {imported} chats were imported"),
+        )
+    finally:
+        insert_missing_tags(sorted(tags), user.id)
+
+    return ChatBulkImportResponse(imported=imported, skipped=skipped)
+
+
 ############################
 # GetChats
 ############################
@@ -167,7 +285,11 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
 
 @router.get("/search", response_model=list[ChatTitleIdResponse])
 def search_user_chats(
-    text: str, page: Optional[int] = None, user=Depends(get_verified_user)
+    response: Response,
+    text: str,
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
+    user=Depends(get_verified_user),
 ):
     if page is None:
         page = 1
@@ -175,12 +297,15 @@ def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit
+    try:
+        chat_list, next_cursor = Chats.get_chats_by_user_id_and_search_text(
+            user.id, text, skip=skip, limit=limit, cursor=cursor
         )
-    ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT(e)
+        )
+    set_next_cursor(response, next_cursor)
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -221,10 +346,7 @@ async def get_chats_by_folder_id(folder_id: str, user=Depends(get_verified_user)
 
 @router.get("/pinned", response_model=list[ChatTitleIdResponse])
 async def get_user_pinned_chats(user=Depends(get_verified_user)):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id)
-    ]
+    return Chats.get_pinned_chats_by_user_id(user.id)
 
 
 ############################
@@ -233,11 +355,12 @@ async def get_user_pinned_chats(user=Depends(get_verified_user)):
 
 
 @router.get("/all", response_model=list[ChatResponse])
-async def get_user_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id(user.id)
-    ]
+async def get_user_chats(
+    format: str = "json", gzip: bool = False, user=Depends(get_verified_user)
+):
+    return stream_chats(
+        Chats.iter_chats(user_id=user.id), "chats", format=format, gzip=gzip
+    )
 
 
 ############################
@@ -246,11 +369,15 @@ async def get_user_chats(user=Depends(get_verified_user)):
 
 
 @router.get("/all/archived", response_model=list[ChatResponse])
-async def get_user_archived_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chats_by_user_id(user.id)
-    ]
+async def get_user_archived_chats(
+    format: str = "json", gzip: bool = False, user=Depends(get_verified_user)
+):
+    return stream_chats(
+        Chats.iter_chats(user_id=user.id, archived=True),
+        "archived-chats",
+        format=format,
+        gzip=gzip,
+    )
 
 
 ############################
@@ -276,13 +403,15 @@ async def get_all_user_tags(user=Depends(get_verified_user)):
 
 
 @router.get("/all/db", response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
+async def get_all_user_chats_in_db(
+    format: str = "json", gzip: bool = False, user=Depends(get_admin_user)
+):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats()]
+    return stream_chats(Chats.iter_chats(), "all-chats", format=format, gzip=gzip)
 
 
 ############################
@@ -292,7 +421,9 @@ async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
 
 @router.get("/archived", response_model=list[ChatTitleIdResponse])
 async def get_archived_session_user_chat_list(
+    response: Response,
     page: Optional[int] = None,
+    cursor: Optional[str] = None,
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
@@ -312,16 +443,20 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
+    try:
+        chat_list, next_cursor = Chats.get_archived_chat_list_by_user_id(
             user.id,
             filter=filter,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT(e)
         )
-    ]
 
+    set_next_cursor(response, next_cursor)
     return chat_list
 
 
@@ -23,6 +23,12 @@ from open_webui.models.community import (
 )
 from open_webui.models.users import UserResponse, Users
 from open_webui.utils.auth import get_verified_user
+from open_webui.utils.community_feed import (
+    fan_out_post,
+    get_feed,
+    remove_post,
+    update_timelines_on_follow,
+)
 
 
 log = logging.getLogger(__name__)
@@ -47,6 +53,40 @@ def _get_limit(limit: Optional[int]) -> int:
     return max(1, min(50, limit))
 
 
+def _get_posts_page(
+    viewer_id: str,
+    user_id: Optional[str],
+    page: Optional[int],
+    limit: Optional[int],
+    cursor: Optional[str],
+    include_total: Optional[bool],
+) -> CommunityPostListResponse:
+    # `page` is kept for compatibility, pages after the first one are cheaper
+    # to fetch with the `next_cursor` of the previous page. The total is
+    # counted for page requests unless disabled, and on request for cursors.
+    limit = _get_limit(limit)
+    page = max(1, page or 1)
+    if include_total is None:
+        include_total = cursor is None
+
+    try:
+        posts, total, next_cursor = Posts.get_posts(
+            viewer_id=viewer_id,
+            user_id=user_id,
+            skip=(page - 1) * limit,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+    return CommunityPostListResponse(posts=posts, total=total, next_cursor=next_cursor)
+
+
 def _ensure_community_enabled(request: Request):
     if not request.app.state.config.ENABLE_COMMUNITY_SHARING:
         raise HTTPException(
@@ -66,21 +106,33 @@ async def list_posts(
     page: Optional[int] = 1,
     limit: Optional[int] = None,
     user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     user=Depends(get_verified_user),
 ):
     _ensure_community_enabled(request)
-    limit = _get_limit(limit)
-    page = max(1, page or 1)
-    skip = (page - 1) * limit
+    return _get_posts_page(user.id, user_id, page, limit, cursor, include_total)
 
-    posts, total = Posts.get_posts(
-        viewer_id=user.id,
-        user_id=user_id,
-        skip=skip,
-        limit=limit,
-    )
 
-    return CommunityPostListResponse(posts=posts, total=total)
+@router.get("/community/feed", response_model=CommunityPostListResponse)
+async def get_home_feed(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    user=Depends(get_verified_user),
+):
+    _ensure_community_enabled(request)
+    try:
+        posts, next_cursor = await get_feed(
+            request.app.state.redis, user.id, _get_limit(limit), cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+    return CommunityPostListResponse(posts=posts, next_cursor=next_cursor)
 
 
 @router.post("/community/posts", response_model=CommunityPostWithUser)
@@ -95,6 +147,8 @@ async def create_post(
         )
 
     post = Posts.create_post(form_data, user.id)
+    await fan_out_post(request.app.state.redis, post)
+
     enriched = Posts.get_post_by_id(post.id, viewer_id=user.id)
     if not enriched:
         log.error("Failed to reload community post after creation: %s", post.id)
@@ -147,6 +201,8 @@ async def delete_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
+
+    await remove_post(request.app.state.redis, post_id, user.id)
     return StatusResponse(status=True)
 
 
@@ -326,7 +382,10 @@ async def follow_user(
             detail=ERROR_MESSAGES.ACTION_PROHIBITED,
         )
 
-    Followers.follow(user.id, target_user_id)
+    if Followers.follow(user.id, target_user_id):
+        await update_timelines_on_follow(
+            request.app.state.redis, user.id, target_user_id, following=True
+        )
     follower_count, _ = Followers.get_counts(target_user_id)
     return FollowResponse(following=True, follower_count=follower_count)
 
@@ -352,7 +411,10 @@ async def unfollow_user(
             detail=ERROR_MESSAGES.ACTION_PROHIBITED,
         )
 
-    Followers.unfollow(user.id, target_user_id)
+    if Followers.unfollow(user.id, target_user_id):
+        await update_timelines_on_follow(
+            request.app.state.redis, user.id, target_user_id, following=False
+        )
     follower_count, _ = Followers.get_counts(target_user_id)
     return FollowResponse(following=False, follower_count=follower_count)
 
@@ -371,6 +433,8 @@ async def get_user_page(
     target_user_id: str,
     page: Optional[int] = 1,
     limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     user=Depends(get_verified_user),
 ):
     _ensure_community_enabled(request)
@@ -381,16 +445,7 @@ async def get_user_page(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    limit = _get_limit(limit)
-    page = max(1, page or 1)
-    skip = (page - 1) * limit
-
-    posts, total = Posts.get_posts(
-        viewer_id=user.id,
-        user_id=target_user_id,
-        skip=skip,
-        limit=limit,
-    )
+    posts = _get_posts_page(user.id, target_user_id, page, limit, cursor, include_total)
 
     follower_count, following_count = Followers.get_counts(target_user_id)
 
@@ -405,5 +460,5 @@ async def get_user_page(
 
     return CommunityUserPageResponse(
         profile=profile,
-        posts=CommunityPostListResponse(posts=posts, total=total),
+        posts=posts,
     )
@@ -1,5 +1,6 @@
 import logging
 import os
+import re
 import uuid
 import json
 from fnmatch import fnmatch
@@ -21,7 +22,8 @@ from fastapi import (
     Query,
 )
 
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
@@ -41,6 +43,7 @@ from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -101,8 +104,8 @@ def process_uploaded_file(request, file, file_path, file_item, file_metadata, us
                     else ["audio/*", "video/webm"]
                 )
             ):
-                file_path = Storage.get_file(file_path)
-                result = transcribe(request, file_path, file_metadata)
+                with Storage.local_file(file_path) as local_path:
+                    result = transcribe(request, local_path, file_metadata)
 
                 process_file(
                     request,
@@ -198,7 +201,7 @@ def upload_file_handler(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(
+        stored_file = Storage.upload_stream(
             file.file,
             filename,
             {
@@ -215,14 +218,15 @@ def upload_file_handler(
                 **{
                     "id": id,
                     "filename": name,
-                    "path": file_path,
+                    "path": stored_file.path,
                     "data": {
                         **({"status": "pending"} if process else {}),
                     },
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": stored_file.size,
+                        "sha256": stored_file.sha256,
                         "data": file_metadata,
                     },
                 }
@@ -235,7 +239,7 @@ def upload_file_handler(
                     process_uploaded_file,
                     request,
                     file,
-                    file_path,
+                    stored_file.path,
                     file_item,
                     file_metadata,
                     user,
@@ -245,7 +249,7 @@ def upload_file_handler(
                 process_uploaded_file(
                     request,
                     file,
-                    file_path,
+                    stored_file.path,
                     file_item,
                     file_metadata,
                     user,
@@ -417,6 +421,8 @@ async def get_file_process_status(
                                 event = {"status": status}
                                 if status == "failed":
                                     event["error"] = data.get("error")
+                                elif status == "processing":
+                                    event["progress"] = data.get("progress")
 
                                 yield f"data: {json.dumps(event)}\n\n"
                                 if status in ("completed", "failed"):
@@ -520,9 +526,70 @@ async def update_file_data_content_by_id(
 ############################
 
 
+def get_file_range_response(
+    request: Request, file_path: str, headers: dict, media_type: Optional[str] = None
+) -> Optional[Response]:
+    """
+    Serves a single byte range straight from remote storage, without first
+    downloading the whole file. Returns None when there is no usable Range
+    header or the file is available locally, FileResponse handles those.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", request.headers.get("range", "").strip())
+    if not match or match.groups() == ("", "") or Storage.has_local_copy(file_path):
+        return None
+
+    size = Storage.get_file_size(file_path)
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range, the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start > end or start >= size:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return StreamingResponse(
+        Storage.iter_file_range(file_path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={
+            **headers,
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
+    )
+
+
+async def get_stored_file_response(file_path: str, **kwargs) -> Optional[Response]:
+    """
+    Serves the local copy of a stored file, which stays in the storage cache
+    until it has been sent. Returns None if there is no local copy.
+    """
+    local_path = Path(await run_in_threadpool(Storage.get_file, file_path, True))
+    if not local_path.is_file():
+        Storage.release_file(file_path)
+        return None
+
+    return FileResponse(
+        local_path,
+        background=BackgroundTask(Storage.release_file, file_path),
+        **kwargs,
+    )
+
+
 @router.get("/{id}/content")
 async def get_file_content_by_id(
-    id: str, user=Depends(get_verified_user), attachment: bool = Query(False)
+    id: str,
+    request: Request,
+    user=Depends(get_verified_user),
+    attachment: bool = Query(False),
 ):
     file = Files.get_file_by_id(id)
 
@@ -538,39 +605,43 @@ async def get_file_content_by_id(
         or has_access_to_file(id, "read", user)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
-
-                content_type = file.meta.get("content_type")
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)
-                headers = {}
-
-                if attachment:
+            # Handle Unicode filenames
+            filename = file.meta.get("name", file.filename)
+            encoded_filename = quote(filename)  # RFC5987 encoding
+
+            content_type = file.meta.get("content_type")
+            filename = file.meta.get("name", file.filename)
+            encoded_filename = quote(filename)
+            headers = {}
+
+            if attachment:
+                headers["Content-Disposition"] = (
+                    f"attachment; filename*=UTF-8''{encoded_filename}"
+                )
+            else:
+                if content_type == "application/pdf" or filename.lower().endswith(
+                    ".pdf"
+                ):
+                    headers["Content-Disposition"] = (
+                        f"inline; filename*=UTF-8''{encoded_filename}"
+                    )
+                    content_type = "application/pdf"
+                elif content_type != "text/plain":
                     headers["Content-Disposition"] = (
                         f"attachment; filename*=UTF-8''{encoded_filename}"
                     )
-                else:
-                    if content_type == "application/pdf" or filename.lower().endswith(
-                        ".pdf"
-                    ):
-                        headers["Content-Disposition"] = (
-                            f"inline; filename*=UTF-8''{encoded_filename}"
-                        )
-                        content_type = "application/pdf"
-                    elif content_type != "text/plain":
-                        headers["Content-Disposition"] = (
-                            f"attachment; filename*=UTF-8''{encoded_filename}"
-                        )
-
-                return FileResponse(file_path, headers=headers, media_type=content_type)
 
+            range_response = await run_in_threadpool(
+                get_file_range_response, request, file.path, headers, content_type
+            )
+            if range_response:
+                return range_response
+
+            file_response = await get_stored_file_response(
+                file.path, headers=headers, media_type=content_type
+            )
+            if file_response:
+                return file_response
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -613,13 +684,9 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
         or has_access_to_file(id, "read", user)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                log.info(f"file_path: {file_path}")
-                return FileResponse(file_path)
+            file_response = await get_stored_file_response(file.path)
+            if file_response:
+                return file_response
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -640,7 +707,9 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 
 @router.get("/{id}/content/{file_name}")
-async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
+async def get_file_content_by_id(
+    id: str, request: Request, user=Depends(get_verified_user)
+):
     file = Files.get_file_by_id(id)
 
     if not file:
@@ -664,12 +733,15 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
         }
 
         if file_path:
-            file_path = Storage.get_file(file_path)
-            file_path = Path(file_path)
+            range_response = await run_in_threadpool(
+                get_file_range_response, request, file_path, headers
+            )
+            if range_response:
+                return range_response
 
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                return FileResponse(file_path, headers=headers)
+            file_response = await get_stored_file_response(file_path, headers=headers)
+            if file_response:
+                return file_response
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
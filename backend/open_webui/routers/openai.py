@@ -9,7 +9,6 @@ from aiocache import cached
 import requests
 from urllib.parse import quote
 
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 
 from fastapi import Depends, HTTPException, Request, APIRouter
 from fastapi.responses import (
@@ -22,9 +21,7 @@ from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from open_webui.models.models import Models
-from open_webui.config import (
-    CACHE_DIR,
-)
+from open_webui.utils.audio import SPEECH_CACHE, SPEECH_CACHE_DIR
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -199,6 +196,8 @@ def get_microsoft_entra_id_access_token():
     Returns the token string or None if authentication fails.
     """
     try:
+        from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+
         token_provider = get_bearer_token_provider(
             DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
         )
@@ -289,14 +288,12 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         body = await request.body()
         name = hashlib.sha256(body).hexdigest()
 
-        SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-        SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
         file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
         file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
 
         # Check if the file already exists in the cache
-        if file_path.is_file():
-            return FileResponse(file_path)
+        if cached_path := SPEECH_CACHE.get(name, ".mp3"):
+            return FileResponse(cached_path)
 
         url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
         key = request.app.state.config.OPENAI_API_KEYS[idx]
@@ -328,6 +325,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
             with open(file_body_path, "w") as f:
                 json.dump(json.loads(body.decode("utf-8")), f)
+            SPEECH_CACHE.add(name)
 
             # Return the saved file
             return FileResponse(file_path)
@@ -3,12 +3,15 @@ import logging
 import mimetypes
 import os
 import shutil
+import tempfile
 import asyncio
 
+import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -24,7 +27,6 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
@@ -44,7 +46,15 @@ from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
+from open_webui.retrieval.web.cache import (
+    WEB_SEARCH_COLLECTIONS,
+    cache_pages,
+    get_cached_embedding_function,
+    get_cached_pages,
+    get_content_hash,
+    normalize_url,
+)
+from open_webui.retrieval.web.utils import aget_web_loader, get_web_loader
 from open_webui.retrieval.web.brave import search_brave
 from open_webui.retrieval.web.kagi import search_kagi
 from open_webui.retrieval.web.mojeek import search_mojeek
@@ -77,6 +87,7 @@ from open_webui.retrieval.utils import (
     query_doc_with_hybrid_search,
 )
 from open_webui.utils.misc import (
+    calculate_sha256,
     calculate_sha256_string,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -87,10 +98,13 @@ from open_webui.config import (
     RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
     RAG_RERANKING_MODEL_AUTO_UPDATE,
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+    RAG_COLBERT_DOCUMENT_CACHE_SIZE,
     UPLOAD_DIR,
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    ENABLE_RAG_STREAMING_INGESTION,
+    RAG_INGESTION_BATCH_SIZE,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -153,6 +167,7 @@ def get_rf(
                 rf = ColBERT(
                     get_model_path(reranking_model, auto_update),
                     env="docker" if DOCKER else None,
+                    cache_size=RAG_COLBERT_DOCUMENT_CACHE_SIZE,
                 )
 
             except Exception as e:
@@ -273,6 +288,23 @@ class EmbeddingModelUpdateForm(BaseModel):
     embedding_batch_size: Optional[int] = 1
 
 
+@asynccontextmanager
+async def retrieval_models_lock(request: Request):
+    """
+    Hold the lock the models are loaded under (see load_retrieval_models in
+    main.py), so a background load still running with the previous settings
+    can't overwrite the models set here. Polled, as waiting for it in a thread
+    would leave it held when the request is cancelled.
+    """
+    lock = request.app.state.RETRIEVAL_MODELS_LOCK
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(0.1)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
 @router.post("/embedding/update")
 async def update_embedding_config(
     request: Request, form_data: EmbeddingModelUpdateForm, user=Depends(get_admin_user)
@@ -280,118 +312,119 @@ async def update_embedding_config(
     log.info(
         f"Updating embedding model: {request.app.state.config.RAG_EMBEDDING_MODEL} to {form_data.embedding_model}"
     )
-    if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
-        # unloads current internal embedding model and clears VRAM cache
-        request.app.state.ef = None
-        request.app.state.EMBEDDING_FUNCTION = None
-        import gc
-
-        gc.collect()
-        if DEVICE_TYPE == "cuda":
-            import torch
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-    try:
-        request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.embedding_engine
-        request.app.state.config.RAG_EMBEDDING_MODEL = form_data.embedding_model
-
-        if request.app.state.config.RAG_EMBEDDING_ENGINE in [
-            "ollama",
-            "openai",
-            "azure_openai",
-        ]:
-            if form_data.openai_config is not None:
-                request.app.state.config.RAG_OPENAI_API_BASE_URL = (
-                    form_data.openai_config.url
-                )
-                request.app.state.config.RAG_OPENAI_API_KEY = (
-                    form_data.openai_config.key
-                )
+    async with retrieval_models_lock(request):
+        if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
+            # unloads current internal embedding model and clears VRAM cache
+            request.app.state.ef = None
+            request.app.state.EMBEDDING_FUNCTION = None
+            import gc
+
+            gc.collect()
+            if DEVICE_TYPE == "cuda":
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        try:
+            request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.embedding_engine
+            request.app.state.config.RAG_EMBEDDING_MODEL = form_data.embedding_model
+
+            if request.app.state.config.RAG_EMBEDDING_ENGINE in [
+                "ollama",
+                "openai",
+                "azure_openai",
+            ]:
+                if form_data.openai_config is not None:
+                    request.app.state.config.RAG_OPENAI_API_BASE_URL = (
+                        form_data.openai_config.url
+                    )
+                    request.app.state.config.RAG_OPENAI_API_KEY = (
+                        form_data.openai_config.key
+                    )
 
-            if form_data.ollama_config is not None:
-                request.app.state.config.RAG_OLLAMA_BASE_URL = (
-                    form_data.ollama_config.url
-                )
-                request.app.state.config.RAG_OLLAMA_API_KEY = (
-                    form_data.ollama_config.key
-                )
+                if form_data.ollama_config is not None:
+                    request.app.state.config.RAG_OLLAMA_BASE_URL = (
+                        form_data.ollama_config.url
+                    )
+                    request.app.state.config.RAG_OLLAMA_API_KEY = (
+                        form_data.ollama_config.key
+                    )
 
-            if form_data.azure_openai_config is not None:
-                request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = (
-                    form_data.azure_openai_config.url
-                )
-                request.app.state.config.RAG_AZURE_OPENAI_API_KEY = (
-                    form_data.azure_openai_config.key
-                )
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = (
-                    form_data.azure_openai_config.version
+                if form_data.azure_openai_config is not None:
+                    request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = (
+                        form_data.azure_openai_config.url
+                    )
+                    request.app.state.config.RAG_AZURE_OPENAI_API_KEY = (
+                        form_data.azure_openai_config.key
+                    )
+                    request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = (
+                        form_data.azure_openai_config.version
+                    )
+
+                request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = (
+                    form_data.embedding_batch_size
                 )
 
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = (
-                form_data.embedding_batch_size
+            request.app.state.ef = get_ef(
+                request.app.state.config.RAG_EMBEDDING_ENGINE,
+                request.app.state.config.RAG_EMBEDDING_MODEL,
             )
 
-        request.app.state.ef = get_ef(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-        )
-
-        request.app.state.EMBEDDING_FUNCTION = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-        )
+            request.app.state.EMBEDDING_FUNCTION = get_embedding_function(
+                request.app.state.config.RAG_EMBEDDING_ENGINE,
+                request.app.state.config.RAG_EMBEDDING_MODEL,
+                request.app.state.ef,
+                (
+                    request.app.state.config.RAG_OPENAI_API_BASE_URL
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        request.app.state.config.RAG_OLLAMA_BASE_URL
+                        if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+                    )
+                ),
+                (
+                    request.app.state.config.RAG_OPENAI_API_KEY
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        request.app.state.config.RAG_OLLAMA_API_KEY
+                        if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+                    )
+                ),
+                request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                azure_api_version=(
+                    request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+                    else None
+                ),
+            )
 
-        return {
-            "status": True,
-            "embedding_engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-            "embedding_model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            "embedding_batch_size": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            "openai_config": {
-                "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
-                "key": request.app.state.config.RAG_OPENAI_API_KEY,
-            },
-            "ollama_config": {
-                "url": request.app.state.config.RAG_OLLAMA_BASE_URL,
-                "key": request.app.state.config.RAG_OLLAMA_API_KEY,
-            },
-            "azure_openai_config": {
-                "url": request.app.state.config.RAG_AZURE_OPENAI_BASE_URL,
-                "key": request.app.state.config.RAG_AZURE_OPENAI_API_KEY,
-                "version": request.app.state.config.RAG_AZURE_OPENAI_API_VERSION,
-            },
-        }
-    except Exception as e:
-        log.exception(f"Problem updating embedding model: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
+            return {
+                "status": True,
+                "embedding_engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+                "embedding_model": request.app.state.config.RAG_EMBEDDING_MODEL,
+                "embedding_batch_size": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                "openai_config": {
+                    "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
+                    "key": request.app.state.config.RAG_OPENAI_API_KEY,
+                },
+                "ollama_config": {
+                    "url": request.app.state.config.RAG_OLLAMA_BASE_URL,
+                    "key": request.app.state.config.RAG_OLLAMA_API_KEY,
+                },
+                "azure_openai_config": {
+                    "url": request.app.state.config.RAG_AZURE_OPENAI_BASE_URL,
+                    "key": request.app.state.config.RAG_AZURE_OPENAI_API_KEY,
+                    "version": request.app.state.config.RAG_AZURE_OPENAI_API_VERSION,
+                },
+            }
+        except Exception as e:
+            log.exception(f"Problem updating embedding model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
 
 
 @router.get("/config")
@@ -850,74 +883,75 @@ async def update_rag_config(
         else request.app.state.config.MISTRAL_OCR_API_KEY
     )
 
-    # Reranking settings
-    if request.app.state.config.RAG_RERANKING_ENGINE == "":
-        # Unloading the internal reranker and clear VRAM memory
-        request.app.state.rf = None
-        request.app.state.RERANKING_FUNCTION = None
-        import gc
-
-        gc.collect()
-        if DEVICE_TYPE == "cuda":
-            import torch
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-    request.app.state.config.RAG_RERANKING_ENGINE = (
-        form_data.RAG_RERANKING_ENGINE
-        if form_data.RAG_RERANKING_ENGINE is not None
-        else request.app.state.config.RAG_RERANKING_ENGINE
-    )
-
-    request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
-        form_data.RAG_EXTERNAL_RERANKER_URL
-        if form_data.RAG_EXTERNAL_RERANKER_URL is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
-    )
+    async with retrieval_models_lock(request):
+        # Reranking settings
+        if request.app.state.config.RAG_RERANKING_ENGINE == "":
+            # Unloading the internal reranker and clear VRAM memory
+            request.app.state.rf = None
+            request.app.state.RERANKING_FUNCTION = None
+            import gc
+
+            gc.collect()
+            if DEVICE_TYPE == "cuda":
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        request.app.state.config.RAG_RERANKING_ENGINE = (
+            form_data.RAG_RERANKING_ENGINE
+            if form_data.RAG_RERANKING_ENGINE is not None
+            else request.app.state.config.RAG_RERANKING_ENGINE
+        )
 
-    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
-        form_data.RAG_EXTERNAL_RERANKER_API_KEY
-        if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
-    )
+        request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
+            form_data.RAG_EXTERNAL_RERANKER_URL
+            if form_data.RAG_EXTERNAL_RERANKER_URL is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
+        )
 
-    log.info(
-        f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} to {form_data.RAG_RERANKING_MODEL}"
-    )
-    try:
-        request.app.state.config.RAG_RERANKING_MODEL = (
-            form_data.RAG_RERANKING_MODEL
-            if form_data.RAG_RERANKING_MODEL is not None
-            else request.app.state.config.RAG_RERANKING_MODEL
+        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
+            form_data.RAG_EXTERNAL_RERANKER_API_KEY
+            if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
         )
 
+        log.info(
+            f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} to {form_data.RAG_RERANKING_MODEL}"
+        )
         try:
-            if (
-                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
-                and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-            ):
-                request.app.state.rf = get_rf(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-                    True,
-                )
+            request.app.state.config.RAG_RERANKING_MODEL = (
+                form_data.RAG_RERANKING_MODEL
+                if form_data.RAG_RERANKING_MODEL is not None
+                else request.app.state.config.RAG_RERANKING_MODEL
+            )
 
-                request.app.state.RERANKING_FUNCTION = get_reranking_function(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.rf,
-                )
+            try:
+                if (
+                    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
+                    and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                ):
+                    request.app.state.rf = get_rf(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+                        True,
+                    )
+
+                    request.app.state.RERANKING_FUNCTION = get_reranking_function(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.rf,
+                    )
+            except Exception as e:
+                log.error(f"Error loading reranking model: {e}")
+                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
         except Exception as e:
-            log.error(f"Error loading reranking model: {e}")
-            request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
-    except Exception as e:
-        log.exception(f"Problem updating reranking model: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
+            log.exception(f"Problem updating reranking model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
 
     # Chunking settings
     request.app.state.config.TEXT_SPLITTER = (
@@ -1192,6 +1226,109 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        return text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        import tiktoken
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        return text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        md_split_docs = []
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=request.app.state.config.CHUNK_SIZE,
+                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                add_start_index=True,
+            )
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                md_split_docs.append(
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata, "headings": headings_list},
+                    )
+                )
+
+        return md_split_docs
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+def get_document_embedding_function(request: Request):
+    return get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+    )
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1201,6 +1338,7 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    embedding_function: Optional[Callable] = None,
 ) -> bool:
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
@@ -1236,74 +1374,7 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+        docs = split_docs(request, docs)
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1335,35 +1406,8 @@ def save_docs_to_vector_db(
                 return True
 
         log.info(f"generating embeddings for {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-        )
+        if embedding_function is None:
+            embedding_function = get_document_embedding_function(request)
 
         embeddings = embedding_function(
             list(map(lambda x: x.replace("\n", " "), texts)),
@@ -1395,6 +1439,92 @@ def save_docs_to_vector_db(
         raise e
 
 
+def stream_docs_to_vector_db(
+    request: Request,
+    docs: Iterable[Document],
+    collection_name: str,
+    metadata: Optional[dict] = None,
+    user=None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Split, embed and insert documents while they are being loaded. Chunks are
+    embedded and inserted in batches of RAG_INGESTION_BATCH_SIZE and nothing
+    of a batch is kept once it is inserted, so memory stays bounded by one
+    batch regardless of the document size. `metadata` is added to every
+    chunk and has to be known up front. Returns the number of inserted
+    chunks; the collection is dropped again on failure.
+    """
+    embedding_function = get_document_embedding_function(request)
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+    batch: list[Document] = []
+    pages = 0
+    chunks = 0
+
+    def insert_batch():
+        nonlocal chunks
+
+        texts = [doc.page_content for doc in batch]
+        embeddings = embedding_function(
+            list(map(lambda x: x.replace("\n", " "), texts)),
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=user,
+        )
+
+        VECTOR_DB_CLIENT.insert(
+            collection_name=collection_name,
+            items=[
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": text,
+                    "vector": embeddings[idx],
+                    "metadata": {
+                        **batch[idx].metadata,
+                        **(metadata if metadata else {}),
+                        "embedding_config": embedding_config,
+                    },
+                }
+                for idx, text in enumerate(texts)
+            ],
+        )
+
+        chunks += len(batch)
+        batch.clear()
+
+    log.info(f"streaming documents into collection {collection_name}")
+    try:
+        last_progress = 0.0
+        for doc in docs:
+            pages += 1
+            batch.extend(split_docs(request, [doc]))
+
+            if len(batch) >= RAG_INGESTION_BATCH_SIZE:
+                insert_batch()
+
+            if on_progress and time.monotonic() - last_progress >= 1:
+                last_progress = time.monotonic()
+                on_progress(pages, chunks)
+
+        if batch:
+            insert_batch()
+    except Exception:
+        try:
+            VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+        except Exception:
+            pass
+        raise
+
+    if chunks == 0:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    log.info(f"added {chunks} items from {pages} pages to {collection_name}")
+    return chunks
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -1407,6 +1537,12 @@ def process_file(
     form_data: ProcessFileForm,
     user=Depends(get_verified_user),
 ):
+    # Stored file whose local copy is kept until the loaders are done with it
+    pinned_path = None
+    # File whose data holds streaming progress, cleared once processing ends
+    progress_file_id = None
+    # Set when the hash is known before the text content, see below
+    content_hash = None
     try:
         file = Files.get_file_by_id(form_data.file_id)
 
@@ -1476,7 +1612,8 @@ def process_file(
             # Usage: /files/
             file_path = file.path
             if file_path:
-                file_path = Storage.get_file(file_path)
+                pinned_path = file_path
+                file_path = Storage.get_file(file_path, pin=True)
                 loader = Loader(
                     engine=request.app.state.config.CONTENT_EXTRACTION_ENGINE,
                     DATALAB_MARKER_API_KEY=request.app.state.config.DATALAB_MARKER_API_KEY,
@@ -1512,23 +1649,82 @@ def process_file(
                     DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                     MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                 )
-                docs = loader.load(
-                    file.filename, file.meta.get("content_type"), file_path
-                )
+                file_metadata = {
+                    "name": file.filename,
+                    "created_by": file.user_id,
+                    "file_id": file.id,
+                    "source": file.filename,
+                }
+
+                if (
+                    ENABLE_RAG_STREAMING_INGESTION
+                    and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                    and not VECTOR_DB_CLIENT.has_collection(
+                        collection_name=collection_name
+                    )
+                ):
+                    # Every chunk is inserted with the hash, and the hash of the
+                    # text is only known once every page is read, so streamed
+                    # files are identified by the hash of the stored file
+                    content_hash = calculate_sha256(file_path, 1024 * 1024)
+                    progress_file_id = file.id
+
+                    # Page texts make up the file content, they are spooled to
+                    # disk while loading and read back once the embeddings of
+                    # the last batch are gone
+                    with tempfile.TemporaryFile("w+", encoding="utf-8") as content_file:
+
+                        def load_pages():
+                            for idx, doc in enumerate(
+                                loader.lazy_load(
+                                    file.filename,
+                                    file.meta.get("content_type"),
+                                    file_path,
+                                )
+                            ):
+                                if idx:
+                                    content_file.write(" ")
+                                content_file.write(doc.page_content)
+                                yield Document(
+                                    page_content=doc.page_content,
+                                    metadata={**doc.metadata, **file_metadata},
+                                )
+
+                        stream_docs_to_vector_db(
+                            request,
+                            load_pages(),
+                            collection_name=collection_name,
+                            metadata={
+                                "file_id": file.id,
+                                "name": file.filename,
+                                "hash": content_hash,
+                            },
+                            user=user,
+                            on_progress=lambda pages, chunks: Files.update_file_data_by_id(
+                                file.id,
+                                {
+                                    "status": "processing",
+                                    "progress": {"pages": pages, "chunks": chunks},
+                                },
+                            ),
+                        )
 
-                docs = [
-                    Document(
-                        page_content=doc.page_content,
-                        metadata={
-                            **doc.metadata,
-                            "name": file.filename,
-                            "created_by": file.user_id,
-                            "file_id": file.id,
-                            "source": file.filename,
-                        },
+                        content_file.seek(0)
+                        text_content = content_file.read()
+
+                    docs = None
+                else:
+                    docs = loader.load(
+                        file.filename, file.meta.get("content_type"), file_path
                     )
-                    for doc in docs
-                ]
+
+                    docs = [
+                        Document(
+                            page_content=doc.page_content,
+                            metadata={**doc.metadata, **file_metadata},
+                        )
+                        for doc in docs
+                    ]
             else:
                 docs = [
                     Document(
@@ -1542,14 +1738,16 @@ def process_file(
                         },
                     )
                 ]
-            text_content = " ".join([doc.page_content for doc in docs])
+
+            if docs is not None:
+                text_content = " ".join([doc.page_content for doc in docs])
 
         log.debug(f"text_content: {text_content}")
         Files.update_file_data_by_id(
             file.id,
             {"content": text_content},
         )
-        hash = calculate_sha256_string(text_content)
+        hash = content_hash or calculate_sha256_string(text_content)
         Files.update_file_hash_by_id(file.id, hash)
 
         if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
@@ -1562,19 +1760,23 @@ def process_file(
             }
         else:
             try:
-                result = save_docs_to_vector_db(
-                    request,
-                    docs=docs,
-                    collection_name=collection_name,
-                    metadata={
-                        "file_id": file.id,
-                        "name": file.filename,
-                        "hash": hash,
-                    },
-                    add=(True if form_data.collection_name else False),
-                    user=user,
-                )
-                log.info(f"added {len(docs)} items to collection {collection_name}")
+                if docs is None:
+                    # Already split, embedded and inserted while loading
+                    result = True
+                else:
+                    result = save_docs_to_vector_db(
+                        request,
+                        docs=docs,
+                        collection_name=collection_name,
+                        metadata={
+                            "file_id": file.id,
+                            "name": file.filename,
+                            "hash": hash,
+                        },
+                        add=(True if form_data.collection_name else False),
+                        user=user,
+                    )
+                    log.info(f"added {len(docs)} items to collection {collection_name}")
 
                 if result:
                     Files.update_file_metadata_by_id(
@@ -1612,6 +1814,11 @@ def process_file(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e),
             )
+    finally:
+        if progress_file_id:
+            Files.delete_file_data_keys_by_id(progress_file_id, ["progress"])
+        if pinned_path:
+            Storage.release_file(pinned_path)
 
 
 class ProcessTextForm(BaseModel):
@@ -2057,13 +2264,30 @@ async def process_web_search(
                 if hasattr(result, "snippet") and result.snippet is not None
             ]
         else:
-            loader = get_web_loader(
-                urls,
-                verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
-                requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
-                trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+            cached_pages, missing_urls = get_cached_pages(urls)
+            log.debug(f"web search pages cached: {len(cached_pages)}/{len(urls)}")
+
+            loaded_docs = []
+            if missing_urls:
+                loader = await aget_web_loader(
+                    missing_urls,
+                    verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
+                    requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
+                    trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+                    concurrent_requests=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
+                )
+                loaded_docs = await loader.aload()
+                cache_pages(loaded_docs)
+
+            # Keep the search result order regardless of where the page came from
+            order = {normalize_url(url): idx for idx, url in enumerate(urls)}
+            docs = sorted(
+                [doc for page_docs in cached_pages.values() for doc in page_docs]
+                + loaded_docs,
+                key=lambda doc: order.get(
+                    normalize_url(doc.metadata.get("source") or ""), len(urls)
+                ),
             )
-            docs = await loader.aload()
 
         urls = [
             doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
@@ -2095,15 +2319,28 @@ async def process_web_search(
                 ]
             )
 
+            content_hash = get_content_hash(docs)
+
             try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
-                    request,
-                    docs,
-                    collection_name,
-                    overwrite=True,
-                    user=user,
-                )
+                if await run_in_threadpool(
+                    WEB_SEARCH_COLLECTIONS.is_current, collection_name, content_hash
+                ):
+                    log.debug(f"reusing web search collection {collection_name}")
+                else:
+                    embedding_function = get_cached_embedding_function(
+                        f"{request.app.state.config.RAG_EMBEDDING_ENGINE}:{request.app.state.config.RAG_EMBEDDING_MODEL}",
+                        get_document_embedding_function(request),
+                    )
+                    await run_in_threadpool(
+                        save_docs_to_vector_db,
+                        request,
+                        docs,
+                        collection_name,
+                        overwrite=True,
+                        user=user,
+                        embedding_function=embedding_function,
+                    )
+                    WEB_SEARCH_COLLECTIONS.touch(collection_name, content_hash)
             except Exception as e:
                 log.debug(f"error saving docs: {e}")
 
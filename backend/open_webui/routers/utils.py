@@ -1,4 +1,3 @@
-import black
 import logging
 import markdown
 
@@ -34,6 +33,8 @@ class CodeForm(BaseModel):
 
 @router.post("/code/format")
 async def format_code(form_data: CodeForm, user=Depends(get_admin_user)):
+    import black
+
     try:
         formatted_code = black.format_str(form_data.code, mode=black.Mode())
         return {"code": formatted_code}
@@ -0,0 +1,470 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import SRC_LOG_LEVELS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+
+# Temporary files untouched for this long are left over from interrupted
+# writes, younger ones may still be written by another worker
+PART_FILE_MAX_AGE = 60 * 60
+
+cache_hits_counter = meter.create_counter(
+    name="storage.cache.hits",
+    description="Remote storage reads served from the local file cache",
+    unit="1",
+)
+cache_misses_counter = meter.create_counter(
+    name="storage.cache.misses",
+    description="Remote storage reads that downloaded the object",
+    unit="1",
+)
+cache_evictions_counter = meter.create_counter(
+    name="storage.cache.evictions",
+    description="Cached files removed to stay within the cache size",
+    unit="1",
+)
+cache_size_counter = meter.create_up_down_counter(
+    name="storage.cache.size",
+    description="Bytes held by the local file cache",
+    unit="By",
+)
+
+
+class _CacheEntry(NamedTuple):
+    etag: Optional[str]
+    path: str
+
+
+class FileCache:
+    """
+    Size-bounded read-through cache for files downloaded from remote storage
+    into `directory`.
+
+    Entries are keyed by object key and only served while the object's ETag
+    is unchanged, and concurrent reads of the same object share a single
+    download. The directory is the source of truth for the cache size and
+    the least recently used order (file mtimes), so it is enforced across
+    restarts and for every worker process sharing the directory: once the
+    files exceed `max_size` bytes the least recently used ones are deleted.
+    Files pinned by `get(..., pin=True)` hold a shared `flock` until they are
+    released, and are not deleted by any process meanwhile (on platforms
+    without `fcntl` only pins of the own process are honoured). A
+    `max_size` of 0 disables caching, every read then downloads the object
+    again.
+    """
+
+    def __init__(self, name: str, directory, max_size: int):
+        self.name = name
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+        self._entries: dict[str, _CacheEntry] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[str, Optional[str]], Future] = {}
+        # Number of readers still using the file of a key, and the file
+        # descriptor holding the shared lock for them
+        self._pins: dict[str, int] = {}
+        self._pin_fds: dict[str, Optional[int]] = {}
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and os.path.isfile(entry.path)
+
+    def get(
+        self,
+        key: str,
+        local_path: str,
+        download: Callable[[str], None],
+        get_etag: Callable[[], Optional[str]],
+        pin: bool = False,
+    ) -> str:
+        """
+        Return a local path holding the object `key`. `download(path)` writes
+        the object to `path`; `get_etag()` returns the object's current ETag
+        and is only called when caching is enabled. With `pin` the file is
+        kept until `release(key)` is called, even when the cache is full.
+        """
+        if not self.enabled:
+            download(local_path)
+            return local_path
+
+        etag = get_etag()
+        attributes = {"provider": self.name}
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry
+                and entry.etag == etag
+                and os.path.isfile(entry.path)
+                and (not pin or self._pin(key, entry.path))
+            ):
+                self._touch(entry.path)
+                self.stats["hits"] += 1
+                cache_hits_counter.add(1, attributes)
+                return entry.path
+
+            future = self._inflight.get((key, etag))
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[(key, etag)] = future
+
+        if not owner:
+            path = future.result()
+            if pin:
+                with self._lock:
+                    if not self._pin(key, path):
+                        # Deleted by another process in the meantime
+                        return self.get(key, local_path, download, get_etag, pin)
+            return path
+
+        with self._lock:
+            self.stats["misses"] += 1
+        cache_misses_counter.add(1, attributes)
+
+        tmp_path = f"{local_path}.{uuid.uuid4().hex}.part"
+        try:
+            download(tmp_path)
+            os.replace(tmp_path, local_path)
+            self._touch(local_path)
+
+            with self._lock:
+                self._entries[key] = _CacheEntry(etag, local_path)
+                if pin and not self._pin(key, local_path):
+                    raise FileNotFoundError(local_path)
+                self._evict(keep=local_path)
+
+            future.set_result(local_path)
+            return local_path
+        except Exception as e:
+            future.set_exception(e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop((key, etag), None)
+
+    def release(self, key: str) -> None:
+        """Unpin a file returned by `get(..., pin=True)`."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+                return
+
+            self._pins.pop(key, None)
+            fd = self._pin_fds.pop(key, None)
+            if fd is not None:
+                os.close(fd)
+            # Evict what was kept over the limit while pinned
+            if self._size > self.max_size:
+                self._evict()
+
+    def pop(self, key: str) -> None:
+        """Forget `key`; removing the file itself is left to the caller."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._set_size(0)
+
+    def _set_size(self, size: int) -> None:
+        cache_size_counter.add(size - self._size, {"provider": self.name})
+        self._size = size
+
+    def _touch(self, path: str) -> None:
+        # The mtime orders files for eviction in every process, set from the
+        # clock directly as file system timestamps are coarser
+        now = time.time_ns()
+        try:
+            os.utime(path, ns=(now, now))
+        except OSError:
+            pass
+
+    def _pin(self, key: str, path: str) -> bool:
+        """Pin the file of `key`, False if it was deleted meanwhile."""
+        if key not in self._pins:
+            try:
+                self._pin_fds[key] = _lock_shared(path)
+            except FileNotFoundError:
+                return False
+        self._pins[key] = self._pins.get(key, 0) + 1
+        return True
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    if entry.name.endswith(".part"):
+                        # Left over from an interrupted download
+                        if time.time() - stat.st_mtime > PART_FILE_MAX_AGE:
+                            os.remove(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        files = self._scan()
+        size = sum(file_size for _, file_size, _ in files)
+
+        pinned = {
+            os.path.abspath(self._entries[key].path)
+            for key in self._pins
+            if key in self._entries
+        }
+        if keep:
+            pinned.add(os.path.abspath(keep))
+
+        removed = set()
+        # Least recently used first, files in use stay until released
+        for _, file_size, path in sorted(files):
+            if size <= self.max_size:
+                break
+            if os.path.abspath(path) in pinned or not _remove_unlocked(path):
+                continue
+            size -= file_size
+            removed.add(os.path.abspath(path))
+
+        if removed:
+            self._entries = {
+                key: entry
+                for key, entry in self._entries.items()
+                if os.path.abspath(entry.path) not in removed
+            }
+            self.stats["evictions"] += len(removed)
+            cache_evictions_counter.add(len(removed), {"provider": self.name})
+
+        self._set_size(size)
+
+
+def _lock_shared(path: str) -> Optional[int]:
+    """
+    Open `path` with a shared lock that keeps other processes from evicting
+    it, returns the descriptor holding the lock.
+    """
+    if fcntl is None:
+        return None
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        # Evicted, or replaced by a newer download, before the lock was taken
+        if os.fstat(fd).st_ino != os.stat(path).st_ino:
+            raise FileNotFoundError(path)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _remove_unlocked(path: str) -> bool:
+    """Delete `path` unless a process holds a lock on it."""
+    try:
+        if fcntl is None:
+            os.remove(path)
+            return True
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            # Replaced by a newer download since it was scanned
+            if os.fstat(fd).st_ino != os.stat(path).st_ino:
+                return False
+            os.remove(path)
+            return True
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        return True
+    except OSError as e:
+        log.warning(f"Failed to evict cached file {path}: {e}")
+        return False
+
+
+class DirectoryCache:
+    """
+    Size- and age-bounded cache of files kept in a single directory.
+
+    An entry is the group of files sharing the stem `key` (e.g. `key.mp3` and
+    `key.json`). Files already in the directory are indexed on start-up,
+    oldest first. Entries are dropped once they are older than `max_age`
+    seconds, and the least recently used ones are deleted when the files
+    exceed `max_size` bytes. A limit of 0 disables it.
+    """
+
+    def __init__(self, name: str, directory, max_size: int, max_age: int = 0):
+        self.name = name
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+        self._entries: "OrderedDict[str, tuple[float, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _load(self) -> None:
+        entries: dict[str, tuple[float, int]] = {}
+        for path in self.directory.iterdir():
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            if path.suffix == ".part":
+                if time.time() - stat.st_mtime > PART_FILE_MAX_AGE:
+                    path.unlink(missing_ok=True)
+                continue
+
+            key = path.name.split(".", 1)[0]
+            created, size = entries.get(key, (stat.st_mtime, 0))
+            entries[key] = (min(created, stat.st_mtime), size + stat.st_size)
+
+        with self._lock:
+            for key, entry in sorted(entries.items(), key=lambda item: item[1][0]):
+                self._entries[key] = entry
+                self._add_size(entry[1])
+            self._evict()
+
+    def _files(self, key: str) -> list[Path]:
+        return [
+            path for path in self.directory.glob(f"{key}.*") if path.suffix != ".part"
+        ]
+
+    def _expired(self, created: float) -> bool:
+        return self.max_age > 0 and time.time() - created > self.max_age
+
+    def get(self, key: str, suffix: str) -> Optional[Path]:
+        """Return the cached `key{suffix}` file, or None on a miss."""
+        path = self.directory / f"{key}{suffix}"
+        attributes = {"provider": self.name}
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and path.is_file():
+                # Written by another worker process sharing the directory
+                self._entries[key] = entry = (
+                    path.stat().st_mtime,
+                    sum(p.stat().st_size for p in self._files(key)),
+                )
+                self._add_size(entry[1])
+
+            if entry is not None:
+                if not self._expired(entry[0]) and path.is_file():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    cache_hits_counter.add(1, attributes)
+                    return path
+                self._remove(key)
+
+            self.stats["misses"] += 1
+            cache_misses_counter.add(1, attributes)
+            return None
+
+    def add(self, key: str) -> None:
+        """Index the files written for `key` and evict entries over the limits."""
+        with self._lock:
+            self._discard(key)
+            files = self._files(key)
+            if not files:
+                return
+
+            size = sum(path.stat().st_size for path in files)
+            self._entries[key] = (time.time(), size)
+            self._add_size(size)
+            self._evict(keep=key)
+
+    def _add_size(self, size: int) -> None:
+        self._size += size
+        cache_size_counter.add(size, {"provider": self.name})
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._add_size(-entry[1])
+
+    def _remove(self, key: str) -> None:
+        self._discard(key)
+        for path in self._files(key):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                log.warning(f"Failed to evict cached file {path}: {e}")
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        expired = [
+            key
+            for key, (created, _) in self._entries.items()
+            if key != keep and self._expired(created)
+        ]
+        for key in expired:
+            self._remove(key)
+
+        evicted = len(expired)
+        while self.max_size > 0 and self._size > self.max_size:
+            key = next((key for key in self._entries if key != keep), None)
+            if key is None:
+                break
+            self._remove(key)
+            evicted += 1
+
+        if evicted:
+            self.stats["evictions"] += evicted
+            cache_evictions_counter.add(evicted, {"provider": self.name})
@@ -1,12 +1,15 @@
 import os
 import shutil
 import json
+import hashlib
 import logging
 import re
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple, Dict
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, NamedTuple, Tuple, Dict
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from open_webui.config import (
@@ -25,11 +28,15 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    STORAGE_CACHE_MAX_SIZE_MB,
+    STORAGE_UPLOAD_CHUNK_SIZE,
+    STORAGE_UPLOAD_MAX_CONCURRENCY,
     UPLOAD_DIR,
 )
 from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError, NotFound
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.storage.cache import FileCache
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
@@ -39,18 +46,128 @@ from open_webui.env import SRC_LOG_LEVELS
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Size of the chunks streamed back for HTTP Range reads
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class StoredFile(NamedTuple):
+    size: int
+    sha256: str
+    path: str
+
+
+class HashingReader:
+    """
+    Non-seekable, read-only wrapper around an upload that counts and hashes
+    the bytes as they are read. The first chunk is read eagerly so empty
+    uploads are rejected before anything is written to storage.
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int = STORAGE_UPLOAD_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = file.read(chunk_size)
+
+    @property
+    def empty(self) -> bool:
+        return self.size == 0 and not self._head
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._head:
+            if size is None or size < 0:
+                data = self._head + self.file.read()
+                self._head = b""
+            else:
+                data, self._head = self._head[:size], self._head[size:]
+                if len(data) < size:
+                    # Multipart uploaders treat short reads as EOF
+                    data += self.file.read(size - len(data))
+        else:
+            data = self.file.read(size)
+
+        self.size += len(data)
+        self._hash.update(data)
+        return data
+
+    def chunks(self) -> Iterator[bytes]:
+        while chunk := self.read(self.chunk_size):
+            yield chunk
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self.size
+
 
 class StorageProvider(ABC):
     @abstractmethod
-    def get_file(self, file_path: str) -> str:
+    def get_file(self, file_path: str, pin: bool = False) -> str:
+        """
+        Returns a local path of the file. With `pin` a cached copy is kept
+        until `release_file` is called.
+        """
+        pass
+
+    def release_file(self, file_path: str) -> None:
+        """Allows evicting the copy pinned by `get_file(..., pin=True)`."""
         pass
 
+    @contextmanager
+    def local_file(self, file_path: str) -> Iterator[str]:
+        """Yields a local path of the file, kept while the block runs."""
+        path = self.get_file(file_path, pin=True)
+        try:
+            yield path
+        finally:
+            self.release_file(file_path)
+
     @abstractmethod
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
     ) -> Tuple[bytes, str]:
         pass
 
+    def upload_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> StoredFile:
+        """
+        Uploads `file` in chunks without holding it in memory. Providers that
+        do not implement streaming fall back to `upload_file`.
+        """
+        contents, file_path = self.upload_file(file, filename, tags)
+        return StoredFile(
+            len(contents), hashlib.sha256(contents).hexdigest(), file_path
+        )
+
+    def has_local_copy(self, file_path: str) -> bool:
+        """Whether `get_file` can be served without downloading the file."""
+        return True
+
+    def get_file_size(self, file_path: str) -> int:
+        return os.path.getsize(self.get_file(file_path))
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        """Yields the bytes `start`..`end` (inclusive) of the file."""
+        with self.local_file(file_path) as path, open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
     @abstractmethod
     def delete_all_files(self) -> None:
         pass
@@ -74,7 +191,21 @@ class LocalStorageProvider(StorageProvider):
         return contents, file_path
 
     @staticmethod
-    def get_file(file_path: str) -> str:
+    def upload_stream(
+        file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> StoredFile:
+        """Copies the file to local storage chunk by chunk."""
+        reader = HashingReader(file)
+        if reader.empty:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        file_path = f"{UPLOAD_DIR}/{filename}"
+        with open(file_path, "wb") as f:
+            for chunk in reader.chunks():
+                f.write(chunk)
+        return StoredFile(reader.size, reader.sha256, file_path)
+
+    @staticmethod
+    def get_file(file_path: str, pin: bool = False) -> str:
         """Handles downloading of the file from local storage."""
         return file_path
 
@@ -140,6 +271,17 @@ class S3StorageProvider(StorageProvider):
         self.bucket_name = S3_BUCKET_NAME
         self.key_prefix = S3_KEY_PREFIX if S3_KEY_PREFIX else ""
 
+        # S3 rejects multipart parts smaller than 5 MiB
+        part_size = max(STORAGE_UPLOAD_CHUNK_SIZE, 5 * 1024 * 1024)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=STORAGE_UPLOAD_MAX_CONCURRENCY,
+        )
+        self.cache = FileCache(
+            "s3", UPLOAD_DIR, STORAGE_CACHE_MAX_SIZE_MB * 1024 * 1024
+        )
+
     @staticmethod
     def sanitize_tag_value(s: str) -> str:
         """Only include S3 allowed characters."""
@@ -153,38 +295,92 @@ class S3StorageProvider(StorageProvider):
         s3_key = os.path.join(self.key_prefix, filename)
         try:
             self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
-            if S3_ENABLE_TAGGING and tags:
-                sanitized_tags = {
-                    self.sanitize_tag_value(k): self.sanitize_tag_value(v)
-                    for k, v in tags.items()
-                }
-                tagging = {
-                    "TagSet": [
-                        {"Key": k, "Value": v} for k, v in sanitized_tags.items()
-                    ]
-                }
-                self.s3_client.put_object_tagging(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                    Tagging=tagging,
-                )
-            return (
-                open(file_path, "rb").read(),
-                f"s3://{self.bucket_name}/{s3_key}",
+            self._put_object_tagging(s3_key, tags)
+            with open(file_path, "rb") as f:
+                contents = f.read()
+            return contents, f"s3://{self.bucket_name}/{s3_key}"
+        except ClientError as e:
+            raise RuntimeError(f"Error uploading file to S3: {e}")
+
+    def upload_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> StoredFile:
+        """Streams the file to S3, using parallel multipart uploads for large files."""
+        reader = HashingReader(file)
+        if reader.empty:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        s3_key = os.path.join(self.key_prefix, filename)
+        try:
+            self.s3_client.upload_fileobj(
+                reader, self.bucket_name, s3_key, Config=self.transfer_config
+            )
+            self._put_object_tagging(s3_key, tags)
+            return StoredFile(
+                reader.size, reader.sha256, f"s3://{self.bucket_name}/{s3_key}"
             )
         except ClientError as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
-    def get_file(self, file_path: str) -> str:
+    def _put_object_tagging(self, s3_key: str, tags: Dict[str, str]) -> None:
+        if not (S3_ENABLE_TAGGING and tags):
+            return
+        sanitized_tags = {
+            self.sanitize_tag_value(k): self.sanitize_tag_value(v)
+            for k, v in tags.items()
+        }
+        tagging = {
+            "TagSet": [{"Key": k, "Value": v} for k, v in sanitized_tags.items()]
+        }
+        self.s3_client.put_object_tagging(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Tagging=tagging,
+        )
+
+    def get_file(self, file_path: str, pin: bool = False) -> str:
         """Handles downloading of the file from S3 storage."""
         try:
             s3_key = self._extract_s3_key(file_path)
             local_file_path = self._get_local_file_path(s3_key)
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file_path)
-            return local_file_path
+            return self.cache.get(
+                file_path,
+                local_file_path,
+                lambda path: self.s3_client.download_file(
+                    self.bucket_name, s3_key, path
+                ),
+                lambda: self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)[
+                    "ETag"
+                ],
+                pin=pin,
+            )
         except ClientError as e:
             raise RuntimeError(f"Error downloading file from S3: {e}")
 
+    def release_file(self, file_path: str) -> None:
+        self.cache.release(file_path)
+
+    def has_local_copy(self, file_path: str) -> bool:
+        return self.cache.contains(file_path)
+
+    def get_file_size(self, file_path: str) -> int:
+        try:
+            return self.s3_client.head_object(
+                Bucket=self.bucket_name, Key=self._extract_s3_key(file_path)
+            )["ContentLength"]
+        except ClientError as e:
+            raise RuntimeError(f"Error reading file from S3: {e}")
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self._extract_s3_key(file_path),
+                Range=f"bytes={start}-{end}",
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Error reading file from S3: {e}")
+        yield from response["Body"].iter_chunks(RANGE_CHUNK_SIZE)
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from S3 storage."""
         try:
@@ -193,6 +389,8 @@ class S3StorageProvider(StorageProvider):
         except ClientError as e:
             raise RuntimeError(f"Error deleting file from S3: {e}")
 
+        self.cache.pop(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -212,6 +410,8 @@ class S3StorageProvider(StorageProvider):
         except ClientError as e:
             raise RuntimeError(f"Error deleting all files from S3: {e}")
 
+        self.cache.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
@@ -237,6 +437,9 @@ class GCSStorageProvider(StorageProvider):
             # if running on a Compute Engine instance, credentials would be from Google Metadata server
             self.gcs_client = storage.Client()
         self.bucket = self.gcs_client.bucket(GCS_BUCKET_NAME)
+        self.cache = FileCache(
+            "gcs", UPLOAD_DIR, STORAGE_CACHE_MAX_SIZE_MB * 1024 * 1024
+        )
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
@@ -250,18 +453,68 @@ class GCSStorageProvider(StorageProvider):
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
-    def get_file(self, file_path: str) -> str:
+    def upload_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> StoredFile:
+        """Streams the file to GCS using a chunked resumable upload."""
+        reader = HashingReader(file)
+        if reader.empty:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        # Resumable upload chunks must be a multiple of 256 KiB
+        chunk_size = max(STORAGE_UPLOAD_CHUNK_SIZE // (256 * 1024), 1) * 256 * 1024
+        try:
+            blob = self.bucket.blob(filename, chunk_size=chunk_size)
+            blob.upload_from_file(reader)
+            return StoredFile(
+                reader.size, reader.sha256, "gs://" + self.bucket_name + "/" + filename
+            )
+        except GoogleCloudError as e:
+            raise RuntimeError(f"Error uploading file to GCS: {e}")
+
+    def get_file(self, file_path: str, pin: bool = False) -> str:
         """Handles downloading of the file from GCS storage."""
         try:
             filename = file_path.removeprefix("gs://").split("/")[1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob = self.bucket.get_blob(filename)
-            blob.download_to_filename(local_file_path)
 
-            return local_file_path
+            return self.cache.get(
+                file_path,
+                local_file_path,
+                blob.download_to_filename,
+                lambda: blob.etag,
+                pin=pin,
+            )
         except NotFound as e:
             raise RuntimeError(f"Error downloading file from GCS: {e}")
 
+    def release_file(self, file_path: str) -> None:
+        self.cache.release(file_path)
+
+    def has_local_copy(self, file_path: str) -> bool:
+        return self.cache.contains(file_path)
+
+    def _get_blob(self, file_path: str):
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        blob = self.bucket.get_blob(filename)
+        if blob is None:
+            raise RuntimeError(f"Error reading file from GCS: {filename} not found")
+        return blob
+
+    def get_file_size(self, file_path: str) -> int:
+        return self._get_blob(file_path).size
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        with self._get_blob(file_path).open("rb", chunk_size=1024 * 1024) as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from GCS storage."""
         try:
@@ -271,6 +524,8 @@ class GCSStorageProvider(StorageProvider):
         except NotFound as e:
             raise RuntimeError(f"Error deleting file from GCS: {e}")
 
+        self.cache.pop(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -285,6 +540,8 @@ class GCSStorageProvider(StorageProvider):
         except NotFound as e:
             raise RuntimeError(f"Error deleting all files from GCS: {e}")
 
+        self.cache.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
@@ -298,17 +555,24 @@ class AzureStorageProvider(StorageProvider):
         if storage_key:
             # Configure using the Azure Storage Account Endpoint and Key
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=storage_key
+                account_url=self.endpoint,
+                credential=storage_key,
+                max_block_size=STORAGE_UPLOAD_CHUNK_SIZE,
             )
         else:
             # Configure using the Azure Storage Account Endpoint and DefaultAzureCredential
             # If the key is not configured, then the DefaultAzureCredential will be used to support Managed Identity authentication
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=DefaultAzureCredential()
+                account_url=self.endpoint,
+                credential=DefaultAzureCredential(),
+                max_block_size=STORAGE_UPLOAD_CHUNK_SIZE,
             )
         self.container_client = self.blob_service_client.get_container_client(
             self.container_name
         )
+        self.cache = FileCache(
+            "azure", UPLOAD_DIR, STORAGE_CACHE_MAX_SIZE_MB * 1024 * 1024
+        )
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
@@ -322,18 +586,74 @@ class AzureStorageProvider(StorageProvider):
         except Exception as e:
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
-    def get_file(self, file_path: str) -> str:
+    def upload_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> StoredFile:
+        """Streams the file to Azure Blob Storage as blocks uploaded in parallel."""
+        reader = HashingReader(file)
+        if reader.empty:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        try:
+            blob_client = self.container_client.get_blob_client(filename)
+            blob_client.upload_blob(
+                reader,
+                overwrite=True,
+                max_concurrency=STORAGE_UPLOAD_MAX_CONCURRENCY,
+            )
+            return StoredFile(
+                reader.size,
+                reader.sha256,
+                f"{self.endpoint}/{self.container_name}/{filename}",
+            )
+        except Exception as e:
+            raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
+
+    def get_file(self, file_path: str, pin: bool = False) -> str:
         """Handles downloading of the file from Azure Blob Storage."""
         try:
             filename = file_path.split("/")[-1]
             local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob_client = self.container_client.get_blob_client(filename)
-            with open(local_file_path, "wb") as download_file:
-                download_file.write(blob_client.download_blob().readall())
-            return local_file_path
+
+            def download(path: str):
+                with open(path, "wb") as download_file:
+                    blob_client.download_blob().readinto(download_file)
+
+            return self.cache.get(
+                file_path,
+                local_file_path,
+                download,
+                lambda: blob_client.get_blob_properties().etag,
+                pin=pin,
+            )
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error downloading file from Azure Blob Storage: {e}")
 
+    def release_file(self, file_path: str) -> None:
+        self.cache.release(file_path)
+
+    def has_local_copy(self, file_path: str) -> bool:
+        return self.cache.contains(file_path)
+
+    def get_file_size(self, file_path: str) -> int:
+        try:
+            blob_client = self.container_client.get_blob_client(
+                file_path.split("/")[-1]
+            )
+            return blob_client.get_blob_properties().size
+        except ResourceNotFoundError as e:
+            raise RuntimeError(f"Error reading file from Azure Blob Storage: {e}")
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        try:
+            blob_client = self.container_client.get_blob_client(
+                file_path.split("/")[-1]
+            )
+            downloader = blob_client.download_blob(offset=start, length=end - start + 1)
+        except ResourceNotFoundError as e:
+            raise RuntimeError(f"Error reading file from Azure Blob Storage: {e}")
+        yield from downloader.chunks()
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from Azure Blob Storage."""
         try:
@@ -343,6 +663,8 @@ class AzureStorageProvider(StorageProvider):
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error deleting file from Azure Blob Storage: {e}")
 
+        self.cache.pop(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -355,6 +677,8 @@ class AzureStorageProvider(StorageProvider):
         except Exception as e:
             raise RuntimeError(f"Error deleting all files from Azure Blob Storage: {e}")
 
+        self.cache.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
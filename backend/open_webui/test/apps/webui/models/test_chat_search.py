@@ -0,0 +1,120 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from open_webui.internal.db import get_db, run_migrations
+from open_webui.models.chats import ChatForm, Chats
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    run_migrations(raise_errors=True)
+
+
+@pytest.fixture
+def user_id():
+    return f"user-{uuid.uuid4()}"
+
+
+def new_chat(user_id: str, title: str, *messages: str):
+    return Chats.insert_new_chat(
+        user_id,
+        ChatForm(
+            chat={
+                "title": title,
+                "messages": [
+                    {"role": "user", "content": message} for message in messages
+                ],
+            }
+        ),
+    )
+
+
+def search(user_id: str, search_text: str):
+    chats, _ = Chats.get_chats_by_user_id_and_search_text(user_id, search_text)
+    return chats
+
+
+def get_index_row(chat_id: str):
+    with get_db() as db:
+        return db.execute(
+            text("SELECT title, content FROM chat_search WHERE chat_id = :chat_id"),
+            {"chat_id": chat_id},
+        ).first()
+
+
+def test_uses_the_search_index():
+    with get_db() as db:
+        assert Chats.has_search_index(db)
+
+
+def test_insert_update_and_delete_keep_the_index_in_sync(user_id):
+    chat = new_chat(user_id, "Travel plans", "Book the train to Lisbon")
+
+    assert tuple(get_index_row(chat.id)) == (
+        "Travel plans",
+        "Book the train to Lisbon",
+    )
+    assert [c.id for c in search(user_id, "lisbon")] == [chat.id]
+
+    Chats.update_chat_by_id(
+        chat.id,
+        {"title": "Travel plans", "messages": [{"content": "Fly to Porto"}]},
+    )
+
+    assert get_index_row(chat.id).content == "Fly to Porto"
+    assert search(user_id, "lisbon") == []
+    assert [c.id for c in search(user_id, "porto")] == [chat.id]
+
+    Chats.delete_chat_by_id(chat.id)
+
+    assert get_index_row(chat.id) is None
+    assert search(user_id, "porto") == []
+
+
+def test_matches_every_term(user_id):
+    chat = new_chat(user_id, "Recipes", "Sourdough starter feeding schedule")
+    new_chat(user_id, "Recipes", "Pancakes")
+
+    assert [c.id for c in search(user_id, "sourd sched")] == [chat.id]
+    assert [c.id for c in search(user_id, "dough")] == [chat.id]
+    assert search(user_id, "sourd pancake") == []
+
+
+def test_finds_words_in_text_without_spaces(user_id):
+    chat = new_chat(user_id, "编程", "我喜欢用Python写代码")
+    new_chat(user_id, "Other", "Something else")
+
+    assert [c.id for c in search(user_id, "python")] == [chat.id]
+    # Shorter than a trigram, searched without the index
+    assert [c.id for c in search(user_id, "代码")] == [chat.id]
+    assert [c.id for c in search(user_id, "写代码")] == [chat.id]
+    assert [c.id for c in search(user_id, "喜欢用python")] == [chat.id]
+    assert search(user_id, "代数") == []
+
+
+def test_searches_only_the_users_chats(user_id):
+    new_chat(f"user-{uuid.uuid4()}", "Quarterly report", "numbers")
+
+    assert search(user_id, "quarterly") == []
+
+
+def test_ranks_title_matches_first(user_id):
+    in_content = new_chat(user_id, "Notes", "Something about kubernetes")
+    in_title = new_chat(user_id, "Kubernetes upgrade", "Steps")
+
+    assert [c.id for c in search(user_id, "kubernetes")] == [
+        in_title.id,
+        in_content.id,
+    ]
+
+
+def test_snippets_mark_matches_and_escape_html(user_id):
+    chat = new_chat(user_id, "Markup", "Wrap it in <b>bold</b> & done")
+
+    [result] = search(user_id, "bold")
+
+    assert result.id == chat.id
+    assert "&lt;b&gt;<mark>bold</mark>&lt;/b&gt; &amp; done" in result.snippet
+    assert "<b>" not in result.snippet
@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from open_webui.internal.db import get_db, run_migrations
+from open_webui.models.community import (
+    CommunityCommentForm,
+    CommunityPostForm,
+    CommunityUserStats,
+    Comments,
+    Followers,
+    Likes,
+    Posts,
+    _update_user_stats,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    run_migrations(raise_errors=True)
+
+
+def new_user_id() -> str:
+    return f"user-{uuid.uuid4()}"
+
+
+def new_post(user_id: str):
+    return Posts.create_post(CommunityPostForm(content="hello"), user_id)
+
+
+def get_counts(post_id: str) -> tuple[int, int]:
+    post = Posts.get_post_by_id(post_id)
+    return post.like_count, post.comment_count
+
+
+def test_likes_keep_the_like_count_in_step():
+    post = new_post(new_user_id())
+    first, second = new_user_id(), new_user_id()
+
+    assert Likes.like_post(post.id, first)
+    assert not Likes.like_post(post.id, first)
+    assert Likes.like_post(post.id, second)
+    assert get_counts(post.id) == (2, 0)
+    assert Likes.get_like_count(post.id) == 2
+
+    assert Likes.unlike_post(post.id, first)
+    assert not Likes.unlike_post(post.id, first)
+    assert get_counts(post.id) == (1, 0)
+
+
+def test_comments_keep_the_comment_count_in_step():
+    post = new_post(new_user_id())
+    user_id = new_user_id()
+
+    first = Comments.create_comment(post.id, CommunityCommentForm(content="a"), user_id)
+    Comments.create_comment(post.id, CommunityCommentForm(content="b"), user_id)
+    assert get_counts(post.id) == (0, 2)
+
+    # Only the author can delete a comment, and only once
+    assert not Comments.delete_comment(first.id, new_user_id())
+    assert Comments.delete_comment(first.id, user_id)
+    assert not Comments.delete_comment(first.id, user_id)
+    assert get_counts(post.id) == (0, 1)
+
+
+def test_follows_keep_the_user_stats_in_step():
+    user_id, first, second = new_user_id(), new_user_id(), new_user_id()
+    assert Followers.get_counts(user_id) == (0, 0)
+
+    assert Followers.follow(first, user_id)
+    assert not Followers.follow(first, user_id)
+    assert not Followers.follow(user_id, user_id)
+    assert Followers.follow(second, user_id)
+    assert Followers.follow(user_id, first)
+
+    assert Followers.get_counts(user_id) == (2, 1)
+    assert Followers.get_counts(first) == (1, 1)
+    assert Followers.get_follower_counts([user_id, second]) == {
+        user_id: 2,
+        second: 0,
+    }
+
+    assert Followers.unfollow(first, user_id)
+    assert not Followers.unfollow(first, user_id)
+    assert Followers.get_counts(user_id) == (1, 1)
+    assert Followers.get_counts(first) == (1, 0)
+
+
+def test_user_stats_created_concurrently_are_updated():
+    user_id = new_user_id()
+
+    with get_db() as db:
+        begin_nested = db.begin_nested
+
+        def create_then_begin_nested():
+            # Another follow creates the row after the update found none
+            db.execute(
+                insert(CommunityUserStats).values(
+                    user_id=user_id, follower_count=2, following_count=1
+                )
+            )
+            return begin_nested()
+
+        db.begin_nested = create_then_begin_nested
+        _update_user_stats(db, user_id, follower_delta=1)
+        db.commit()
+
+    assert Followers.get_counts(user_id) == (3, 1)
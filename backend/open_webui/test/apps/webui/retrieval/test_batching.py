@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_webui.retrieval.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    def test_merges_concurrent_requests(self):
+        calls = []
+        barrier = threading.Event()
+
+        def fn(items, key):
+            calls.append((list(items), key))
+            barrier.wait(1)
+            return [f"{key}:{item}" for item in items]
+
+        batcher = MicroBatcher(fn, name="test", window_ms=50, max_batch_size=100)
+
+        with ThreadPoolExecutor(8) as executor:
+            futures = [
+                executor.submit(batcher.submit, [i, i + 100], "p") for i in range(8)
+            ]
+            time.sleep(0.1)
+            barrier.set()
+            results = [f.result() for f in futures]
+
+        for i, result in enumerate(results):
+            assert result == [f"p:{i}", f"p:{i + 100}"]
+        assert len(calls) < 8
+        assert batcher.stats["requests"] == 8
+        assert batcher.stats["items"] == 16
+
+    def test_keys_are_not_merged(self):
+        calls = []
+
+        def fn(items, key):
+            calls.append(key)
+            return [key for _ in items]
+
+        batcher = MicroBatcher(fn, name="test", window_ms=50, max_batch_size=100)
+
+        with ThreadPoolExecutor(4) as executor:
+            futures = [
+                executor.submit(batcher.submit, ["a"], key)
+                for key in ["x", "y", "x", "y"]
+            ]
+            results = [f.result() for f in futures]
+
+        assert results == [["x"], ["y"], ["x"], ["y"]]
+        assert set(calls) == {"x", "y"}
+
+    def test_large_request_bypasses_queue(self):
+        batcher = MicroBatcher(
+            lambda items, key: [item * 2 for item in items],
+            name="test",
+            max_batch_size=4,
+        )
+
+        assert batcher.submit([1, 2, 3, 4, 5]) == [2, 4, 6, 8, 10]
+        assert batcher._worker is None
+
+    def test_errors_propagate_to_callers(self):
+        def fn(items, key):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(fn, name="test", window_ms=1)
+
+        with pytest.raises(ValueError):
+            batcher.submit(["a"])
+
+    def test_worker_exits_when_idle(self):
+        batcher = MicroBatcher(
+            lambda items, key: items, name="test", window_ms=1, idle_timeout=0.05
+        )
+
+        assert batcher.submit(["a"]) == ["a"]
+        time.sleep(0.2)
+        assert batcher._worker is None
+        assert batcher.submit(["b"]) == ["b"]
+
+    # The worker thread dies with the SystemExit, which pytest reports
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_worker_death_does_not_block_submit(self):
+        calls = []
+
+        def fn(items, key):
+            calls.append(items)
+            if len(calls) == 1:
+                raise SystemExit("worker killed")
+            return items
+
+        batcher = MicroBatcher(fn, name="test", window_ms=1)
+
+        with pytest.raises(SystemExit):
+            batcher.submit(["a"])
+        assert batcher.submit(["b"]) == ["b"]
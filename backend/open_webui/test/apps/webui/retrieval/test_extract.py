@@ -0,0 +1,45 @@
+import pytest
+
+from open_webui.retrieval.web.extract import extract_text, is_available
+
+HTML = """
+<html lang="en">
+  <head>
+    <title>Example page</title>
+    <meta name="description" content="A short description">
+    <style>body { color: red; }</style>
+    <script>var tracking = true;</script>
+  </head>
+  <body>
+    <h1>Heading</h1>
+    <p>Visible <b>text</b></p>
+    <noscript>Enable JavaScript</noscript>
+  </body>
+</html>
+"""
+
+
+@pytest.mark.parametrize("extractor", ["beautifulsoup", "lxml", "selectolax"])
+def test_extract_text(extractor):
+    if not is_available(extractor):
+        pytest.skip(f"{extractor} is not installed")
+
+    text, metadata = extract_text(HTML, "https://example.com", extractor=extractor)
+
+    assert "Heading" in text and "Visible text" in text
+    assert "tracking" not in text and "color" not in text
+    assert "JavaScript" not in text
+    assert metadata == {
+        "source": "https://example.com",
+        "title": "Example page",
+        "description": "A short description",
+        "language": "en",
+    }
+
+
+def test_extract_text_without_head():
+    text, metadata = extract_text("<p>Only text</p>", "https://example.com")
+
+    assert text.strip() == "Only text"
+    assert metadata["source"] == "https://example.com"
+    assert "title" not in metadata
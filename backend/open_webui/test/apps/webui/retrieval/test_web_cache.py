@@ -0,0 +1,116 @@
+import time
+
+import fakeredis
+import pytest
+
+from open_webui.retrieval.web import cache
+from open_webui.retrieval.web.cache import WebSearchCollections
+
+
+class FakeVectorDB:
+    def __init__(self, *names):
+        self.names = set(names)
+
+    def has_collection(self, collection_name):
+        return collection_name in self.names
+
+    def delete_collection(self, collection_name):
+        self.names.discard(collection_name)
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    vector_db = FakeVectorDB("web-search-a", "web-search-b")
+    monkeypatch.setattr(cache, "VECTOR_DB_CLIENT", vector_db)
+    return vector_db
+
+
+class TestWebSearchCollections:
+    def test_reads_keep_collections(self):
+        collections = WebSearchCollections()
+        collections.touch("web-search-a", "hash-a")
+        collections.touch("web-search-b", "hash-b")
+        for name in ["web-search-a", "web-search-b"]:
+            collections._collections[name] = (time.time() - 120, f"hash-{name[-1]}")
+
+        collections.mark_used("web-search-a")
+        # Not created by a web search, nothing to keep
+        collections.mark_used("file-1")
+
+        assert collections.pop_expired(60) == ["web-search-b"]
+        assert collections._collections["web-search-a"][1] == "hash-a"
+        assert "file-1" not in collections._collections
+
+
+class TestSharedWebSearchCollections:
+    @pytest.fixture
+    def redis(self):
+        return fakeredis.FakeRedis(decode_responses=True)
+
+    def age(self, collections, name, seconds):
+        collections._redis.zadd(
+            collections._last_used_key, {name: time.time() - seconds}
+        )
+
+    def test_workers_share_last_use(self, redis, vector_db):
+        creator = WebSearchCollections(redis)
+        reader = WebSearchCollections(redis)
+        creator.touch("web-search-a", "hash-a")
+        creator.touch("web-search-b", "hash-b")
+        self.age(creator, "web-search-a", 120)
+        self.age(creator, "web-search-b", 120)
+
+        # Used by a worker that did not create it
+        reader.mark_used("web-search-a")
+        reader.mark_used("file-1")
+
+        assert reader.cleanup(60) == 1
+        assert vector_db.names == {"web-search-a"}
+        assert creator.is_current("web-search-a", "hash-a")
+        assert not creator.is_current("web-search-b", "hash-b")
+        assert not redis.zscore(creator._last_used_key, "file-1")
+
+    def test_state_survives_restarts(self, redis, vector_db):
+        WebSearchCollections(redis).touch("web-search-a", "hash-a")
+
+        collections = WebSearchCollections(redis)
+        assert collections.is_current("web-search-a", "hash-a")
+        assert not collections.is_current("web-search-a", "hash-other")
+
+        self.age(collections, "web-search-a", 120)
+        assert collections.cleanup(60) == 1
+        assert "web-search-a" not in vector_db.names
+
+    def test_keeps_collections_recreated_after_expiry(self, redis, vector_db):
+        collections = WebSearchCollections(redis)
+        collections.touch("web-search-a", "hash-a")
+        self.age(collections, "web-search-a", 120)
+
+        pop_expired = collections.pop_expired
+
+        def recreate_after_pop(ttl):
+            expired = pop_expired(ttl)
+            WebSearchCollections(redis).touch("web-search-a", "hash-a")
+            return expired
+
+        collections.pop_expired = recreate_after_pop
+
+        assert collections.cleanup(60) == 0
+        assert "web-search-a" in vector_db.names
+        assert collections.is_current("web-search-a", "hash-a")
+
+
+@pytest.mark.asyncio
+async def test_cleanup_is_opt_in_and_needs_redis_with_workers(monkeypatch):
+    cleanup_calls = []
+    monkeypatch.setattr(
+        cache.WEB_SEARCH_COLLECTIONS, "cleanup", lambda ttl: cleanup_calls.append(ttl)
+    )
+
+    await cache.periodic_web_search_collection_cleanup(0)
+
+    monkeypatch.setattr(cache, "UVICORN_WORKERS", 2)
+    monkeypatch.setattr(cache.WEB_SEARCH_COLLECTIONS, "_redis", None)
+    await cache.periodic_web_search_collection_cleanup(60)
+
+    assert cleanup_calls == []
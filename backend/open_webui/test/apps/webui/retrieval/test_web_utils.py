@@ -0,0 +1,57 @@
+import socket
+
+import pytest
+
+from open_webui.retrieval.web import utils
+from open_webui.retrieval.web.utils import PublicAddressResolver
+
+
+def resolved(*addresses):
+    return [
+        {
+            "hostname": "example.com",
+            "host": address,
+            "port": 443,
+            "family": socket.AF_INET6 if ":" in address else socket.AF_INET,
+            "proto": 0,
+            "flags": 0,
+        }
+        for address in addresses
+    ]
+
+
+@pytest.fixture
+def dns(monkeypatch):
+    answers = {}
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return answers[host]
+
+    monkeypatch.setattr(utils.ThreadedResolver, "resolve", resolve)
+    return answers
+
+
+@pytest.mark.asyncio
+async def test_resolver_refuses_private_addresses(dns, monkeypatch):
+    monkeypatch.setattr(utils, "ENABLE_RAG_LOCAL_WEB_FETCH", False)
+    dns["example.com"] = resolved("93.184.215.14")
+    dns["rebound.example.com"] = resolved("93.184.215.14", "127.0.0.1")
+    dns["v6.example.com"] = resolved("::1")
+    resolver = PublicAddressResolver()
+
+    assert await resolver.resolve("example.com", 443) == dns["example.com"]
+    for host in ["rebound.example.com", "v6.example.com"]:
+        with pytest.raises(OSError):
+            await resolver.resolve(host, 443)
+
+
+@pytest.mark.asyncio
+async def test_resolver_allows_private_addresses_with_local_fetch(dns, monkeypatch):
+    monkeypatch.setattr(utils, "ENABLE_RAG_LOCAL_WEB_FETCH", True)
+    dns["intranet"] = resolved("10.0.0.2")
+
+    assert await PublicAddressResolver().resolve("intranet") == dns["intranet"]
+
+
+def test_resolved_addresses_are_cached_briefly():
+    assert utils.HOSTNAME_CACHE.ttl <= utils.HOSTNAME_CACHE_MAX_TTL
@@ -0,0 +1,85 @@
+import shutil
+import subprocess
+
+import pytest
+
+from open_webui.routers import audio
+from open_webui.routers.audio import SpeechSynthesis, strip_mp3_headers
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+
+
+def encode_mp3(tmp_path, seconds: float, frequency: int) -> bytes:
+    """An MP3 with the ID3 tag and Info frame encoders write."""
+    path = tmp_path / f"{frequency}.mp3"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency={frequency}:duration={seconds}",
+            "-ar",
+            "16000",
+            "-ac",
+            "1",
+            "-c:a",
+            "libmp3lame",
+            str(path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return path.read_bytes()
+
+
+def decode(path) -> tuple[float, str]:
+    """Seconds of audio decoded from `path` and what ffmpeg reported."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(path), "-f", "s16le", "-"],
+        capture_output=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return len(result.stdout) / 2 / 16000, result.stderr.decode()
+
+
+def test_strips_tags_and_info_frame(tmp_path):
+    chunk = encode_mp3(tmp_path, 1, 440)
+    assert chunk.startswith(b"ID3") and b"Info" in chunk[:2000]
+
+    stripped = strip_mp3_headers(chunk)
+
+    assert stripped[0] == 0xFF and stripped[1] & 0xE0 == 0xE0
+    assert b"Info" not in stripped[:2000]
+    assert strip_mp3_headers(stripped) == stripped
+
+
+@pytest.mark.asyncio
+async def test_synthesized_chunks_decode_as_one_stream(tmp_path, monkeypatch):
+    chunks = iter([encode_mp3(tmp_path, 1, frequency) for frequency in [440, 660, 880]])
+    cached = []
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(audio, "SPEECH_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(audio.SPEECH_CACHE, "add", cached.append)
+    monkeypatch.setattr(audio, "get_speaker_embedding", lambda request: None)
+    monkeypatch.setattr(
+        audio, "synthesize_speech", lambda request, text, embedding: next(chunks)
+    )
+
+    synthesis = SpeechSynthesis(None, "speech", {"input": "One. Two. Three."})
+    synthesis.texts = ["One.", "Two.", "Three."]
+    synthesis.start()
+    await synthesis.wait()
+
+    assert synthesis.error is None and cached == ["speech"]
+    seconds, report = decode(cache_dir / "speech.mp3")
+
+    assert "invalid concatenated file" not in report
+    assert "Invalid data" not in report
+    assert 2.9 < seconds < 3.3
+    assert b"".join(synthesis.chunks) == (cache_dir / "speech.mp3").read_bytes()
@@ -0,0 +1,157 @@
+import gzip
+import io
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from open_webui.internal.db import run_migrations
+from open_webui.models import chats as chats_model
+from open_webui.models.chats import ChatImportForm, Chats
+from open_webui.models.tags import Tags
+from open_webui.routers import chats
+from open_webui.routers.chats import get_user_chats, import_chats
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    run_migrations(raise_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def batch_sizes(monkeypatch):
+    monkeypatch.setattr(chats, "CHAT_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(chats_model, "CHAT_EXPORT_BATCH_SIZE", 2)
+
+
+def new_user():
+    return SimpleNamespace(id=f"user-{uuid.uuid4()}")
+
+
+def new_chats(user, count: int, tags: tuple[str, ...] = ()):
+    return Chats.import_chats(
+        user.id,
+        [
+            ChatImportForm(
+                chat={"title": f"Chat {i}", "messages": [{"content": str(i)}]},
+                meta={"tags": list(tags)},
+                created_at=i + 1,
+                updated_at=i + 1,
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def ndjson(*documents) -> bytes:
+    return b"".join(
+        (
+            document
+            if isinstance(document, bytes)
+            else json.dumps(document).encode("utf-8")
+        )
+        + b"\n"
+        for document in documents
+    )
+
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="chats.ndjson")
+
+
+async def export_chats(user, gzip: bool = False) -> bytes:
+    response = await get_user_chats(format="ndjson", gzip=gzip, user=user)
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def get_titles(user) -> list[str]:
+    return [chat.title for chat in Chats.iter_chats(user_id=user.id)]
+
+
+def get_tag_names(user) -> list[str]:
+    return sorted(tag.name for tag in Tags.get_tags_by_user_id(user.id))
+
+
+def test_iter_chats_yields_every_chat_newest_first():
+    user, other = new_user(), new_user()
+    new_chats(user, 5)
+    new_chats(other, 1)
+    Chats.archive_all_chats_by_user_id(other.id)
+
+    assert get_titles(user) == [f"Chat {i}" for i in reversed(range(5))]
+    assert [c.title for c in Chats.iter_chats(user_id=other.id, archived=True)] == [
+        "Chat 0"
+    ]
+    assert list(Chats.iter_chats(user_id=other.id, archived=False)) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compressed", [False, True])
+async def test_round_trips_an_export(compressed):
+    user, target = new_user(), new_user()
+    new_chats(user, 5, tags=("work_notes",))
+
+    data = await export_chats(user, gzip=compressed)
+    assert data.startswith(b"\x1f\x8b") == compressed
+
+    result = import_chats(file=upload(data), user=target)
+
+    assert (result.imported, result.skipped) == (5, 0)
+    assert get_titles(target) == get_titles(user)
+    exported = [c.chat for c in Chats.iter_chats(user_id=user.id)]
+    assert [c.chat for c in Chats.iter_chats(user_id=target.id)] == exported
+    assert get_tag_names(target) == ["Work Notes"]
+
+
+def test_skips_invalid_lines():
+    user = new_user()
+    data = ndjson(
+        {"chat": {"title": "First"}},
+        b"not json",
+        {"chat": "not a chat"},
+        [],
+        b"",
+        {"chat": {"title": "Second"}},
+    )
+
+    result = import_chats(file=upload(data), user=user)
+
+    assert (result.imported, result.skipped) == (2, 3)
+    assert sorted(get_titles(user)) == ["First", "Second"]
+
+
+def test_keeps_the_batches_committed_before_a_failure():
+    user = new_user()
+    forms = [
+        {"chat": {"title": f"Chat {i}"}, "meta": {"tags": [f"tag_{i}"]}}
+        for i in range(6)
+    ]
+    # The second gzip member is cut short, reading it fails after the first
+    data = gzip.compress(ndjson(*forms[:3])) + gzip.compress(ndjson(*forms[3:]))[:20]
+
+    with pytest.raises(HTTPException) as e:
+        import_chats(file=upload(data), user=user)
+
+    assert e.value.status_code == 400
+    assert "2 chats were imported" in e.value.detail
+    assert sorted(get_titles(user)) == ["Chat 0", "Chat 1"]
+    # Tags are created for the chats that were imported
+    assert get_tag_names(user) == ["Tag 0", "Tag 1"]
+
+
+def test_creates_missing_tags_once():
+    user = new_user()
+    Tags.insert_new_tag("Existing", user.id)
+    data = ndjson(
+        *[
+            {"chat": {"title": "Tagged"}, "meta": {"tags": ["existing", tag]}}
+            for tag in ["big_project", "none", "big_project"]
+        ]
+    )
+
+    result = import_chats(file=upload(data), user=user)
+
+    assert result.imported == 3
+    assert get_tag_names(user) == ["Big Project", "Existing"]
@@ -0,0 +1,203 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_webui.storage.cache import DirectoryCache, FileCache
+
+
+class RemoteObject:
+    def __init__(self, content: bytes, etag: str = "v1"):
+        self.content = content
+        self.etag = etag
+        self.downloads = 0
+
+    def download(self, path):
+        self.downloads += 1
+        time.sleep(0.05)
+        with open(path, "wb") as f:
+            f.write(self.content)
+
+
+def get(cache, tmp_path, key, remote):
+    return cache.get(key, str(tmp_path / key), remote.download, lambda: remote.etag)
+
+
+def write(directory, name, size):
+    (directory / name).write_bytes(b"x" * size)
+
+
+class TestFileCache:
+    def test_hit_until_etag_changes(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=1024)
+        remote = RemoteObject(b"a" * 10)
+
+        path = get(cache, tmp_path, "a.txt", remote)
+        assert get(cache, tmp_path, "a.txt", remote) == path
+        assert remote.downloads == 1
+        assert cache.stats["hits"] == 1
+
+        remote.etag, remote.content = "v2", b"b" * 20
+        assert open(get(cache, tmp_path, "a.txt", remote), "rb").read() == b"b" * 20
+        assert remote.downloads == 2
+        assert cache.size == 20
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=25)
+        remotes = {key: RemoteObject(b"x" * 10) for key in ["a", "b", "c"]}
+
+        get(cache, tmp_path, "a", remotes["a"])
+        get(cache, tmp_path, "b", remotes["b"])
+        get(cache, tmp_path, "a", remotes["a"])
+        get(cache, tmp_path, "c", remotes["c"])
+
+        assert cache.contains("a") and cache.contains("c")
+        assert not cache.contains("b")
+        assert not (tmp_path / "b").exists()
+        assert cache.size == 20
+        assert cache.stats["evictions"] == 1
+
+    def test_keeps_pinned_files_until_released(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=15)
+        remotes = {key: RemoteObject(b"x" * 10) for key in ["a", "b"]}
+
+        cache.get(
+            "a", str(tmp_path / "a"), remotes["a"].download, lambda: "v1", pin=True
+        )
+        get(cache, tmp_path, "b", remotes["b"])
+
+        # "a" is the least recently used but still being read
+        assert (tmp_path / "a").exists() and (tmp_path / "b").exists()
+        assert cache.size == 20
+
+        cache.release("a")
+        assert not (tmp_path / "a").exists()
+        assert cache.contains("b")
+        assert cache.size == 10
+
+    def test_concurrent_reads_share_one_download(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=1024)
+        remote = RemoteObject(b"a" * 10)
+
+        with ThreadPoolExecutor(8) as executor:
+            paths = list(
+                executor.map(lambda _: get(cache, tmp_path, "a", remote), range(8))
+            )
+
+        assert len(set(paths)) == 1
+        assert remote.downloads == 1
+
+    def test_failed_download_is_not_cached(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=1024)
+
+        def download(path):
+            open(path, "wb").write(b"partial")
+            raise RuntimeError("connection reset")
+
+        with pytest.raises(RuntimeError):
+            cache.get("a", str(tmp_path / "a"), download, lambda: "v1")
+
+        assert not cache.contains("a")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_indexes_existing_files(self, tmp_path):
+        write(tmp_path, "old", 10)
+        os.utime(tmp_path / "old", (0, 0))
+        write(tmp_path, "new", 10)
+        write(tmp_path, "new.123.part", 10)
+
+        cache = FileCache("test", tmp_path, max_size=15)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "new",
+            "new.123.part",
+        ]
+        assert cache.size == 10
+
+    def test_workers_keep_files_pinned_by_each_other(self, tmp_path):
+        worker = FileCache("test", tmp_path, max_size=15)
+        other = FileCache("test", tmp_path, max_size=15)
+        remotes = {key: RemoteObject(b"x" * 10) for key in ["a", "b", "c"]}
+
+        worker.get(
+            "a", str(tmp_path / "a"), remotes["a"].download, lambda: "v1", pin=True
+        )
+        get(other, tmp_path, "b", remotes["b"])
+
+        # Counted by the other worker as well, but still being read
+        assert (tmp_path / "a").exists() and (tmp_path / "b").exists()
+        assert other.size == 20
+
+        worker.release("a")
+        get(other, tmp_path, "c", remotes["c"])
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["c"]
+        assert not worker.contains("a")
+
+    def test_disabled_always_downloads(self, tmp_path):
+        cache = FileCache("test", tmp_path, max_size=0)
+        remote = RemoteObject(b"a")
+        etag_calls = []
+
+        for _ in range(2):
+            cache.get("a", str(tmp_path / "a"), remote.download, etag_calls.append)
+
+        assert remote.downloads == 2
+        assert etag_calls == []
+
+
+class TestDirectoryCache:
+    def test_hit_and_miss(self, tmp_path):
+        cache = DirectoryCache("test", tmp_path, max_size=1024)
+
+        assert cache.get("a", ".mp3") is None
+        write(tmp_path, "a.mp3", 10)
+        write(tmp_path, "a.json", 2)
+        cache.add("a")
+
+        assert cache.get("a", ".mp3") == tmp_path / "a.mp3"
+        assert cache.size == 12
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = DirectoryCache("test", tmp_path, max_size=25)
+
+        for key in ["a", "b"]:
+            write(tmp_path, f"{key}.mp3", 10)
+            cache.add(key)
+        cache.get("a", ".mp3")
+        write(tmp_path, "c.mp3", 10)
+        cache.add("c")
+
+        assert not (tmp_path / "b.mp3").exists()
+        assert cache.get("a", ".mp3") and cache.get("c", ".mp3")
+        assert cache.size == 20
+        assert cache.stats["evictions"] == 1
+
+    def test_expires_old_entries(self, tmp_path):
+        cache = DirectoryCache("test", tmp_path, max_size=0, max_age=60)
+        write(tmp_path, "a.mp3", 10)
+        cache.add("a")
+        cache._entries["a"] = (time.time() - 120, 10)
+
+        assert cache.get("a", ".mp3") is None
+        assert not (tmp_path / "a.mp3").exists()
+        assert cache.size == 0
+
+    def test_indexes_existing_files(self, tmp_path):
+        write(tmp_path, "old.mp3", 10)
+        os.utime(tmp_path / "old.mp3", (0, 0))
+        write(tmp_path, "new.mp3", 10)
+        write(tmp_path, "new.123.part", 10)
+        write(tmp_path, "old.123.part", 10)
+        os.utime(tmp_path / "old.123.part", (0, 0))
+
+        cache = DirectoryCache("test", tmp_path, max_size=15)
+
+        # The recent .part file may still be written by another worker
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "new.123.part",
+            "new.mp3",
+        ]
+        assert cache.get("new", ".mp3") == tmp_path / "new.mp3"
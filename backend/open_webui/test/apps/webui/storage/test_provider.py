@@ -1,3 +1,4 @@
+import hashlib
 import io
 import os
 import boto3
@@ -56,6 +57,29 @@ def test_class_instantiation():
     provider.AzureStorageProvider()
 
 
+class TestHashingReader:
+    content = bytes(range(256)) * 1000
+
+    def test_chunks(self):
+        reader = provider.HashingReader(io.BytesIO(self.content), chunk_size=1000)
+        chunks = list(reader.chunks())
+        assert b"".join(chunks) == self.content
+        assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+        assert reader.size == len(self.content)
+        assert reader.sha256 == hashlib.sha256(self.content).hexdigest()
+
+    def test_reads_are_not_short(self):
+        reader = provider.HashingReader(io.BytesIO(self.content), chunk_size=100)
+        assert len(reader.read(5000)) == 5000
+        assert reader.tell() == 5000
+        assert reader.read(5000) + reader.read() == self.content[5000:]
+        assert not reader.seekable()
+
+    def test_empty(self):
+        assert provider.HashingReader(io.BytesIO()).empty
+        assert not provider.HashingReader(io.BytesIO(b"a")).empty
+
+
 class TestLocalStorageProvider:
     Storage = provider.LocalStorageProvider()
     file_content = b"test content"
@@ -74,6 +98,18 @@ class TestLocalStorageProvider:
         with pytest.raises(ValueError):
             self.Storage.upload_file(self.file_bytesio_empty, self.filename)
 
+    def test_upload_stream(self, monkeypatch, tmp_path):
+        upload_dir = mock_upload_dir(monkeypatch, tmp_path)
+        stored_file = self.Storage.upload_stream(
+            io.BytesIO(self.file_content), self.filename, {}
+        )
+        assert (upload_dir / self.filename).read_bytes() == self.file_content
+        assert stored_file.size == len(self.file_content)
+        assert stored_file.sha256 == hashlib.sha256(self.file_content).hexdigest()
+        assert stored_file.path == str(upload_dir / self.filename)
+        with pytest.raises(ValueError):
+            self.Storage.upload_stream(io.BytesIO(), self.filename, {})
+
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         file_path = str(upload_dir / self.filename)
@@ -375,7 +411,7 @@ class TestAzureStorageProvider:
         # Mock upload behavior
         self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
         # Mock blob download behavior
-        self.Storage.container_client.get_blob_client().download_blob().readall.return_value = (
+        self.Storage.container_client.get_blob_client().download_blob().readinto.side_effect = lambda f: f.write(
             self.file_content
         )
 
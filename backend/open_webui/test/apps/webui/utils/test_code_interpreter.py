@@ -0,0 +1,223 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from open_webui.utils.code_interpreter import JupyterKernelPool, _PooledKernel
+
+
+class FakeWebSocket:
+    """Answers every execute request with its code on stdout."""
+
+    def __init__(self):
+        self.close_code = None
+        self.messages = asyncio.Queue()
+
+    async def send(self, message):
+        request = json.loads(message)
+        parent_header = {"msg_id": request["header"]["msg_id"]}
+        code = request["content"]["code"]
+        for msg_type, content in [
+            ("stream", {"name": "stdout", "text": code}),
+            ("status", {"execution_state": "idle"}),
+        ]:
+            await self.messages.put(
+                json.dumps(
+                    {
+                        "parent_header": parent_header,
+                        "msg_type": msg_type,
+                        "content": content,
+                    }
+                )
+            )
+
+    async def recv(self):
+        return await self.messages.get()
+
+    async def close(self):
+        self.close_code = 1000
+
+
+class FakePool(JupyterKernelPool):
+    """Kernel pool with the Jupyter server calls replaced by bookkeeping."""
+
+    def __init__(self, **kwargs):
+        super().__init__("http://jupyter", **kwargs)
+        self.started = 0
+        self.shut_down = []
+        self.unhealthy = set()
+        self.failing_connects = 0
+        self.start_gate = None
+
+    async def _start_kernel(self):
+        if self.start_gate is not None:
+            await self.start_gate.wait()
+        self.started += 1
+        return _PooledKernel(f"kernel-{self.started}")
+
+    async def _connect(self, kernel):
+        if self.failing_connects:
+            self.failing_connects -= 1
+            raise ConnectionError("kernel went away")
+        if kernel.ws is None:
+            kernel.ws = FakeWebSocket()
+        return kernel.ws
+
+    async def _is_healthy(self, kernel):
+        return kernel.kernel_id not in self.unhealthy
+
+    async def _interrupt(self, kernel):
+        pass
+
+    async def _shutdown_kernel(self, kernel):
+        self.shut_down.append(kernel.kernel_id)
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_chats_keep_their_kernel():
+    pool = FakePool(max_size=4, min_idle=0)
+
+    first = await pool.execute("a = 1", 5, chat_id="chat-1")
+    kernel = pool._chats["chat-1"]
+    second = await pool.execute("a", 5, chat_id="chat-1")
+
+    assert (first.stdout, second.stdout) == ("a = 1", "a")
+    assert pool._chats["chat-1"] is kernel
+    assert pool.started == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_executions_without_chat_get_a_fresh_kernel():
+    pool = FakePool(max_size=4, min_idle=0)
+
+    await pool.execute("print(1)", 5)
+    await pool.execute("print(2)", 5)
+
+    assert pool.started == 2
+    assert pool.shut_down == ["kernel-1", "kernel-2"]
+    assert pool.size == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_chat_kernel():
+    pool = FakePool(max_size=2, min_idle=0)
+
+    await pool.execute("1", 5, chat_id="chat-1")
+    await pool.execute("2", 5, chat_id="chat-2")
+    await pool.execute("1", 5, chat_id="chat-1")
+    await pool.execute("3", 5, chat_id="chat-3")
+    await settle()
+
+    assert set(pool._chats) == {"chat-1", "chat-3"}
+    assert pool.shut_down == ["kernel-2"]
+    assert pool.size == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_on_a_new_kernel_before_sending():
+    pool = FakePool(max_size=2, min_idle=0)
+    pool.failing_connects = 1
+
+    result = await pool.execute("x", 5, chat_id="chat-1")
+
+    assert result.stdout == "x"
+    assert pool.shut_down == ["kernel-1"]
+    assert pool._chats["chat-1"].kernel_id == "kernel-2"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_once_the_code_was_sent(monkeypatch):
+    pool = FakePool(max_size=2, min_idle=0)
+
+    async def fail(ws, code, timeout):
+        raise ConnectionError("connection lost")
+
+    monkeypatch.setattr("open_webui.utils.code_interpreter.execute_in_kernel", fail)
+
+    with pytest.raises(ConnectionError):
+        await pool.execute("x", 5, chat_id="chat-1")
+    assert pool.started == 1
+    assert pool.shut_down == ["kernel-1"]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_replenishes_warm_kernels():
+    pool = FakePool(max_size=4, min_idle=2)
+
+    await pool.execute("x", 5, chat_id="chat-1")
+    await settle()
+
+    assert len(pool._idle) == 2
+    await pool.execute("y", 5, chat_id="chat-2")
+    await settle()
+
+    # chat-2 took a warm kernel, which was started again
+    assert pool._chats["chat-2"].kernel_id in ("kernel-2", "kernel-3")
+    assert len(pool._idle) == 2
+    assert pool.started == 4
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_reaps_idle_chat_and_unhealthy_warm_kernels():
+    pool = FakePool(max_size=4, min_idle=1, idle_timeout=60)
+
+    await pool.execute("x", 5, chat_id="chat-1")
+    await pool.execute("y", 5, chat_id="chat-2")
+    await settle()
+    pool._chats["chat-1"].last_used = time.monotonic() - 120
+    pool.unhealthy.add(pool._idle[0].kernel_id)
+    unhealthy = pool._idle[0].kernel_id
+
+    assert await pool.reap() is False
+    await settle()
+
+    assert set(pool._chats) == {"chat-2"}
+    assert set(pool.shut_down) == {"kernel-1", unhealthy}
+    assert len(pool._idle) == 1 and pool._idle[0].kernel_id != unhealthy
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_reap_empties_an_unused_pool():
+    pool = FakePool(max_size=4, min_idle=1, idle_timeout=60)
+
+    await pool.execute("x", 5, chat_id="chat-1")
+    await settle()
+    pool.last_used = pool._chats["chat-1"].last_used = time.monotonic() - 120
+
+    assert await pool.reap() is True
+    assert pool.size == 0
+    assert sorted(pool.shut_down) == ["kernel-1", "kernel-2"]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_background_tasks():
+    pool = FakePool(max_size=4, min_idle=1)
+
+    await pool.execute("x", 5, chat_id="chat-1")
+    await settle()
+    pool.start_gate = asyncio.Event()
+    await pool.execute("y", 5, chat_id="chat-2")
+    await settle()
+    replenish = list(pool._tasks)
+    assert replenish and pool._replenishing
+
+    await pool.close()
+
+    assert all(task.cancelled() for task in replenish)
+    assert pool._reaper.cancelled()
+    assert not pool._tasks and not pool._replenishing
+    assert sorted(pool.shut_down) == ["kernel-1", "kernel-2"]
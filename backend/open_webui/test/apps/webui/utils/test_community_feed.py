@@ -0,0 +1,176 @@
+import uuid
+
+import fakeredis
+import pytest
+
+from open_webui.internal.db import run_migrations
+from open_webui.models.community import CommunityPostForm, Followers, Posts
+from open_webui.utils import community_feed
+from open_webui.utils.community_feed import (
+    TIMELINE_COMPLETE,
+    TIMELINE_PLACEHOLDER,
+    TIMELINE_TRUNCATED,
+    _get_timeline_key,
+    fan_out_post,
+    get_feed,
+    update_timelines_on_follow,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    run_migrations(raise_errors=True)
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(community_feed, "COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS", 2)
+    monkeypatch.setattr(community_feed, "COMMUNITY_FEED_TIMELINE_MAX_LENGTH", 3)
+
+
+def new_user_id() -> str:
+    return f"user-{uuid.uuid4()}"
+
+
+def follow(redis, follower_id: str, following_id: str):
+    assert Followers.follow(follower_id, following_id)
+    return update_timelines_on_follow(redis, follower_id, following_id, True)
+
+
+async def post(redis, user_id: str, content: str):
+    post = Posts.create_post(CommunityPostForm(content=content), user_id)
+    await fan_out_post(redis, post)
+    return post
+
+
+async def get_contents(redis, viewer_id: str, limit: int = 10) -> list[str]:
+    contents, cursor = [], None
+    while True:
+        posts, cursor = await get_feed(redis, viewer_id, limit, cursor)
+        contents.extend(post.content for post in posts)
+        if not cursor:
+            return contents
+
+
+async def get_state(redis, user_id: str):
+    return await redis.zscore(_get_timeline_key(user_id), TIMELINE_PLACEHOLDER)
+
+
+@pytest.mark.asyncio
+async def test_fans_out_to_cached_timelines(redis):
+    viewer, other, author = new_user_id(), new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    await follow(redis, other, author)
+    await post(redis, author, "first")
+
+    assert await get_contents(redis, viewer) == ["first"]
+    new_post = await post(redis, author, "second")
+
+    # Only the timeline that was read is cached and pushed to
+    key = _get_timeline_key(viewer)
+    assert await redis.zscore(key, new_post.id) is not None
+    assert not await redis.exists(_get_timeline_key(other))
+    assert await get_contents(redis, viewer) == ["second", "first"]
+    assert await redis.ttl(key) > 0
+
+
+@pytest.mark.asyncio
+async def test_marks_timelines_truncated(redis):
+    viewer, author = new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    for content in ["1", "2"]:
+        await post(redis, author, content)
+
+    assert await get_contents(redis, viewer) == ["2", "1"]
+    assert await get_state(redis, viewer) == TIMELINE_COMPLETE
+
+    await post(redis, author, "3")
+    assert await get_state(redis, viewer) == TIMELINE_COMPLETE
+    await post(redis, author, "4")
+
+    # The oldest post fell out of the timeline, older pages come from the db
+    assert await get_state(redis, viewer) == TIMELINE_TRUNCATED
+    assert await redis.zcard(_get_timeline_key(viewer)) == 4
+    assert await get_contents(redis, viewer, limit=2) == ["4", "3", "2", "1"]
+
+
+@pytest.mark.asyncio
+async def test_rebuilds_missing_timelines(redis):
+    viewer, author = new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    for content in ["1", "2", "3", "4"]:
+        await post(redis, author, content)
+
+    assert await get_contents(redis, viewer, limit=2) == ["4", "3", "2", "1"]
+    # Rebuilt with the newest posts only, as the cap was reached
+    assert await redis.zcard(_get_timeline_key(viewer)) == 4
+    assert await get_state(redis, viewer) == TIMELINE_TRUNCATED
+
+    await redis.delete(_get_timeline_key(viewer))
+    assert await get_contents(redis, viewer) == ["4", "3", "2", "1"]
+    assert await redis.exists(_get_timeline_key(viewer))
+
+
+@pytest.mark.asyncio
+async def test_merges_pulled_authors(redis):
+    viewer, author, popular = new_user_id(), new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    for user_id in [viewer, new_user_id(), new_user_id()]:
+        await follow(redis, user_id, popular)
+
+    await post(redis, author, "1")
+    await post(redis, popular, "2")
+    assert await get_contents(redis, viewer) == ["2", "1"]
+
+    popular_post = await post(redis, popular, "3")
+    await post(redis, author, "4")
+
+    assert await get_contents(redis, viewer, limit=1) == ["4", "3", "2", "1"]
+    # Posts of authors over the threshold are never pushed
+    key = _get_timeline_key(viewer)
+    assert await redis.zscore(key, popular_post.id) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidates_followers_when_crossing_the_threshold(redis):
+    viewer, author = new_user_id(), new_user_id()
+    second, third = new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    await follow(redis, second, author)
+    await post(redis, author, "1")
+
+    await get_contents(redis, viewer)
+    await get_contents(redis, second)
+    await follow(redis, third, author)
+
+    # Pulled from now on, the timelines hold posts they no longer get
+    assert not await redis.exists(_get_timeline_key(viewer))
+    assert not await redis.exists(_get_timeline_key(second))
+
+    await get_contents(redis, viewer)
+    await get_contents(redis, second)
+    assert Followers.unfollow(third, author)
+    await update_timelines_on_follow(redis, third, author, False)
+
+    # Pushed again, the timelines lack the posts made while pulled
+    assert not await redis.exists(_get_timeline_key(viewer))
+    assert not await redis.exists(_get_timeline_key(second))
+    await post(redis, author, "2")
+    assert await get_contents(redis, viewer) == ["2", "1"]
+
+
+@pytest.mark.asyncio
+async def test_keeps_other_timelines_below_the_threshold(redis):
+    viewer, author, other = new_user_id(), new_user_id(), new_user_id()
+    await follow(redis, viewer, author)
+    await post(redis, author, "1")
+    await get_contents(redis, viewer)
+
+    await follow(redis, other, author)
+
+    assert await redis.exists(_get_timeline_key(viewer))
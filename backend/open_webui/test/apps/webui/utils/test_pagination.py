@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import BigInteger, Column, Text, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from open_webui.utils.pagination import decode_cursor, encode_cursor, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "item"
+
+    id = Column(Text, primary_key=True)
+    created_at = Column(BigInteger)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # Duplicate timestamps so pages have to break ties on id
+    session.add_all(
+        [Item(id=f"item-{idx:02d}", created_at=idx // 3) for idx in range(10)]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+ORDER_BY = [(Item.created_at, True), (Item.id, True)]
+
+
+def walk(db, **kwargs):
+    ids, cursor = [], ""
+    while cursor is not None:
+        items, cursor = paginate(db.query(Item), cursor=cursor, **kwargs)
+        ids.extend(item.id for item in items)
+    return ids
+
+
+def test_keyset_pages_match_offset_order(db):
+    expected = [
+        item.id
+        for item in db.query(Item)
+        .order_by(Item.created_at.desc(), Item.id.desc())
+        .all()
+    ]
+
+    assert walk(db, order_by=ORDER_BY, limit=4) == expected
+    assert walk(db, order_by=ORDER_BY, limit=4, keyset=False) == expected
+
+
+def test_mixed_directions(db):
+    order_by = [(Item.created_at, False), (Item.id, True)]
+    ids = walk(db, order_by=order_by, limit=3)
+
+    assert ids == [
+        item.id
+        for item in db.query(Item).order_by(Item.created_at, Item.id.desc()).all()
+    ]
+
+
+def test_offset_shim_returns_keyset_cursor(db):
+    items, cursor = paginate(db.query(Item), ORDER_BY, skip=4, limit=3)
+
+    assert [item.id for item in items] == ["item-05", "item-04", "item-03"]
+    assert decode_cursor(cursor) == {"after": [1, "item-03"]}
+
+    items, cursor = paginate(db.query(Item), ORDER_BY, limit=3, cursor=cursor)
+    assert [item.id for item in items] == ["item-02", "item-01", "item-00"]
+    assert cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not a cursor", encode_cursor(offset=-1), encode_cursor(after=[1])],
+)
+def test_invalid_cursor(db, cursor):
+    with pytest.raises(ValueError):
+        paginate(db.query(Item), ORDER_BY, limit=3, cursor=cursor)
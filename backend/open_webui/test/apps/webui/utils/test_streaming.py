@@ -0,0 +1,41 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from open_webui.utils.streaming import encode_stream, gzip_stream, iter_ndjson
+
+ITEMS = [json.dumps({"id": idx, "text": "x" * 1000}) for idx in range(200)]
+
+
+@pytest.mark.parametrize("items", [ITEMS, ITEMS[:1], []])
+def test_json_array(items):
+    body = b"".join(encode_stream(iter(items)))
+
+    assert json.loads(body) == [json.loads(item) for item in items]
+
+
+def test_ndjson_chunks():
+    chunks = list(encode_stream(iter(ITEMS), "ndjson"))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode().splitlines() == ITEMS
+
+
+def test_gzip_round_trip():
+    body = b"".join(gzip_stream(encode_stream(iter(ITEMS), "ndjson")))
+
+    documents = [document for _, document in iter_ndjson(io.BytesIO(body))]
+    assert documents == [json.loads(item) for item in ITEMS]
+
+
+def test_iter_ndjson_invalid_lines():
+    file = io.BytesIO(b'{"a": 1}\n\nnot json\n{"b": 2}\n')
+
+    assert list(iter_ndjson(file)) == [(1, {"a": 1}), (3, None), (4, {"b": 2})]
+    assert list(iter_ndjson(io.BytesIO(gzip.compress(file.getvalue())))) == [
+        (1, {"a": 1}),
+        (3, None),
+        (4, {"b": 2}),
+    ]
@@ -0,0 +1,15 @@
+from open_webui.config import (
+    CACHE_DIR,
+    AUDIO_TTS_CACHE_MAX_SIZE_MB,
+    AUDIO_TTS_CACHE_MAX_AGE,
+)
+from open_webui.storage.cache import DirectoryCache
+
+# Synthesized speech, shared by the audio and OpenAI routers
+SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+SPEECH_CACHE = DirectoryCache(
+    "speech",
+    SPEECH_CACHE_DIR,
+    max_size=AUDIO_TTS_CACHE_MAX_SIZE_MB * 1024 * 1024,
+    max_age=AUDIO_TTS_CACHE_MAX_AGE,
+)
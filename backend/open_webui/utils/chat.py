@@ -46,6 +46,7 @@ from open_webui.utils.plugin import (
 )
 from open_webui.utils.models import get_all_models, check_model_access
 from open_webui.utils.payload import convert_payload_openai_to_ollama
+from open_webui.utils.telemetry.pipeline import record_stage
 from open_webui.utils.response import (
     convert_response_ollama_to_openai,
     convert_streaming_response_ollama_to_openai,
@@ -334,13 +335,14 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
             )
         ]
 
-        result, _ = await process_filter_functions(
-            request=request,
-            filter_functions=filter_functions,
-            filter_type="outlet",
-            form_data=data,
-            extra_params=extra_params,
-        )
+        with record_stage("filter_outlet", model=model_id):
+            result, _ = await process_filter_functions(
+                request=request,
+                filter_functions=filter_functions,
+                filter_type="outlet",
+                form_data=data,
+                extra_params=extra_params,
+            )
         return result
     except Exception as e:
         return Exception(f"Error: {e}")
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from typing import Optional
 
@@ -8,6 +9,11 @@ import aiohttp
 import websockets
 from pydantic import BaseModel
 
+from open_webui.config import (
+    JUPYTER_KERNEL_POOL_IDLE_TIMEOUT,
+    JUPYTER_KERNEL_POOL_MAX_SIZE,
+    JUPYTER_KERNEL_POOL_MIN_IDLE,
+)
 from open_webui.env import SRC_LOG_LEVELS
 
 logger = logging.getLogger(__name__)
@@ -24,6 +30,53 @@ class ResultModel(BaseModel):
     result: Optional[str] = ""
 
 
+async def sign_in(
+    session: aiohttp.ClientSession, params: dict, token: str, password: str
+) -> None:
+    # password authentication
+    if password and not token:
+        async with session.get("login") as response:
+            response.raise_for_status()
+            xsrf_token = response.cookies["_xsrf"].value
+            if not xsrf_token:
+                raise ValueError("_xsrf token not found")
+            session.cookie_jar.update_cookies(response.cookies)
+            session.headers.update({"X-XSRFToken": xsrf_token})
+        async with session.post(
+            "login",
+            data={"_xsrf": xsrf_token, "password": password},
+            allow_redirects=False,
+        ) as response:
+            response.raise_for_status()
+            session.cookie_jar.update_cookies(response.cookies)
+
+    # token authentication
+    if token:
+        params.update({"token": token})
+
+
+def get_websocket_url(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    kernel_id: str,
+    params: dict,
+    token: str,
+    password: str,
+) -> (str, dict):
+    ws_base = base_url.replace("http", "ws", 1)
+    ws_params = "?" + "&".join([f"{key}={val}" for key, val in params.items()])
+    websocket_url = f"{ws_base}api/kernels/{kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
+    ws_headers = {}
+    if password and not token:
+        ws_headers = {
+            "Cookie": "; ".join(
+                [f"{cookie.key}={cookie.value}" for cookie in session.cookie_jar]
+            ),
+            **session.headers,
+        }
+    return websocket_url, ws_headers
+
+
 class JupyterCodeExecuter:
     """
     Execute code in jupyter notebook
@@ -81,26 +134,7 @@ class JupyterCodeExecuter:
         return self.result
 
     async def sign_in(self) -> None:
-        # password authentication
-        if self.password and not self.token:
-            async with self.session.get("login") as response:
-                response.raise_for_status()
-                xsrf_token = response.cookies["_xsrf"].value
-                if not xsrf_token:
-                    raise ValueError("_xsrf token not found")
-                self.session.cookie_jar.update_cookies(response.cookies)
-                self.session.headers.update({"X-XSRFToken": xsrf_token})
-            async with self.session.post(
-                "login",
-                data={"_xsrf": xsrf_token, "password": self.password},
-                allow_redirects=False,
-            ) as response:
-                response.raise_for_status()
-                self.session.cookie_jar.update_cookies(response.cookies)
-
-        # token authentication
-        if self.token:
-            self.params.update({"token": self.token})
+        await sign_in(self.session, self.params, self.token, self.password)
 
     async def init_kernel(self) -> None:
         async with self.session.post(url="api/kernels", params=self.params) as response:
@@ -109,21 +143,14 @@ class JupyterCodeExecuter:
             self.kernel_id = kernel_data["id"]
 
     def init_ws(self) -> (str, dict):
-        ws_base = self.base_url.replace("http", "ws", 1)
-        ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
-        websocket_url = f"{ws_base}api/kernels/{self.kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
-        ws_headers = {}
-        if self.password and not self.token:
-            ws_headers = {
-                "Cookie": "; ".join(
-                    [
-                        f"{cookie.key}={cookie.value}"
-                        for cookie in self.session.cookie_jar
-                    ]
-                ),
-                **self.session.headers,
-            }
-        return websocket_url, ws_headers
+        return get_websocket_url(
+            self.session,
+            self.base_url,
+            self.kernel_id,
+            self.params,
+            self.token,
+            self.password,
+        )
 
     async def execute_code(self) -> None:
         # initialize ws
@@ -135,74 +162,471 @@ class JupyterCodeExecuter:
             await self.execute_in_jupyter(ws)
 
     async def execute_in_jupyter(self, ws) -> None:
-        # send message
-        msg_id = uuid.uuid4().hex
-        await ws.send(
-            json.dumps(
-                {
-                    "header": {
-                        "msg_id": msg_id,
-                        "msg_type": "execute_request",
-                        "username": "user",
-                        "session": uuid.uuid4().hex,
-                        "date": "",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": self.code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                        "stop_on_error": True,
-                    },
-                    "channel": "shell",
-                }
-            )
+        self.result, _ = await execute_in_kernel(ws, self.code, self.timeout)
+
+
+async def execute_in_kernel(ws, code: str, timeout: int) -> tuple[ResultModel, bool]:
+    """
+    Run `code` over an open kernel channels websocket. Returns the result and
+    whether the execution timed out (the kernel is then still busy with it).
+    """
+    # send message
+    msg_id = uuid.uuid4().hex
+    await ws.send(
+        json.dumps(
+            {
+                "header": {
+                    "msg_id": msg_id,
+                    "msg_type": "execute_request",
+                    "username": "user",
+                    "session": uuid.uuid4().hex,
+                    "date": "",
+                    "version": "5.3",
+                },
+                "parent_header": {},
+                "metadata": {},
+                "content": {
+                    "code": code,
+                    "silent": False,
+                    "store_history": True,
+                    "user_expressions": {},
+                    "allow_stdin": False,
+                    "stop_on_error": True,
+                },
+                "channel": "shell",
+            }
         )
-        # parse message
-        stdout, stderr, result = "", "", []
-        while True:
+    )
+    # parse message
+    stdout, stderr, result = "", "", []
+    timed_out = False
+    while True:
+        try:
+            # wait for message
+            message = await asyncio.wait_for(ws.recv(), timeout)
+            message_data = json.loads(message)
+            # msg id not match, skip
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            # check message type
+            msg_type = message_data.get("msg_type")
+            match msg_type:
+                case "stream":
+                    if message_data["content"]["name"] == "stdout":
+                        stdout += message_data["content"]["text"]
+                    elif message_data["content"]["name"] == "stderr":
+                        stderr += message_data["content"]["text"]
+                case "execute_result" | "display_data":
+                    data = message_data["content"]["data"]
+                    if "image/png" in data:
+                        result.append(f"data:image/png;base64,{data['image/png']}")
+                    elif "text/plain" in data:
+                        result.append(data["text/plain"])
+                case "error":
+                    stderr += "\n".join(message_data["content"]["traceback"])
+                case "status":
+                    if message_data["content"]["execution_state"] == "idle":
+                        break
+
+        except asyncio.TimeoutError:
+            stderr += "\nExecution timed out."
+            timed_out = True
+            break
+
+    return (
+        ResultModel(
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            result="\n".join(result).strip() if result else "",
+        ),
+        timed_out,
+    )
+
+
+class _PooledKernel:
+    __slots__ = (
+        "kernel_id",
+        "chat_id",
+        "ws",
+        "lock",
+        "in_use",
+        "last_used",
+        "checked_at",
+    )
+
+    def __init__(self, kernel_id: str):
+        self.kernel_id = kernel_id
+        self.chat_id: Optional[str] = None
+        self.ws = None
+        # One execution at a time, they share the kernel's websocket
+        self.lock = asyncio.Lock()
+        self.in_use = 0
+        self.last_used = self.checked_at = time.monotonic()
+
+
+class JupyterKernelPool:
+    """
+    Warm kernels on one Jupyter server, shared by all code executions.
+
+    Up to `min_idle` started kernels wait for work so short snippets don't
+    pay for kernel start-up. A chat keeps the kernel it was given, and with
+    it its variables and imports, until the kernel has been idle for
+    `idle_timeout` seconds. Executions without a chat get a fresh kernel
+    that is shut down afterwards. At most `max_size` kernels exist at once,
+    idle chat kernels are evicted least recently used first. One HTTP
+    session and one websocket per kernel are kept open, and kernels that
+    sat unused for a while are health-checked before they run code.
+    """
+
+    HEALTH_CHECK_INTERVAL = 30
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        max_size: int = JUPYTER_KERNEL_POOL_MAX_SIZE,
+        min_idle: int = JUPYTER_KERNEL_POOL_MIN_IDLE,
+        idle_timeout: int = JUPYTER_KERNEL_POOL_IDLE_TIMEOUT,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self.token = token or ""
+        self.password = password or ""
+        self.max_size = max(max_size, 1)
+        self.min_idle = min(max(min_idle, 0), self.max_size)
+        self.idle_timeout = idle_timeout
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.params = {}
+        self.last_used = time.monotonic()
+
+        self._idle: list[_PooledKernel] = []
+        self._chats: dict[str, _PooledKernel] = {}
+        self._starting = 0
+        self._condition = asyncio.Condition()
+        self._reaper: Optional[asyncio.Task] = None
+        self._replenishing = False
+        # Background shutdowns and warm-ups, cancelled on close
+        self._tasks: set[asyncio.Task] = set()
+        self._evicted: set[_PooledKernel] = set()
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._chats) + self._starting
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
+            self.params = {}
+            await sign_in(self.session, self.params, self.token, self.password)
+        return self.session
+
+    async def _start_kernel(self) -> _PooledKernel:
+        session = await self._get_session()
+        async with session.post("api/kernels", params=self.params) as response:
+            if response.status == 403:
+                # Expired login, sign in again on the next call
+                await session.close()
+            response.raise_for_status()
+            return _PooledKernel((await response.json())["id"])
+
+    async def _is_healthy(self, kernel: _PooledKernel) -> bool:
+        try:
+            session = await self._get_session()
+            async with session.get(
+                f"api/kernels/{kernel.kernel_id}", params=self.params
+            ) as response:
+                if response.status != 200:
+                    return False
+                state = (await response.json()).get("execution_state")
+                return state not in ("dead", "restarting")
+        except Exception as err:
+            logger.warning("kernel health check failed, %s", err)
+            return False
+
+    async def _interrupt(self, kernel: _PooledKernel) -> None:
+        try:
+            session = await self._get_session()
+            async with session.post(
+                f"api/kernels/{kernel.kernel_id}/interrupt", params=self.params
+            ) as response:
+                response.raise_for_status()
+        except Exception as err:
+            logger.warning("interrupt kernel failed, %s", err)
+
+    async def _shutdown_kernel(self, kernel: _PooledKernel) -> None:
+        if kernel.ws is not None:
             try:
-                # wait for message
-                message = await asyncio.wait_for(ws.recv(), self.timeout)
-                message_data = json.loads(message)
-                # msg id not match, skip
-                if message_data.get("parent_header", {}).get("msg_id") != msg_id:
-                    continue
-                # check message type
-                msg_type = message_data.get("msg_type")
-                match msg_type:
-                    case "stream":
-                        if message_data["content"]["name"] == "stdout":
-                            stdout += message_data["content"]["text"]
-                        elif message_data["content"]["name"] == "stderr":
-                            stderr += message_data["content"]["text"]
-                    case "execute_result" | "display_data":
-                        data = message_data["content"]["data"]
-                        if "image/png" in data:
-                            result.append(f"data:image/png;base64,{data['image/png']}")
-                        elif "text/plain" in data:
-                            result.append(data["text/plain"])
-                    case "error":
-                        stderr += "\n".join(message_data["content"]["traceback"])
-                    case "status":
-                        if message_data["content"]["execution_state"] == "idle":
-                            break
-
-            except asyncio.TimeoutError:
-                stderr += "\nExecution timed out."
+                await kernel.ws.close()
+            except Exception:
+                pass
+            kernel.ws = None
+        try:
+            session = await self._get_session()
+            async with session.delete(
+                f"api/kernels/{kernel.kernel_id}", params=self.params
+            ) as response:
+                if response.status != 404:
+                    response.raise_for_status()
+        except Exception as err:
+            logger.exception("close kernel failed, %s", err)
+
+    async def _connect(self, kernel: _PooledKernel):
+        if kernel.ws is None or kernel.ws.close_code is not None:
+            session = await self._get_session()
+            websocket_url, ws_headers = get_websocket_url(
+                session,
+                self.base_url,
+                kernel.kernel_id,
+                self.params,
+                self.token,
+                self.password,
+            )
+            kernel.ws = await websockets.connect(
+                websocket_url, additional_headers=ws_headers
+            )
+        return kernel.ws
+
+    async def _checkout(self, chat_id: Optional[str]) -> _PooledKernel:
+        async with self._condition:
+            while True:
+                kernel = self._chats.get(chat_id) if chat_id else None
+                if kernel is None and self._idle:
+                    kernel = self._idle.pop(0)
+                    if chat_id:
+                        kernel.chat_id = chat_id
+                        self._chats[chat_id] = kernel
+
+                if kernel is not None:
+                    kernel.in_use += 1
+                    return kernel
+
+                if self.size >= self.max_size:
+                    evicted = self._pop_lru_chat_kernel()
+                    if evicted is None:
+                        # Every kernel is busy, wait for one to be released
+                        await self._condition.wait()
+                        continue
+                    self._evicted.add(evicted)
+                    self._create_task(self._shutdown_evicted(evicted))
+
+                self._starting += 1
                 break
-        self.result.stdout = stdout.strip()
-        self.result.stderr = stderr.strip()
-        self.result.result = "\n".join(result).strip() if result else ""
+
+        try:
+            kernel = await self._start_kernel()
+        finally:
+            async with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+
+        async with self._condition:
+            kernel.in_use += 1
+            if chat_id:
+                kernel.chat_id = chat_id
+                self._chats[chat_id] = kernel
+        return kernel
+
+    def _create_task(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _shutdown_evicted(self, kernel: _PooledKernel) -> None:
+        try:
+            await self._shutdown_kernel(kernel)
+        finally:
+            self._evicted.discard(kernel)
+
+    def _pop_lru_chat_kernel(self) -> Optional[_PooledKernel]:
+        idle_kernels = [k for k in self._chats.values() if k.in_use == 0]
+        if not idle_kernels:
+            return None
+        kernel = min(idle_kernels, key=lambda k: k.last_used)
+        del self._chats[kernel.chat_id]
+        return kernel
+
+    async def _release(self, kernel: _PooledKernel, discard: bool = False) -> None:
+        async with self._condition:
+            kernel.in_use -= 1
+            kernel.last_used = time.monotonic()
+            if discard or kernel.chat_id is None:
+                if self._chats.get(kernel.chat_id) is kernel:
+                    del self._chats[kernel.chat_id]
+                discard = True
+            self._condition.notify_all()
+
+        if discard:
+            await self._shutdown_kernel(kernel)
+
+    async def execute(
+        self, code: str, timeout: int, chat_id: Optional[str] = None
+    ) -> ResultModel:
+        self.last_used = time.monotonic()
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_periodically())
+
+        for attempt in range(2):
+            kernel = await self._checkout(chat_id)
+            self._schedule_replenish()
+            sent = False
+            try:
+                async with kernel.lock:
+                    if (
+                        time.monotonic() - kernel.checked_at
+                        > self.HEALTH_CHECK_INTERVAL
+                        and not await self._is_healthy(kernel)
+                    ):
+                        raise RuntimeError(f"kernel {kernel.kernel_id} is not healthy")
+                    kernel.checked_at = time.monotonic()
+
+                    ws = await self._connect(kernel)
+                    sent = True
+                    result, timed_out = await execute_in_kernel(ws, code, timeout)
+                    if timed_out:
+                        await self._interrupt(kernel)
+            except Exception as err:
+                await self._release(kernel, discard=True)
+                if sent or attempt == 1:
+                    raise
+                # The kernel died or went away before running the code, the
+                # chat's state is lost either way so retry on a new kernel
+                logger.warning("kernel %s failed, retrying: %s", kernel.kernel_id, err)
+                continue
+
+            await self._release(kernel)
+            return result
+
+    def _schedule_replenish(self) -> None:
+        if not self._replenishing and len(self._idle) < self.min_idle:
+            self._replenishing = True
+            self._create_task(self._replenish())
+
+    async def _replenish(self) -> None:
+        try:
+            while True:
+                async with self._condition:
+                    if len(self._idle) >= self.min_idle or self.size >= self.max_size:
+                        return
+                    self._starting += 1
+                try:
+                    kernel = await self._start_kernel()
+                finally:
+                    async with self._condition:
+                        self._starting -= 1
+                        self._condition.notify_all()
+
+                async with self._condition:
+                    self._idle.append(kernel)
+                    self._condition.notify_all()
+        except Exception as err:
+            logger.warning("failed to start a warm kernel, %s", err)
+        finally:
+            self._replenishing = False
+
+    async def _reap_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(min(max(self.idle_timeout, 1), 60))
+            try:
+                if await self.reap():
+                    return
+            except Exception as err:
+                logger.exception("kernel reaping failed, %s", err)
+
+    async def reap(self) -> bool:
+        """
+        Shut down chat kernels idle for longer than `idle_timeout` and warm
+        kernels that fail their health check. Once the whole pool has been
+        unused that long, warm kernels are shut down too and True is returned.
+        """
+        now = time.monotonic()
+        pool_idle = now - self.last_used > self.idle_timeout
+
+        async with self._condition:
+            expired = [
+                kernel
+                for kernel in self._chats.values()
+                if kernel.in_use == 0 and now - kernel.last_used > self.idle_timeout
+            ]
+            for kernel in expired:
+                del self._chats[kernel.chat_id]
+            if pool_idle:
+                expired.extend(self._idle)
+                self._idle = []
+            idle_kernels = list(self._idle)
+
+        for kernel in idle_kernels:
+            if not await self._is_healthy(kernel):
+                async with self._condition:
+                    if kernel in self._idle:
+                        self._idle.remove(kernel)
+                        expired.append(kernel)
+            else:
+                kernel.checked_at = time.monotonic()
+
+        for kernel in expired:
+            await self._shutdown_kernel(kernel)
+        if expired:
+            logger.info("shut down %d idle Jupyter kernels", len(expired))
+
+        if pool_idle and not self._chats:
+            return True
+        self._schedule_replenish()
+        return False
+
+    async def close(self) -> None:
+        tasks = list(self._tasks)
+        if self._reaper is not None:
+            tasks.append(self._reaper)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        async with self._condition:
+            kernels = self._idle + list(self._chats.values()) + list(self._evicted)
+            self._idle, self._chats = [], {}
+            self._evicted.clear()
+        for kernel in kernels:
+            await self._shutdown_kernel(kernel)
+        if self.session is not None:
+            await self.session.close()
+
+
+JUPYTER_KERNEL_POOLS: dict[tuple[str, str, str], JupyterKernelPool] = {}
+
+
+def get_kernel_pool(base_url: str, token: str = "", password: str = ""):
+    key = (base_url, token or "", password or "")
+    if key not in JUPYTER_KERNEL_POOLS:
+        JUPYTER_KERNEL_POOLS[key] = JupyterKernelPool(base_url, token, password)
+    return JUPYTER_KERNEL_POOLS[key]
+
+
+async def close_kernel_pools() -> None:
+    for pool in list(JUPYTER_KERNEL_POOLS.values()):
+        await pool.close()
+    JUPYTER_KERNEL_POOLS.clear()
 
 
 async def execute_code_jupyter(
-    base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
+    base_url: str,
+    code: str,
+    token: str = "",
+    password: str = "",
+    timeout: int = 60,
+    chat_id: Optional[str] = None,
 ) -> dict:
+    if JUPYTER_KERNEL_POOL_MAX_SIZE > 0:
+        try:
+            result = await get_kernel_pool(base_url, token, password).execute(
+                code, timeout, chat_id
+            )
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            result = ResultModel(stderr=f"Error: {err}")
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
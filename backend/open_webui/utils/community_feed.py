@@ -0,0 +1,278 @@
+"""
+Home timelines of the community feed, the newest posts of the authors a user
+follows, with hybrid fan-out.
+
+New posts are pushed to the cached timeline of every follower of their author
+(fan-out on write), unless the author has more than
+COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS followers. The posts of those authors are
+pulled from the database when a feed is read (fan-out on read) and merged in,
+so a popular author doesn't cost thousands of writes per post.
+
+Timelines are Redis sorted sets of post ids scored by creation time in
+microseconds, which doubles hold exactly. They keep the newest
+COMMUNITY_FEED_TIMELINE_MAX_LENGTH posts, expire after
+COMMUNITY_FEED_TIMELINE_TTL seconds and are rebuilt from the database when
+missing. Following or unfollowing someone drops the timeline of the follower,
+and the timelines of all followers of the author when that moves the author
+across COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS, as their posts switch between
+pushed and pulled. Without Redis, feeds are read from the database.
+"""
+
+import logging
+from typing import Optional
+
+from open_webui.env import (
+    COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS,
+    COMMUNITY_FEED_TIMELINE_MAX_LENGTH,
+    COMMUNITY_FEED_TIMELINE_TTL,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+)
+from open_webui.models.community import (
+    CommunityPostModel,
+    CommunityPostWithUser,
+    Followers,
+    Posts,
+)
+from open_webui.utils.pagination import decode_cursor
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Every cached timeline holds this member below any post, so an empty
+# timeline is still cached. Its score tells whether the timeline has every
+# post of the pushed authors or only the newest ones.
+TIMELINE_PLACEHOLDER = ""
+TIMELINE_COMPLETE = 0
+TIMELINE_TRUNCATED = 1
+
+
+def _get_timeline_key(user_id: str) -> str:
+    return f"{REDIS_KEY_PREFIX}:community:timeline:{user_id}"
+
+
+def _get_score(created_at: int) -> int:
+    # Post timestamps are in nanoseconds
+    return created_at // 1000
+
+
+def _get_fanout_user_ids(user_ids: list[str]) -> tuple[list[str], list[str]]:
+    """Split authors into those whose posts are pushed and those pulled on read."""
+    follower_counts = Followers.get_follower_counts(user_ids)
+    pushed, pulled = [], []
+    for user_id in user_ids:
+        if follower_counts.get(user_id, 0) > COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS:
+            pulled.append(user_id)
+        else:
+            pushed.append(user_id)
+    return pushed, pulled
+
+
+def _get_fanout_follower_ids(user_id: str) -> list[str]:
+    follower_count = Followers.get_follower_counts([user_id]).get(user_id, 0)
+    if not follower_count or follower_count > COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS:
+        return []
+    return Followers.get_follower_ids(user_id)
+
+
+async def fan_out_post(redis, post: CommunityPostModel):
+    """Push a new post to the cached timelines of the followers of its author."""
+    if redis is None:
+        return
+
+    try:
+        keys = [
+            _get_timeline_key(follower_id)
+            for follower_id in _get_fanout_follower_ids(post.user_id)
+        ]
+        if not keys:
+            return
+
+        # Only add to cached timelines, missing ones are rebuilt with the post
+        pipe = redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.zscore(key, TIMELINE_PLACEHOLDER)
+        states = await pipe.execute()
+
+        cached_keys = []
+        pipe = redis.pipeline(transaction=False)
+        for key, state in zip(keys, states):
+            if state is not None:
+                cached_keys.append((key, state))
+                pipe.zadd(key, {post.id: _get_score(post.created_at)})
+                # Rank 0 is the placeholder, drop the oldest posts above the cap
+                pipe.zremrangebyrank(key, 1, -(COMMUNITY_FEED_TIMELINE_MAX_LENGTH + 1))
+        results = await pipe.execute()
+
+        # Complete timelines that just lost their oldest post become truncated
+        truncated_keys = [
+            key
+            for (key, state), removed in zip(cached_keys, results[1::2])
+            if removed and state == TIMELINE_COMPLETE
+        ]
+        if truncated_keys:
+            pipe = redis.pipeline(transaction=False)
+            for key in truncated_keys:
+                pipe.zadd(key, {TIMELINE_PLACEHOLDER: TIMELINE_TRUNCATED}, xx=True)
+            await pipe.execute()
+    except Exception as e:
+        # The post shows up once the timelines are rebuilt
+        log.exception(f"Failed to fan out community post {post.id}: {e}")
+
+
+async def remove_post(redis, post_id: str, user_id: str):
+    """Remove a deleted post from the cached timelines it was pushed to."""
+    if redis is None:
+        return
+
+    try:
+        follower_ids = _get_fanout_follower_ids(user_id)
+        if not follower_ids:
+            return
+
+        pipe = redis.pipeline(transaction=False)
+        for follower_id in follower_ids:
+            pipe.zrem(_get_timeline_key(follower_id), post_id)
+        await pipe.execute()
+    except Exception as e:
+        log.exception(f"Failed to remove community post {post_id}: {e}")
+
+
+async def update_timelines_on_follow(
+    redis, follower_id: str, following_id: str, following: bool
+):
+    """
+    Drop the cached timelines a follow or unfollow makes stale. The posts of
+    an author who just crossed the fan-out threshold were pulled and are now
+    pushed, or the other way around, so no timeline of their followers can
+    be trusted to hold them.
+    """
+    if redis is None:
+        return
+
+    keys = [_get_timeline_key(follower_id)]
+    try:
+        follower_count = Followers.get_follower_counts([following_id]).get(
+            following_id, 0
+        )
+        if follower_count == COMMUNITY_FEED_FANOUT_MAX_FOLLOWERS + (
+            1 if following else 0
+        ):
+            keys.extend(
+                _get_timeline_key(user_id)
+                for user_id in Followers.get_follower_ids(following_id)
+                if user_id != follower_id
+            )
+
+        for start in range(0, len(keys), 1000):
+            await redis.delete(*keys[start : start + 1000])
+    except Exception as e:
+        log.exception(
+            f"Failed to invalidate community timelines of {following_id}: {e}"
+        )
+
+
+async def _get_timeline_post_ids(
+    redis, user_id: str, pushed: list[str], count: int, after: Optional[list]
+) -> Optional[list[str]]:
+    """
+    Returns up to `count` post ids of the cached timeline at or after the
+    `after` keyset, rebuilding the timeline if needed. Returns `None` when
+    the page runs past the oldest post kept in the timeline.
+    """
+    key = _get_timeline_key(user_id)
+
+    if not await redis.exists(key):
+        refs = Posts.get_post_refs(pushed, COMMUNITY_FEED_TIMELINE_MAX_LENGTH)
+        pipe = redis.pipeline(transaction=False)
+        pipe.zadd(
+            key,
+            {
+                TIMELINE_PLACEHOLDER: (
+                    TIMELINE_TRUNCATED
+                    if len(refs) >= COMMUNITY_FEED_TIMELINE_MAX_LENGTH
+                    else TIMELINE_COMPLETE
+                ),
+                **{post_id: _get_score(created_at) for post_id, created_at in refs},
+            },
+        )
+        pipe.expire(key, COMMUNITY_FEED_TIMELINE_TTL)
+        await pipe.execute()
+
+    # The score bound is inclusive, posts of the same microsecond as the
+    # cursor are filtered by the exact keyset when the page is loaded
+    pipe = redis.pipeline(transaction=False)
+    pipe.zrevrangebyscore(
+        key,
+        _get_score(after[0]) if after else "+inf",
+        f"({TIMELINE_TRUNCATED}",
+        start=0,
+        num=count,
+    )
+    pipe.zscore(key, TIMELINE_PLACEHOLDER)
+    post_ids, state = await pipe.execute()
+
+    if len(post_ids) < count and state != TIMELINE_COMPLETE:
+        return None
+    return post_ids
+
+
+async def get_feed(
+    redis, viewer_id: str, limit: int, cursor: Optional[str] = None
+) -> tuple[list[CommunityPostWithUser], Optional[str]]:
+    """
+    Returns a page of the home timeline of `viewer_id`, newest first, and the
+    cursor of the next page. Raises ValueError for malformed cursors.
+    """
+    following_ids = Followers.get_following_ids(viewer_id)
+    if not following_ids:
+        return [], None
+
+    if redis is None:
+        posts, _, next_cursor = Posts.get_posts(
+            viewer_id=viewer_id,
+            user_ids=following_ids,
+            limit=limit,
+            cursor=cursor,
+            include_total=False,
+        )
+        return posts, next_cursor
+
+    after = None
+    if cursor:
+        after = decode_cursor(cursor).get("after")
+        if not after or len(after) != 2:
+            raise ValueError("Invalid cursor")
+
+    # Gather the candidates for the page, the newest posts after the cursor of
+    # pushed and pulled authors, then load the page from them. One extra post
+    # tells whether there is a next page and one more makes up for the post
+    # of the cursor itself.
+    count = limit + 2
+    pushed, pulled = _get_fanout_user_ids(following_ids)
+
+    candidate_ids = set()
+    if pushed:
+        post_ids = await _get_timeline_post_ids(redis, viewer_id, pushed, count, after)
+        if post_ids is None:
+            post_ids = [
+                post_id for post_id, _ in Posts.get_post_refs(pushed, count, cursor)
+            ]
+        candidate_ids.update(post_ids)
+
+    if pulled:
+        candidate_ids.update(
+            post_id for post_id, _ in Posts.get_post_refs(pulled, count, cursor)
+        )
+
+    if not candidate_ids:
+        return [], None
+
+    posts, _, next_cursor = Posts.get_posts(
+        viewer_id=viewer_id,
+        post_ids=list(candidate_ids),
+        limit=limit,
+        cursor=cursor,
+        include_total=False,
+    )
+    return posts, next_cursor
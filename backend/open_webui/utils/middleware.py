@@ -86,6 +86,7 @@ from open_webui.utils.filter import (
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
+from open_webui.utils.telemetry.pipeline import record_stage, StreamTimer
 
 
 from open_webui.config import (
@@ -229,22 +230,27 @@ async def chat_completion_tools_handler(
                         if k in allowed_params
                     }
 
-                    if tool.get("direct", False):
-                        tool_result = await event_caller(
-                            {
-                                "type": "execute:tool",
-                                "data": {
-                                    "id": str(uuid4()),
-                                    "name": tool_function_name,
-                                    "params": tool_function_params,
-                                    "server": tool.get("server", {}),
-                                    "session_id": metadata.get("session_id", None),
-                                },
-                            }
-                        )
-                    else:
-                        tool_function = tool["callable"]
-                        tool_result = await tool_function(**tool_function_params)
+                    with record_stage(
+                        "tool",
+                        model=body["model"],
+                        backend="direct" if tool.get("direct") else "server",
+                    ):
+                        if tool.get("direct", False):
+                            tool_result = await event_caller(
+                                {
+                                    "type": "execute:tool",
+                                    "data": {
+                                        "id": str(uuid4()),
+                                        "name": tool_function_name,
+                                        "params": tool_function_params,
+                                        "server": tool.get("server", {}),
+                                        "session_id": metadata.get("session_id", None),
+                                    },
+                                }
+                            )
+                        else:
+                            tool_function = tool["callable"]
+                            tool_result = await tool_function(**tool_function_params)
 
                 except Exception as e:
                     tool_result = str(e)
@@ -325,16 +331,17 @@ async def chat_memory_handler(
     request: Request, form_data: dict, extra_params: dict, user
 ):
     try:
-        results = await query_memory(
-            request,
-            QueryMemoryForm(
-                **{
-                    "content": get_last_user_message(form_data["messages"]) or "",
-                    "k": 3,
-                }
-            ),
-            user,
-        )
+        with record_stage("memory"):
+            results = await query_memory(
+                request,
+                QueryMemoryForm(
+                    **{
+                        "content": get_last_user_message(form_data["messages"]) or "",
+                        "k": 3,
+                    }
+                ),
+                user,
+            )
     except Exception as e:
         log.debug(e)
         results = None
@@ -380,16 +387,17 @@ async def chat_web_search_handler(
 
     queries = []
     try:
-        res = await generate_queries(
-            request,
-            {
-                "model": form_data["model"],
-                "messages": messages,
-                "prompt": user_message,
-                "type": "web_search",
-            },
-            user,
-        )
+        with record_stage("query_generation", model=form_data["model"]):
+            res = await generate_queries(
+                request,
+                {
+                    "model": form_data["model"],
+                    "messages": messages,
+                    "prompt": user_message,
+                    "type": "web_search",
+                },
+                user,
+            )
 
         response = res["choices"][0]["message"]["content"]
 
@@ -443,11 +451,14 @@ async def chat_web_search_handler(
     )
 
     try:
-        results = await process_web_search(
-            request,
-            SearchForm(queries=queries),
-            user=user,
-        )
+        with record_stage(
+            "web_fetch", backend=request.app.state.config.WEB_SEARCH_ENGINE
+        ):
+            results = await process_web_search(
+                request,
+                SearchForm(queries=queries),
+                user=user,
+            )
 
         if results:
             files = form_data.get("files", [])
@@ -633,15 +644,16 @@ async def chat_completion_files_handler(
     if files := body.get("metadata", {}).get("files", None):
         queries = []
         try:
-            queries_response = await generate_queries(
-                request,
-                {
-                    "model": body["model"],
-                    "messages": body["messages"],
-                    "type": "retrieval",
-                },
-                user,
-            )
+            with record_stage("query_generation", model=body["model"]):
+                queries_response = await generate_queries(
+                    request,
+                    {
+                        "model": body["model"],
+                        "messages": body["messages"],
+                        "type": "retrieval",
+                    },
+                    user,
+                )
             queries_response = queries_response["choices"][0]["message"]["content"]
 
             try:
@@ -677,7 +689,10 @@ async def chat_completion_files_handler(
         try:
             # Offload get_sources_from_items to a separate thread
             loop = asyncio.get_running_loop()
-            with ThreadPoolExecutor() as executor:
+            with (
+                ThreadPoolExecutor() as executor,
+                record_stage("retrieval", model=body["model"]),
+            ):
                 sources = await loop.run_in_executor(
                     executor,
                     lambda: get_sources_from_items(
@@ -933,13 +948,14 @@ async def process_chat_payload(request, form_data, user, metadata, model):
             )
         ]
 
-        form_data, flags = await process_filter_functions(
-            request=request,
-            filter_functions=filter_functions,
-            filter_type="inlet",
-            form_data=form_data,
-            extra_params=extra_params,
-        )
+        with record_stage("filter_inlet", model=model["id"]):
+            form_data, flags = await process_filter_functions(
+                request=request,
+                filter_functions=filter_functions,
+                filter_type="inlet",
+                form_data=form_data,
+                extra_params=extra_params,
+            )
     except Exception as e:
         raise Exception(f"{e}")
 
@@ -1128,8 +1144,20 @@ async def process_chat_payload(request, form_data, user, metadata, model):
 
 
 async def process_chat_response(
-    request, response, form_data, user, metadata, model, events, tasks
+    request,
+    response,
+    form_data,
+    user,
+    metadata,
+    model,
+    events,
+    tasks,
+    started_at: Optional[float] = None,
 ):
+    # When the completion was requested upstream, for the time to first token
+    if started_at is None:
+        started_at = time.perf_counter()
+
     async def background_tasks_handler():
         messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
         message = messages_map.get(metadata["message_id"]) if messages_map else None
@@ -1954,12 +1982,15 @@ async def process_chat_response(
                         },
                     )
 
-                async def stream_body_handler(response, form_data):
+                async def stream_body_handler(response, form_data, started_at):
                     nonlocal content
                     nonlocal content_blocks
 
                     response_tool_calls = []
 
+                    stream_timer = StreamTimer(started_at, model=model.get("id"))
+                    completion_tokens = None
+
                     delta_count = 0
                     delta_chunk_size = max(
                         CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
@@ -2036,6 +2067,11 @@ async def process_chat_response(
                                     usage = data.get("usage", {}) or {}
                                     usage.update(data.get("timings", {}))  # llama.cpp
                                     if usage:
+                                        completion_tokens = (
+                                            usage.get("completion_tokens")
+                                            or usage.get("predicted_n")
+                                            or completion_tokens
+                                        )
                                         await event_emitter(
                                             {
                                                 "type": "chat:completion",
@@ -2126,6 +2162,9 @@ async def process_chat_response(
                                         or delta.get("reasoning")
                                         or delta.get("thinking")
                                     )
+                                    if value or reasoning_content:
+                                        stream_timer.token()
+
                                     if reasoning_content:
                                         if (
                                             not content_blocks
@@ -2224,15 +2263,16 @@ async def process_chat_response(
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
-                                                metadata["chat_id"],
-                                                metadata["message_id"],
-                                                {
-                                                    "content": serialize_content_blocks(
-                                                        content_blocks
-                                                    ),
-                                                },
-                                            )
+                                            with record_stage("db_persist"):
+                                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                                    metadata["chat_id"],
+                                                    metadata["message_id"],
+                                                    {
+                                                        "content": serialize_content_blocks(
+                                                            content_blocks
+                                                        ),
+                                                    },
+                                                )
                                         else:
                                             data = {
                                                 "content": serialize_content_blocks(
@@ -2260,6 +2300,7 @@ async def process_chat_response(
                                 log.debug(f"Error: {e}")
                                 continue
                     await flush_pending_delta_data()
+                    stream_timer.done(completion_tokens)
 
                     if content_blocks:
                         # Clean up the last text block
@@ -2294,7 +2335,7 @@ async def process_chat_response(
                     if response.background:
                         await response.background()
 
-                await stream_body_handler(response, form_data)
+                await stream_body_handler(response, form_data, started_at)
 
                 tool_call_retries = 0
 
@@ -2377,27 +2418,34 @@ async def process_chat_response(
                                     if k in allowed_params
                                 }
 
-                                if tool.get("direct", False):
-                                    tool_result = await event_caller(
-                                        {
-                                            "type": "execute:tool",
-                                            "data": {
-                                                "id": str(uuid4()),
-                                                "name": tool_name,
-                                                "params": tool_function_params,
-                                                "server": tool.get("server", {}),
-                                                "session_id": metadata.get(
-                                                    "session_id", None
-                                                ),
-                                            },
-                                        }
-                                    )
+                                with record_stage(
+                                    "tool",
+                                    model=model.get("id"),
+                                    backend=(
+                                        "direct" if tool.get("direct") else "server"
+                                    ),
+                                ):
+                                    if tool.get("direct", False):
+                                        tool_result = await event_caller(
+                                            {
+                                                "type": "execute:tool",
+                                                "data": {
+                                                    "id": str(uuid4()),
+                                                    "name": tool_name,
+                                                    "params": tool_function_params,
+                                                    "server": tool.get("server", {}),
+                                                    "session_id": metadata.get(
+                                                        "session_id", None
+                                                    ),
+                                                },
+                                            }
+                                        )
 
-                                else:
-                                    tool_function = tool["callable"]
-                                    tool_result = await tool_function(
-                                        **tool_function_params
-                                    )
+                                    else:
+                                        tool_function = tool["callable"]
+                                        tool_result = await tool_function(
+                                            **tool_function_params
+                                        )
 
                             except Exception as e:
                                 tool_result = str(e)
@@ -2460,6 +2508,7 @@ async def process_chat_response(
                             ],
                         }
 
+                        retry_started_at = time.perf_counter()
                         res = await generate_chat_completion(
                             request,
                             new_form_data,
@@ -2467,7 +2516,9 @@ async def process_chat_response(
                         )
 
                         if isinstance(res, StreamingResponse):
-                            await stream_body_handler(res, new_form_data)
+                            await stream_body_handler(
+                                res, new_form_data, retry_started_at
+                            )
                         else:
                             break
                     except Exception as e:
@@ -2557,6 +2608,7 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        chat_id=metadata.get("chat_id", None),
                                     )
                                 else:
                                     output = {
@@ -2650,6 +2702,7 @@ async def process_chat_response(
                                 ],
                             }
 
+                            retry_started_at = time.perf_counter()
                             res = await generate_chat_completion(
                                 request,
                                 new_form_data,
@@ -2657,7 +2710,9 @@ async def process_chat_response(
                             )
 
                             if isinstance(res, StreamingResponse):
-                                await stream_body_handler(res, new_form_data)
+                                await stream_body_handler(
+                                    res, new_form_data, retry_started_at
+                                )
                             else:
                                 break
                         except Exception as e:
@@ -2673,13 +2728,14 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        metadata["chat_id"],
-                        metadata["message_id"],
-                        {
-                            "content": serialize_content_blocks(content_blocks),
-                        },
-                    )
+                    with record_stage("db_persist"):
+                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                            metadata["chat_id"],
+                            metadata["message_id"],
+                            {
+                                "content": serialize_content_blocks(content_blocks),
+                            },
+                        )
 
                 # Send a webhook notification if the user is not active
                 if not get_active_status_by_user_id(user.id):
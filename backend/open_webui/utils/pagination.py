@@ -0,0 +1,125 @@
+"""
+Cursor pagination for list queries.
+
+Pages are requested with the opaque cursor returned with the previous page
+instead of an offset. A cursor holds the sort key of the last row, so the next
+page is a seek through the sort index (`WHERE (updated_at, id) < (...)`)
+rather than an OFFSET that reads and discards every row before it. Queries
+whose order can't be resumed from a row (e.g. relevance ranked search) fall
+back to cursors holding the offset.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+from sqlalchemy import and_, or_
+
+# Endpoints that return a plain list send the cursor of the next page in this
+# response header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort columns with their direction, `True` for descending. The last column
+# must be unique (the primary key) so rows with equal sort values keep a
+# stable order across pages.
+OrderBy = list[tuple[Any, bool]]
+
+
+def encode_cursor(
+    after: Optional[list[Any]] = None, offset: Optional[int] = None
+) -> str:
+    payload = {"after": after} if after is not None else {"offset": offset}
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict) or not (
+        isinstance(payload.get("after"), list)
+        or (isinstance(payload.get("offset"), int) and payload["offset"] >= 0)
+    ):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def after_clause(order_by: OrderBy, values: list[Any]):
+    """
+    Rows sorting after `values` in `order_by` order, expanded to
+    (a > x) OR (a = x AND b > y) ... so mixed directions work everywhere.
+    """
+    clauses = []
+    for idx, (column, descending) in enumerate(order_by):
+        value = values[idx]
+        clauses.append(
+            and_(
+                *[
+                    prev_column == prev_value
+                    for (prev_column, _), prev_value in zip(order_by[:idx], values)
+                ],
+                column < value if descending else column > value,
+            )
+        )
+    return or_(*clauses)
+
+
+def paginate(
+    query,
+    order_by: OrderBy,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    keyset: bool = True,
+) -> tuple[list, Optional[str]]:
+    """
+    Order `query` by `order_by` and return one page of rows along with the
+    cursor of the next page, `None` on the last page. `cursor` takes
+    precedence over `skip`, an empty cursor is the first page.
+
+    With `keyset`, the next cursor holds the values of the `order_by` columns
+    of the last row, read as attributes of the row, so they have to be
+    selected by the query.
+
+    Raises ValueError for malformed cursors.
+    """
+    if cursor:
+        payload = decode_cursor(cursor)
+        if "offset" in payload:
+            skip = payload["offset"]
+        elif len(payload["after"]) != len(order_by):
+            raise ValueError("Invalid cursor")
+        else:
+            skip = 0
+            query = query.filter(after_clause(order_by, payload["after"]))
+    elif cursor is not None:
+        skip = 0
+
+    query = query.order_by(
+        *[
+            column.desc() if descending else column.asc()
+            for column, descending in order_by
+        ]
+    )
+    if skip:
+        query = query.offset(skip)
+    if limit:
+        # One extra row tells whether there is a next page
+        query = query.limit(limit + 1)
+
+    rows = query.all()
+    if not limit or len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    if keyset:
+        last = rows[-1]
+        return rows, encode_cursor(
+            after=[getattr(last, column.key) for column, _ in order_by]
+        )
+    return rows, encode_cursor(offset=skip + limit)
@@ -0,0 +1,90 @@
+"""
+Encoders and decoders for streaming large collections in and out of the API
+(e.g. chat exports) without holding the whole body in memory.
+
+Items are serialized one at a time and written in chunks of about
+`CHUNK_SIZE` bytes, as a JSON array, as NDJSON (one JSON document per line)
+or gzipped.
+"""
+
+import gzip
+import json
+import zlib
+from typing import IO, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _buffered(parts: Iterable[str]) -> Iterator[bytes]:
+    # Join small parts so every chunk written to the socket carries many items
+    buffer, size = [], 0
+    for part in parts:
+        data = part.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _json_array_parts(items: Iterable[str]) -> Iterator[str]:
+    yield "["
+    for idx, item in enumerate(items):
+        yield item if idx == 0 else "," + item
+    yield "]"
+
+
+def _ndjson_parts(items: Iterable[str]) -> Iterator[str]:
+    for item in items:
+        yield item + "\n"
+
+
+def encode_stream(items: Iterable[str], format: str = "json") -> Iterator[bytes]:
+    """
+    Encode already serialized JSON `items` as the chunks of one JSON array, or
+    of NDJSON with `format="ndjson"`.
+    """
+    if format == "ndjson":
+        return _buffered(_ndjson_parts(items))
+    return _buffered(_json_array_parts(items))
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress `chunks` into the chunks of a single gzip file."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_ndjson(file: IO[bytes]) -> Iterator[tuple[int, object]]:
+    """
+    Yield `(line number, document)` for every non-empty line of an NDJSON
+    file, gunzipping it on the fly if it starts with the gzip magic number.
+    Lines that aren't valid JSON are yielded as `(line number, None)`.
+    """
+    if file.read(2) == GZIP_MAGIC:
+        file.seek(0)
+        file = gzip.GzipFile(fileobj=file, mode="rb")
+    else:
+        file.seek(0)
+
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
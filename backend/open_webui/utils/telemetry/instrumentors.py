@@ -7,7 +7,6 @@ from aiohttp import (
     TraceRequestEndParams,
     TraceRequestExceptionParams,
 )
-from chromadb.telemetry.opentelemetry.fastapi import instrument_fastapi
 from fastapi import FastAPI
 from opentelemetry.instrumentation.httpx import (
     HTTPXClientInstrumentor,
@@ -177,6 +176,8 @@ class Instrumentor(BaseInstrumentor):
         return []
 
     def _instrument(self, **kwargs):
+        from chromadb.telemetry.opentelemetry.fastapi import instrument_fastapi
+
         instrument_fastapi(app=self.app)
         SQLAlchemyInstrumentor().instrument(engine=self.db_engine)
         RedisInstrumentor().instrument(request_hook=redis_request_hook)
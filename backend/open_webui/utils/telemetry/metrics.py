@@ -11,6 +11,14 @@ Metrics collected:
 
 Attributes used: http.method, http.route, http.status_code
 
+Chat and RAG pipeline stages (see `open_webui.utils.telemetry.pipeline`):
+
+* webui.chat.stage.duration (histogram, milliseconds)
+* webui.chat.time_to_first_token (histogram, milliseconds)
+* webui.chat.tokens_per_second (histogram)
+
+Attributes used: stage, status, model, backend
+
 If you wish to add more attributes (e.g. user-agent) you can, but beware of
 high-cardinality label sets.
 """
@@ -31,7 +39,10 @@ from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
     OTLPMetricExporter as OTLPHttpMetricExporter,
 )
 from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.view import View
+from opentelemetry.sdk.metrics.view import (
+    ExplicitBucketHistogramAggregation,
+    View,
+)
 from opentelemetry.sdk.metrics.export import (
     PeriodicExportingMetricReader,
 )
@@ -46,10 +57,30 @@ from open_webui.env import (
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
 )
 from open_webui.socket.main import get_active_user_ids
+from open_webui.utils.telemetry.pipeline import STAGE_ATTRIBUTES
 from open_webui.models.users import Users
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
+# Pipeline stages range from sub-millisecond lookups to minute long tool calls
+_STAGE_DURATION_BOUNDARIES_MS = [
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+]
+_TOKENS_PER_SECOND_BOUNDARIES = [1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300]
+
 
 def _build_meter_provider(resource: Resource) -> MeterProvider:
     """Return a configured MeterProvider."""
@@ -99,6 +130,27 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active",
         ),
+        View(
+            instrument_name="webui.chat.stage.duration",
+            attribute_keys=STAGE_ATTRIBUTES,
+            aggregation=ExplicitBucketHistogramAggregation(
+                _STAGE_DURATION_BOUNDARIES_MS
+            ),
+        ),
+        View(
+            instrument_name="webui.chat.time_to_first_token",
+            attribute_keys=["model"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                _STAGE_DURATION_BOUNDARIES_MS
+            ),
+        ),
+        View(
+            instrument_name="webui.chat.tokens_per_second",
+            attribute_keys=["model"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                _TOKENS_PER_SECOND_BOUNDARIES
+            ),
+        ),
     ]
 
     provider = MeterProvider(
@@ -0,0 +1,144 @@
+"""
+Per-stage latency of the chat and RAG pipeline.
+
+Every stage (filters, memory lookup, query generation, embedding, vector
+search, BM25, reranking, web search, tools, DB persistence) records its
+duration in the `webui.chat.stage.duration` histogram and as an event on the
+current span. Streaming responses additionally record the upstream time to
+first token and the generation speed.
+
+Instruments are created on the global meter, they are no-ops until metrics
+are enabled with ENABLE_OTEL_METRICS, and span events are only added when a
+span is recording (ENABLE_OTEL_TRACES).
+
+Attributes: stage, status (ok/error), model, backend. Keep them low
+cardinality, never tag with ids or user input.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from opentelemetry import metrics, trace
+
+meter = metrics.get_meter(__name__)
+
+STAGE_ATTRIBUTES = ["stage", "status", "model", "backend"]
+
+stage_duration_histogram = meter.create_histogram(
+    name="webui.chat.stage.duration",
+    description="Duration of a stage of the chat and RAG pipeline",
+    unit="ms",
+)
+time_to_first_token_histogram = meter.create_histogram(
+    name="webui.chat.time_to_first_token",
+    description="Time from sending a chat completion upstream to its first token",
+    unit="ms",
+)
+tokens_per_second_histogram = meter.create_histogram(
+    name="webui.chat.tokens_per_second",
+    description="Output tokens per second of streamed chat completions",
+    unit="{token}/s",
+)
+
+
+def _get_attributes(stage: Optional[str], **attributes) -> dict:
+    return {
+        **({"stage": stage} if stage else {}),
+        **{key: value for key, value in attributes.items() if value is not None},
+    }
+
+
+def _add_span_event(name: str, attributes: dict):
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.add_event(name, attributes)
+
+
+def record_stage_duration(stage: str, elapsed_ms: float, **attributes):
+    attributes = _get_attributes(stage, **attributes)
+    stage_duration_histogram.record(elapsed_ms, attributes)
+    _add_span_event(f"chat.{stage}", {**attributes, "duration_ms": elapsed_ms})
+
+
+@contextmanager
+def record_stage(
+    stage: str, model: Optional[str] = None, backend: Optional[str] = None
+):
+    """
+    Time the enclosed block as `stage`, works around awaits as well.
+
+        with record_stage("vector_search", backend=VECTOR_DB):
+            result = VECTOR_DB_CLIENT.search(...)
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        record_stage_duration(
+            stage,
+            (time.perf_counter() - start) * 1000,
+            status=status,
+            model=model,
+            backend=backend,
+        )
+
+
+def timed_stage(func, stage: str, **attributes):
+    """Wrap `func` so every call is recorded as `stage`."""
+
+    def wrapper(*args, **kwargs):
+        with record_stage(stage, **attributes):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class StreamTimer:
+    """
+    Time a streamed completion: the time to the first token from when the
+    request was sent upstream (`start`, a `time.perf_counter()` value) and the
+    output tokens per second after it.
+    """
+
+    def __init__(self, start: float, model: Optional[str] = None):
+        self.start = start
+        self.model = model
+        self.first_token_at = None
+        self.chunks = 0
+
+    def token(self):
+        """Call for every chunk carrying generated content."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            elapsed_ms = (self.first_token_at - self.start) * 1000
+            attributes = _get_attributes(None, model=self.model)
+            time_to_first_token_histogram.record(elapsed_ms, attributes)
+            _add_span_event(
+                "chat.first_token", {**attributes, "duration_ms": elapsed_ms}
+            )
+        self.chunks += 1
+
+    def done(self, completion_tokens: Optional[int] = None):
+        """
+        Record the generation speed, from the `completion_tokens` of the usage
+        if the upstream reported it, else from the number of chunks.
+        """
+        if self.first_token_at is None:
+            return
+
+        elapsed = time.perf_counter() - self.first_token_at
+        tokens = completion_tokens or self.chunks
+        if elapsed <= 0 or tokens <= 1:
+            return
+
+        attributes = _get_attributes(None, model=self.model)
+        tokens_per_second_histogram.record(tokens / elapsed, attributes)
+        _add_span_event(
+            "chat.generation",
+            {**attributes, "tokens": tokens, "tokens_per_second": tokens / elapsed},
+        )
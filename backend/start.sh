@@ -71,4 +71,11 @@ fi
 
 PYTHON_CMD=$(command -v python3 || command -v python)
 
+# Run the database migrations once before starting the workers
+if [[ "${ENABLE_DB_MIGRATIONS,,}" != "false" ]]; then
+    echo "Running database migrations..."
+    WEBUI_SECRET_KEY="$WEBUI_SECRET_KEY" "$PYTHON_CMD" -c "import open_webui; open_webui.migrate()" || exit 1
+    export ENABLE_DB_MIGRATIONS=false
+fi
+
 WEBUI_SECRET_KEY="$WEBUI_SECRET_KEY" exec "$PYTHON_CMD" -m uvicorn open_webui.main:app --host "$HOST" --port "$PORT" --forwarded-allow-ips '*' --workers "${UVICORN_WORKERS:-1}"